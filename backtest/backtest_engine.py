@@ -1,10 +1,18 @@
 import pandas as pd
 import numpy as np
+import hashlib
 import logging
+import os
+import pickle
 from dataclasses import dataclass
-from typing import Callable, List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Sequence, Union
 from pathlib import Path
 
+from risk.metrics import StreamingMetrics
+
+# Bump when the checkpoint layout changes.
+CHECKPOINT_VERSION = 1
+
 
 @dataclass
 class Trade:
@@ -38,12 +46,14 @@ class BacktestEngine:
     def __init__(
         self,
         prices: pd.DataFrame,
-        strategy_fn: Callable[[List[float]], str],
+        strategy_fn: Callable[[np.ndarray], str],
         initial_balance: float = 10_000.0,
         risk_pct: float = 0.01,
         slippage: float = 0.0005,
         commission: float = 0.001,
         results_dir: str = "backtest/results",
+        window: Optional[int] = None,
+        equity_every: Optional[int] = 1,
     ) -> None:
         if not BacktestEngine.REQUIRED_COLS.issubset(prices.columns):
             raise ValueError(
@@ -51,31 +61,84 @@ class BacktestEngine:
             )
         if not isinstance(prices.index, pd.DatetimeIndex):
             raise ValueError("prices index must be DatetimeIndex")
+        if window is not None and window < 1:
+            raise ValueError("window must be a positive number of bars")
+        if equity_every is not None and equity_every < 1:
+            raise ValueError("equity_every must be a positive number of bars or None")
 
         self.prices = prices
         self.strategy_fn = strategy_fn
+        self.initial_balance = float(initial_balance)
         self.balance = float(initial_balance)
         self.risk = RiskManager(risk_pct)
         self.slippage = slippage
         self.commission = commission
         self.results_dir = Path(results_dir)
+        self.window = window
+        # Keep every Nth equity point (None: none); metrics stay exact either way.
+        self.equity_every = equity_every
 
         self.trades: List[Trade] = []
         self.open_trade: Optional[Trade] = None
-        self.equity_curve: List[float] = []
+        self.equity_curve: Union[List[float], np.ndarray] = []
+        self.metrics = StreamingMetrics()
+        # Bars already stepped through; run() continues from here.
+        self.bars_processed = 0
+
+    @classmethod
+    def from_store(
+        cls,
+        store,
+        symbol: str,
+        strategy_fn: Callable[[np.ndarray], str],
+        start=None,
+        end=None,
+        **kwargs,
+    ) -> "BacktestEngine":
+        """Build an engine over ``[start, end)`` bars of ``symbol`` in a :class:`BarStore`."""
+        prices = store.read(symbol, start, end)
+        if prices.empty:
+            raise ValueError(f"no bars stored for {symbol} in the requested range")
+        return cls(prices, strategy_fn, **kwargs)
+
+    def run(
+        self,
+        save: bool = True,
+        progress: Optional[Callable[[int, StreamingMetrics], None]] = None,
+        progress_every: int = 10_000,
+    ) -> None:
+        """Step through bars calling ``strategy_fn`` once per bar.
 
-    def run(self) -> None:
-        history: List[float] = []
-        for ts, row in self.prices.iterrows():
-            price = float(row["close"])
-            history.append(price)
+        ``strategy_fn`` receives a read-only NumPy view of the closes seen so
+        far, bounded to the last ``window`` bars when a window is configured.
+        The views share one preallocated buffer, so no per-bar copies are made.
+        Only bars after ``bars_processed`` are stepped, so an engine restored
+        with :meth:`from_checkpoint` processes just the appended bars.
+        ``progress(bar_index, metrics)`` is called every ``progress_every``
+        bars with the live :class:`StreamingMetrics`.
+        """
+        closes = np.array(self.prices["close"], dtype=np.float64)
+        closes.flags.writeable = False
+        index = self.prices.index
+        window = self.window
+        every = self.equity_every
+        metrics = self.metrics
+        for i in range(self.bars_processed, closes.size):
+            ts = index[i]
+            price = float(closes[i])
+            start = 0 if window is None else max(0, i + 1 - window)
+            history = closes[start:i + 1]
 
             if self.open_trade:
                 open_pnl = (price - self.open_trade.entry_price) * self.open_trade.size
                 equity = self.balance + open_pnl
             else:
                 equity = self.balance
-            self.equity_curve.append(equity)
+            metrics.update(equity)
+            if every is not None and i % every == 0:
+                self.equity_curve.append(equity)
+            if progress is not None and i % progress_every == 0:
+                progress(i, metrics)
 
             signal = self.strategy_fn(history)
 
@@ -94,34 +157,208 @@ class BacktestEngine:
                 self.open_trade.exit_time = ts
                 self.open_trade.exit_price = exit_price
                 self.open_trade.pnl = pnl - (self.open_trade.entry_price * self.open_trade.size * self.commission)
+                metrics.record_trade(self.open_trade.pnl)
                 self.trades.append(self.open_trade)
                 logging.info(f"Trade closed pnl={self.open_trade.pnl:.2f}")
                 self.open_trade = None
 
-        self._save_results()
+        self.bars_processed = closes.size
+        if save:
+            self._save_results()
+
+    def run_vectorized(
+        self,
+        signals: Union[None, str, Sequence, np.ndarray, pd.Series] = None,
+        save: bool = True,
+    ) -> None:
+        """Array-backed equivalent of :meth:`run` for whole-series strategies.
+
+        ``signals`` may be a precomputed array/Series aligned with ``prices``,
+        the name of a column in ``prices`` or ``None`` to call ``strategy_fn``
+        once with the full close array. Values are either ``"buy"``/``"sell"``/
+        ``"hold"`` strings or ``1``/``-1``/``0``. Produces the same trades and
+        equity curve as :meth:`run` while only looping over trades, not bars.
+        Pass ``save=False`` to skip writing the equity CSV during research runs.
+        Whole-series indicators for such strategies are in
+        :mod:`indicators.vectorized`.
+        """
+        if self.bars_processed:
+            raise ValueError("run_vectorized cannot continue a partially processed run; use run()")
+        if self.equity_every != 1:
+            raise ValueError("run_vectorized always builds the full equity curve; use equity_every=1")
+        close = np.ascontiguousarray(self.prices["close"].to_numpy(dtype=np.float64))
+        n = close.size
+        if signals is None:
+            signals = self.strategy_fn(close)
+        elif isinstance(signals, str):
+            signals = self.prices[signals]
+        sig = _normalize_signals(signals)
+        if sig.size != n:
+            raise ValueError(f"signals length {sig.size} does not match prices length {n}")
+
+        buy_idx = np.flatnonzero(sig > 0)
+        sell_idx = np.flatnonzero(sig < 0)
+        index = self.prices.index
+        equity = np.empty(n, dtype=np.float64)
+        balance = self.balance
+        pos = 0
+        while pos < n:
+            b = np.searchsorted(buy_idx, pos)
+            if b >= buy_idx.size:
+                break
+            i = int(buy_idx[b])
+            equity[pos:i + 1] = balance
+            price = float(close[i])
+            size = self.risk.get_size(balance, price)
+            if size <= 0:
+                pos = i + 1
+                continue
+            entry = price * (1 + self.slippage)
+            balance -= entry * size * (1 + self.commission)
+            trade = Trade(index[i], None, entry, None, size)
+
+            s = np.searchsorted(sell_idx, i + 1)
+            j = int(sell_idx[s]) if s < sell_idx.size else n
+            seg = close[i + 1:min(j + 1, n)]
+            equity[i + 1:i + 1 + seg.size] = balance + (seg - entry) * size
+            if j >= n:
+                self.open_trade = trade
+                pos = n
+                break
+
+            exit_price = float(close[j]) * (1 - self.slippage)
+            pnl = (exit_price - entry) * size
+            fees = (exit_price * size) * self.commission
+            balance += exit_price * size - fees
+            trade.exit_time = index[j]
+            trade.exit_price = exit_price
+            trade.pnl = pnl - (entry * size * self.commission)
+            self.trades.append(trade)
+            logging.info(f"Trade closed pnl={trade.pnl:.2f}")
+            pos = j + 1
+        if pos < n:
+            equity[pos:] = balance
+
+        self.balance = balance
+        self.equity_curve = equity
+        self.bars_processed = n
+        if save:
+            self._save_results()
+
+    def save_checkpoint(self, path: Union[str, Path]) -> None:
+        """Write the complete run state so it can continue on appended bars.
+
+        The checkpoint holds the balance, open trade, closed trades, equity
+        curve and the pickled ``strategy_fn`` (and with it the strategy
+        object and any indicator state it keeps), plus a hash of the bars
+        processed so far. Unpicklable handlers (e.g. lambdas) are left out and
+        must be passed again to :meth:`from_checkpoint`.
+        """
+        try:
+            strategy = pickle.dumps(self.strategy_fn, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logging.warning(f"Strategy not saved in checkpoint, pass strategy_fn when resuming: {e}")
+            strategy = None
+        n = self.bars_processed
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "bars_processed": n,
+            "data_sha256": _prefix_digest(self.prices, n),
+            "params": self._params(),
+            "balance": self.balance,
+            "open_trade": self.open_trade,
+            "trades": self.trades,
+            "equity_curve": np.asarray(self.equity_curve, dtype=np.float64),
+            "metrics": self.metrics,
+            "strategy": strategy,
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        path: Union[str, Path],
+        prices: pd.DataFrame,
+        strategy_fn: Optional[Callable[[np.ndarray], str]] = None,
+        **kwargs,
+    ) -> "BacktestEngine":
+        """Restore a run saved by :meth:`save_checkpoint` onto ``prices``.
+
+        ``prices`` must start with exactly the bars the checkpoint covered
+        (checked by hash) and may extend past them; :meth:`run` then steps
+        only the new bars and the results equal a full rerun. Engine
+        parameters come from the checkpoint; ``kwargs`` may repeat them but
+        not change them (``results_dir`` is free).
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version {state.get('version')}")
+        params = state["params"]
+        for key, value in kwargs.items():
+            if key in params and value != params[key]:
+                raise ValueError(f"checkpoint was made with {key}={params[key]!r}, got {value!r}")
+        n = state["bars_processed"]
+        if len(prices) < n or _prefix_digest(prices, n) != state["data_sha256"]:
+            raise ValueError("prices do not extend the bars covered by the checkpoint")
+        if strategy_fn is None:
+            if state["strategy"] is None:
+                raise ValueError("checkpoint has no saved strategy; pass strategy_fn")
+            strategy_fn = pickle.loads(state["strategy"])
+
+        engine = cls(prices, strategy_fn, **{**kwargs, **params})
+        engine.balance = state["balance"]
+        engine.open_trade = state["open_trade"]
+        engine.trades = state["trades"]
+        engine.equity_curve = state["equity_curve"].tolist()
+        engine.metrics = state["metrics"]
+        engine.bars_processed = n
+        return engine
+
+    def _params(self) -> Dict:
+        return {
+            "initial_balance": self.initial_balance,
+            "risk_pct": self.risk.risk_pct,
+            "slippage": self.slippage,
+            "commission": self.commission,
+            "window": self.window,
+            "equity_every": self.equity_every,
+        }
 
     def _save_results(self) -> None:
+        if self.equity_every is None:
+            logging.info("Equity curve not kept (equity_every=None); nothing to save")
+            return
         self.results_dir.mkdir(parents=True, exist_ok=True)
-        df = pd.DataFrame({"equity": self.equity_curve}, index=self.prices.index[: len(self.equity_curve)])
+        index = self.prices.index[::self.equity_every][: len(self.equity_curve)]
+        df = pd.DataFrame({"equity": self.equity_curve}, index=index)
         path = self.results_dir / "backtest_results.csv"
         df.to_csv(path)
 
     def summary(self) -> Dict:
-        if not self.equity_curve:
+        """Performance metrics from the equity curve.
+
+        When the curve was downsampled or dropped (``equity_every``) the
+        exact running values from :attr:`metrics` are reported instead.
+        """
+        if len(self.equity_curve) != self.bars_processed or self.equity_every != 1:
+            return self.metrics.summary()
+        if len(self.equity_curve) == 0:
             return {}
 
-        equity = self.equity_curve[-1]
+        curve = np.asarray(self.equity_curve, dtype=np.float64)
+        equity = float(curve[-1])
         pnl_list = [t.pnl for t in self.trades if t.pnl is not None]
         wins = [p for p in pnl_list if p > 0]
         losses = [p for p in pnl_list if p <= 0]
-        daily_returns = np.diff(self.equity_curve) / self.equity_curve[:-1]
-        max_drawdown = 0.0
-        peak = self.equity_curve[0]
-        for val in self.equity_curve:
-            if val > peak:
-                peak = val
-            dd = (peak - val) / peak
-            max_drawdown = max(max_drawdown, dd)
+        daily_returns = np.diff(curve) / curve[:-1]
+        peak = np.maximum.accumulate(curve)
+        max_drawdown = max(0.0, float(np.max((peak - curve) / peak)))
         sharpe = 0.0
         if daily_returns.size > 1 and np.std(daily_returns) != 0:
             sharpe = (np.mean(daily_returns) - 0.02) / np.std(daily_returns)
@@ -137,3 +374,19 @@ class BacktestEngine:
             "sharpe_ratio": sharpe,
             "max_drawdown": max_drawdown,
         }
+
+
+def _prefix_digest(prices: pd.DataFrame, n: int) -> str:
+    """Hash of the first ``n`` timestamps and closes."""
+    digest = hashlib.sha256(pd.DatetimeIndex(prices.index[:n]).as_unit("ns").asi8.tobytes())
+    digest.update(np.ascontiguousarray(prices["close"].to_numpy(dtype=np.float64)[:n]).tobytes())
+    return digest.hexdigest()
+
+
+def _normalize_signals(signals) -> np.ndarray:
+    """Return ``signals`` as an int8 array of ``1`` (buy), ``-1`` (sell), ``0``."""
+    arr = np.asarray(signals)
+    if arr.dtype.kind in ("U", "S", "O"):
+        arr = arr.astype(str)
+        return (arr == "buy").astype(np.int8) - (arr == "sell").astype(np.int8)
+    return np.sign(np.nan_to_num(arr.astype(np.float64))).astype(np.int8)
@@ -1,26 +1,114 @@
 import pandas as pd
 import logging
-from typing import Type
+from pathlib import Path
+from typing import Optional, Type
 from backtest.backtest_engine import BacktestEngine
+from backtest.result_cache import ResultCache, csv_fingerprint, engine_params, store_fingerprint
 
+# Bars of history handed to the strategy on each step. Long enough for the
+# RSI/momentum lookbacks used by the bundled strategies.
+DEFAULT_WINDOW = 256
 
-def run_backtest(strategy_cls: Type, csv_path: str) -> dict:
-    """Load price CSV and run strategy on historical closes."""
+
+def load_price_csv(csv_path: str) -> pd.DataFrame:
+    """Read an OHLCV CSV whose first column is the bar timestamp."""
     df = pd.read_csv(csv_path, parse_dates=[0])
     required = {'open', 'high', 'low', 'close', 'volume'}
     if not required.issubset(df.columns):
         raise ValueError(f'CSV must contain columns {required}')
 
     df.set_index(df.columns[0], inplace=True)
+    return df
+
+
+def load_prices(
+    csv_path: Optional[str] = None,
+    store=None,
+    symbol: Optional[str] = None,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """Return OHLCV bars from a CSV or from a :class:`data.bar_store.BarStore`."""
+    if store is not None:
+        if not symbol:
+            raise ValueError('symbol is required when reading from a bar store')
+        return store.read(symbol, start, end)
+    if csv_path is None:
+        raise ValueError('either csv_path or store must be given')
+    df = load_price_csv(csv_path)
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df.index < pd.Timestamp(end)]
+    return df
+
+
+def make_strategy(strategy_cls: Type, config: Optional[dict] = None, symbols: Optional[list] = None):
+    """Instantiate ``strategy_cls`` once for offline use (no api/risk/db)."""
+    return strategy_cls(None, None, dict(config or {}), None, symbols or ['TEST'])
+
+
+def bar_handler(strategy):
+    """Return the per-bar callable for a strategy instance.
+
+    Strategies may implement ``on_bar(window)`` or the older
+    ``generate_signal(history)``; both receive a read-only NumPy window of
+    recent closes. Anything else always holds.
+    """
+    handler = getattr(strategy, 'on_bar', None) or getattr(strategy, 'generate_signal', None)
+    if handler is None:
+        return lambda window: 'hold'
+    return handler
+
+
+def run_backtest(
+    strategy_cls: Type,
+    csv_path: Optional[str] = None,
+    config: Optional[dict] = None,
+    window: Optional[int] = DEFAULT_WINDOW,
+    store=None,
+    symbol: Optional[str] = None,
+    start=None,
+    end=None,
+    cache: Optional[ResultCache] = None,
+    checkpoint: Optional[str] = None,
+    **engine_kwargs,
+) -> dict:
+    """Load price CSV (or bar store range) and run strategy on historical closes.
 
-    def strategy_fn(history):
-        strat = strategy_cls(None, None, {}, None, ['TEST'])  # simple instance
-        if hasattr(strat, 'generate_signal'):
-            return strat.generate_signal(history)
-        return 'hold'
+    The strategy is constructed once so state such as ``in_position``
+    carries across bars. Extra keyword arguments (``risk_pct``,
+    ``slippage``, ``results_dir`` ...) are passed to :class:`BacktestEngine`.
+    With a ``cache``, an identical earlier run (same data, strategy code,
+    config and engine parameters) is returned without re-running; the
+    results CSV is only written on a miss. With a ``checkpoint`` path an
+    earlier saved run is resumed over just the newly appended bars, and the
+    checkpoint is rewritten afterwards.
+    """
+    key = None
+    if cache is not None:
+        if store is not None:
+            data = store_fingerprint(store, symbol, start, end)
+        else:
+            data = csv_fingerprint(csv_path, start, end)
+        key = cache.key(data, strategy_cls, config, engine_params(window=window, **engine_kwargs))
+        hit = cache.get(key)
+        if hit is not None:
+            logging.info(f"Backtest cache hit: {hit.summary}")
+            return hit.summary
 
-    engine = BacktestEngine(df, strategy_fn)
+    df = load_prices(csv_path, store, symbol, start, end)
+    if checkpoint is not None and Path(checkpoint).is_file():
+        engine = BacktestEngine.from_checkpoint(checkpoint, df, window=window, **engine_kwargs)
+        logging.info(f"Resuming backtest after bar {engine.bars_processed} of {len(df)}")
+    else:
+        strategy = make_strategy(strategy_cls, config)
+        engine = BacktestEngine(df, bar_handler(strategy), window=window, **engine_kwargs)
     engine.run()
+    if checkpoint is not None:
+        engine.save_checkpoint(checkpoint)
+    if key is not None:
+        cache.put(key, engine)
     summary = engine.summary()
     logging.info(f"Backtest complete: {summary}")
     return summary
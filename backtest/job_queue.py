@@ -0,0 +1,422 @@
+"""Shared-directory job queue for running backtests on many hosts.
+
+Nothing but a directory every host can see (NFS, SMB, a synced volume) is
+needed; jobs move between sub-directories with atomic renames::
+
+    <root>/pending/<job>.json            submitted, waiting
+    <root>/leased/<job>@<worker>.json    claimed; mtime is the heartbeat
+    <root>/done/<job>.json               params + summary + timing
+    <root>/failed/<job>.json             last error after max attempts
+    <root>/workers/<worker>.json         per-worker liveness and counters
+
+A worker claims a job by renaming it out of ``pending/`` (only one rename
+can win), touches the leased file every ``heartbeat`` seconds while the
+backtest runs and renames the result into ``done/``. Leases whose heartbeat
+is older than ``lease_timeout`` belong to crashed workers and are moved back
+to ``pending/`` by whichever worker or ``status`` call notices first.
+
+Example::
+
+    python -m backtest.job_queue submit --root /mnt/q --strategy strategies.crypto_scalper:CryptoScalper \\
+        --csv /mnt/data/btc_1m.csv --grid '{"risk_pct": [0.01, 0.02]}'
+    python -m backtest.job_queue worker --root /mnt/q        # on every host
+    python -m backtest.job_queue status --root /mnt/q
+    python -m backtest.job_queue collect --root /mnt/q --out results.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backtest.backtest_runner import load_prices
+from backtest.result_cache import ResultCache
+from backtest.sweep import evaluate, load_strategy, parameter_grid, random_search
+from data.bar_store import BarStore
+
+SUBDIRS = ("pending", "leased", "done", "failed", "workers")
+LEASE_TIMEOUT = 120.0
+HEARTBEAT = 15.0
+
+
+def _dirs(root) -> Dict[str, Path]:
+    root = Path(root)
+    dirs = {name: root / name for name in SUBDIRS}
+    for path in dirs.values():
+        path.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """Write via a temp file and rename so readers never see partial JSON."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(data, default=str))
+    tmp.replace(path)
+
+
+def _job_id(path: Path) -> str:
+    return path.stem.split("@", 1)[0]
+
+
+def submit(
+    root: str,
+    strategy: str,
+    param_sets: List[Dict],
+    data: Dict,
+    base_config: Optional[Dict] = None,
+    batch: Optional[str] = None,
+) -> List[str]:
+    """Enqueue one job per parameter set and return the job ids.
+
+    ``strategy`` is a ``module:ClassName`` path importable on every worker.
+    ``data`` names the bars, e.g. ``{"csv": path}`` or ``{"store": root,
+    "symbol": "BTC-USD"}``, optionally with ``start``/``end``; paths must
+    resolve on the workers too.
+    """
+    if not ("csv" in data or "store" in data):
+        raise ValueError("data must contain 'csv' or 'store'")
+    dirs = _dirs(root)
+    batch = batch or time.strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    ids = []
+    for i, params in enumerate(param_sets):
+        job_id = f"{batch}-{i:06d}"
+        job = {
+            "id": job_id,
+            "batch": batch,
+            "strategy": strategy,
+            "params": params,
+            "base_config": base_config or {},
+            "data": data,
+            "attempts": 0,
+            "submitted": time.time(),
+        }
+        _write_json(dirs["pending"] / f"{job_id}.json", job)
+        ids.append(job_id)
+    logging.info(f"Submitted {len(ids)} jobs in batch {batch}")
+    return ids
+
+
+def requeue_expired(root: str, lease_timeout: float = LEASE_TIMEOUT) -> int:
+    """Move leases without a recent heartbeat back to ``pending/``."""
+    dirs = _dirs(root)
+    now = time.time()
+    count = 0
+    for path in dirs["leased"].glob("*.json"):
+        try:
+            if now - path.stat().st_mtime <= lease_timeout:
+                continue
+            path.rename(dirs["pending"] / f"{_job_id(path)}.json")
+        except FileNotFoundError:
+            continue  # finished or reclaimed meanwhile
+        logging.warning(f"Lease expired, requeued job {_job_id(path)} from {path.stem.split('@')[-1]}")
+        count += 1
+    return count
+
+
+class Worker:
+    """Claims and runs jobs from a queue directory until told to stop."""
+
+    def __init__(
+        self,
+        root: str,
+        worker_id: Optional[str] = None,
+        lease_timeout: float = LEASE_TIMEOUT,
+        heartbeat: float = HEARTBEAT,
+        max_attempts: int = 3,
+        cache: Optional[ResultCache] = None,
+    ):
+        self.root = root
+        self.dirs = _dirs(root)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_timeout = lease_timeout
+        self.heartbeat = heartbeat
+        self.max_attempts = max_attempts
+        self.cache = cache
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.busy_seconds = 0.0
+        self.started = time.time()
+        self._lease: Optional[Path] = None
+        self._stop = threading.Event()
+        self._data_key: Optional[str] = None
+        self._prices: Optional[pd.DataFrame] = None
+
+    def _status(self, state: str) -> None:
+        _write_json(
+            self.dirs["workers"] / f"{self.worker_id}.json",
+            {
+                "worker": self.worker_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "state": state,
+                "started": self.started,
+                "last_seen": time.time(),
+                "jobs_done": self.jobs_done,
+                "jobs_failed": self.jobs_failed,
+                "busy_seconds": self.busy_seconds,
+            },
+        )
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat):
+            lease = self._lease
+            try:
+                if lease is not None:
+                    os.utime(lease)
+                self._status("busy" if lease is not None else "idle")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Heartbeat failed: {e}")
+
+    def claim(self) -> Optional[Tuple[Path, Dict]]:
+        """Lease the oldest pending job, or return ``None`` if there is none."""
+        for path in sorted(self.dirs["pending"].glob("*.json")):
+            job_id = path.stem
+            lease = self.dirs["leased"] / f"{job_id}@{self.worker_id}.json"
+            try:
+                path.rename(lease)
+            except FileNotFoundError:
+                continue  # another worker won the race
+            job = json.loads(lease.read_text())
+            if (self.dirs["done"] / f"{job_id}.json").exists():
+                lease.unlink(missing_ok=True)  # finished by a worker whose lease had expired
+                continue
+            job["attempts"] += 1
+            if job["attempts"] > self.max_attempts:
+                job.setdefault("error", "lease expired too often")
+                _write_json(self.dirs["failed"] / f"{job_id}.json", job)
+                lease.unlink(missing_ok=True)
+                continue
+            _write_json(lease, job)
+            return lease, job
+        return None
+
+    def _prices_for(self, data: Dict) -> pd.DataFrame:
+        key = json.dumps(data, sort_keys=True)
+        if key != self._data_key:
+            store = BarStore(data["store"]) if data.get("store") else None
+            self._prices = load_prices(data.get("csv"), store, data.get("symbol"), data.get("start"), data.get("end"))
+            self._data_key = key
+        return self._prices
+
+    def run_job(self, lease: Path, job: Dict) -> None:
+        started = time.time()
+        try:
+            strategy_cls = load_strategy(job["strategy"])
+            row = evaluate(strategy_cls, self._prices_for(job["data"]), job["params"], job["base_config"], self.cache)
+        except Exception as e:
+            logging.error(f"Job {job['id']} failed: {e}")
+            job["error"] = traceback.format_exc()
+            if job["attempts"] >= self.max_attempts:
+                _write_json(self.dirs["failed"] / f"{job['id']}.json", job)
+                lease.unlink(missing_ok=True)
+            else:
+                _write_json(lease, job)
+                try:
+                    lease.rename(self.dirs["pending"] / f"{job['id']}.json")
+                except FileNotFoundError:
+                    pass
+            self.jobs_failed += 1
+            return
+        finished = time.time()
+        result = {
+            "id": job["id"],
+            "batch": job["batch"],
+            "strategy": job["strategy"],
+            "params": job["params"],
+            "summary": {k: v for k, v in row.items() if k not in job["params"]},
+            "worker": self.worker_id,
+            "started": started,
+            "finished": finished,
+            "seconds": finished - started,
+        }
+        _write_json(self.dirs["done"] / f"{job['id']}.json", result)
+        lease.unlink(missing_ok=True)
+        self.jobs_done += 1
+        self.busy_seconds += finished - started
+
+    def run(self, max_jobs: Optional[int] = None, idle_exit: Optional[float] = None, poll: float = 2.0) -> int:
+        """Process jobs until ``max_jobs`` are done or the queue stays empty ``idle_exit`` seconds."""
+        self._status("idle")
+        beat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        beat.start()
+        idle_since = time.time()
+        try:
+            while not self._stop.is_set() and (max_jobs is None or self.jobs_done + self.jobs_failed < max_jobs):
+                claimed = self.claim()
+                if claimed is None:
+                    requeue_expired(self.root, self.lease_timeout)
+                    claimed = self.claim()
+                if claimed is None:
+                    if idle_exit is not None and time.time() - idle_since >= idle_exit:
+                        break
+                    time.sleep(poll)
+                    continue
+                self._lease = claimed[0]
+                try:
+                    self.run_job(*claimed)
+                finally:
+                    self._lease = None
+                idle_since = time.time()
+        finally:
+            self._stop.set()
+            beat.join()
+            self._status("stopped")
+        return self.jobs_done
+
+    def stop(self) -> None:
+        """Finish the current job, then return from :meth:`run`."""
+        self._stop.set()
+
+
+def collect(root: str, batch: Optional[str] = None, rank_by: Optional[str] = "sharpe_ratio", ascending: bool = False) -> pd.DataFrame:
+    """One row per finished job: params, summary metrics, worker and runtime."""
+    rows = []
+    for path in sorted(_dirs(root)["done"].glob("*.json")):
+        result = json.loads(path.read_text())
+        if batch is not None and result["batch"] != batch:
+            continue
+        rows.append(
+            {
+                "job": result["id"],
+                **result["params"],
+                **result["summary"],
+                "worker": result["worker"],
+                "seconds": result["seconds"],
+            }
+        )
+    table = pd.DataFrame(rows)
+    if rank_by and rank_by in table.columns:
+        table = table.sort_values(rank_by, ascending=ascending, na_position="last")
+    return table.reset_index(drop=True)
+
+
+def status(root: str, lease_timeout: float = LEASE_TIMEOUT) -> Dict:
+    """Queue counts plus per-worker throughput in jobs/min."""
+    requeue_expired(root, lease_timeout)
+    dirs = _dirs(root)
+    counts = {name: sum(1 for _ in dirs[name].glob("*.json")) for name in ("pending", "leased", "done", "failed")}
+    now = time.time()
+    workers = []
+    for path in sorted(dirs["workers"].glob("*.json")):
+        try:
+            info = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        alive = info["state"] != "stopped" and now - info["last_seen"] <= lease_timeout
+        minutes = max((info["last_seen"] if not alive else now) - info["started"], 1e-9) / 60
+        workers.append(
+            {
+                "worker": info["worker"],
+                "state": info["state"] if alive else ("stopped" if info["state"] == "stopped" else "lost"),
+                "jobs_done": info["jobs_done"],
+                "jobs_failed": info["jobs_failed"],
+                "jobs_per_min": info["jobs_done"] / minutes,
+                "utilization": min(1.0, info["busy_seconds"] / (minutes * 60)),
+            }
+        )
+    active = [w for w in workers if w["state"] in ("busy", "idle")]
+    return {**counts, "workers": workers, "jobs_per_min": sum(w["jobs_per_min"] for w in active)}
+
+
+def _format_status(info: Dict) -> str:
+    lines = [
+        f"pending={info['pending']} leased={info['leased']} done={info['done']} failed={info['failed']} "
+        f"active throughput={info['jobs_per_min']:.1f} jobs/min"
+    ]
+    for w in info["workers"]:
+        lines.append(
+            f"  {w['worker']:<32} {w['state']:<8} done={w['jobs_done']:<6} failed={w['jobs_failed']:<4} "
+            f"{w['jobs_per_min']:.1f} jobs/min  util={w['utilization']:.0%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Shared-directory backtest job queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_submit = sub.add_parser("submit", help="Enqueue a parameter sweep")
+    p_submit.add_argument("--root", required=True)
+    p_submit.add_argument("--strategy", required=True, help="module:ClassName of the strategy")
+    p_submit.add_argument("--csv", help="OHLCV CSV with timestamp first column")
+    p_submit.add_argument("--store", help="Bar store root directory (use with --symbol)")
+    p_submit.add_argument("--symbol")
+    p_submit.add_argument("--start")
+    p_submit.add_argument("--end")
+    p_submit.add_argument("--grid", help="JSON dict of parameter -> list of values")
+    p_submit.add_argument("--random", help="JSON dict of parameter -> choices or {low, high}")
+    p_submit.add_argument("--iterations", type=int, default=50)
+    p_submit.add_argument("--seed", type=int, default=None)
+    p_submit.add_argument("--config", help="JSON dict of fixed strategy config")
+    p_submit.add_argument("--batch", help="Batch name (default: timestamp)")
+
+    p_worker = sub.add_parser("worker", help="Run jobs until stopped")
+    p_worker.add_argument("--root", required=True)
+    p_worker.add_argument("--max-jobs", type=int, default=None)
+    p_worker.add_argument("--idle-exit", type=float, default=None, help="Exit after this many idle seconds")
+    p_worker.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT)
+    p_worker.add_argument("--heartbeat", type=float, default=HEARTBEAT)
+    p_worker.add_argument("--cache", help="Result cache directory")
+
+    p_status = sub.add_parser("status", help="Show queue and worker throughput")
+    p_status.add_argument("--root", required=True)
+    p_status.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT)
+
+    p_collect = sub.add_parser("collect", help="Aggregate finished results")
+    p_collect.add_argument("--root", required=True)
+    p_collect.add_argument("--batch")
+    p_collect.add_argument("--rank-by", default="sharpe_ratio")
+    p_collect.add_argument("--ascending", action="store_true")
+    p_collect.add_argument("--out", help="Write the table to this CSV")
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        if bool(args.csv) == bool(args.store):
+            parser.error("exactly one of --csv or --store is required")
+        if bool(args.grid) == bool(args.random):
+            parser.error("exactly one of --grid or --random is required")
+        if args.grid:
+            param_sets = parameter_grid(json.loads(args.grid))
+        else:
+            param_sets = random_search(json.loads(args.random), args.iterations, args.seed)
+        data = {k: v for k, v in vars(args).items() if k in ("csv", "store", "symbol", "start", "end") and v}
+        for key in ("csv", "store"):
+            if key in data:
+                data[key] = str(Path(data[key]).resolve())
+        config = json.loads(args.config) if args.config else None
+        ids = submit(args.root, args.strategy, param_sets, data, config, args.batch)
+        print(f"Submitted {len(ids)} jobs (batch {ids[0].rsplit('-', 1)[0] if ids else '-'})")
+    elif args.command == "worker":
+        worker = Worker(
+            args.root,
+            lease_timeout=args.lease_timeout,
+            heartbeat=args.heartbeat,
+            cache=ResultCache(args.cache) if args.cache else None,
+        )
+        done = worker.run(max_jobs=args.max_jobs, idle_exit=args.idle_exit)
+        print(f"Worker {worker.worker_id} finished {done} jobs")
+    elif args.command == "status":
+        print(_format_status(status(args.root, args.lease_timeout)))
+    else:
+        table = collect(args.root, args.batch, args.rank_by, args.ascending)
+        if args.out:
+            table.to_csv(args.out, index=False)
+        print(table.to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    main()
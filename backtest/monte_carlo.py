@@ -0,0 +1,181 @@
+"""Bootstrap Monte Carlo risk analysis for backtest results.
+
+Resamples a backtest's trade PnL (additive paths) or equity-curve returns
+(compounding paths) into many synthetic equity paths and reports the
+distribution of final equity, max drawdown, time to recovery and the
+probability of tripping :class:`risk.risk_manager.RiskManager` limits.
+
+Paths are generated and reduced in batches of whole paths sized to
+``memory_budget``, so 100k paths x 10k steps never materialize at once.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("bootstrap", "block")
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path outcome arrays plus risk-limit breach probabilities."""
+
+    final_equity: np.ndarray
+    max_drawdown: np.ndarray
+    time_to_recovery: np.ndarray
+    drawdown_breach: float
+    daily_loss_breach: float
+    initial_equity: float
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> Dict:
+        out = {
+            "paths": int(self.final_equity.size),
+            "prob_loss": float(np.mean(self.final_equity < self.initial_equity)),
+            "prob_max_drawdown_breach": self.drawdown_breach,
+            "prob_daily_loss_breach": self.daily_loss_breach,
+        }
+        for name, arr in (
+            ("final_equity", self.final_equity),
+            ("max_drawdown", self.max_drawdown),
+            ("time_to_recovery", self.time_to_recovery),
+        ):
+            for p, v in zip(percentiles, np.percentile(arr, percentiles)):
+                out[f"{name}_p{p:g}"] = float(v)
+        return out
+
+
+def trade_pnl(engine) -> np.ndarray:
+    """Closed-trade PnL from a :class:`BacktestEngine`."""
+    return np.array([t.pnl for t in engine.trades if t.pnl is not None], dtype=np.float64)
+
+
+def equity_returns(engine) -> np.ndarray:
+    """Bar-to-bar returns of a :class:`BacktestEngine` equity curve."""
+    curve = np.asarray(engine.equity_curve, dtype=np.float64)
+    if curve.size < 2:
+        return np.empty(0)
+    return np.diff(curve) / curve[:-1]
+
+
+def _sample_indices(rng: np.random.Generator, n: int, paths: int, steps: int, method: str, block: int) -> np.ndarray:
+    if method == "bootstrap":
+        return rng.integers(0, n, size=(paths, steps), dtype=np.int32)
+    # Circular block bootstrap keeps short-range autocorrelation (streaks).
+    n_blocks = -(-steps // block)
+    starts = rng.integers(0, n, size=(paths, n_blocks, 1), dtype=np.int32)
+    idx = (starts + np.arange(block, dtype=np.int32)) % np.int32(n)
+    return idx.reshape(paths, n_blocks * block)[:, :steps]
+
+
+def _path_stats(equity: np.ndarray, initial: float, steps_per_day: int):
+    """Reduce ``(paths, steps)`` equity paths starting from ``initial``.
+
+    Returns final equity, max drawdown, the longest stretch (in steps) spent
+    below a previous peak, and the worst per-day equity change.
+    """
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, initial, out=peak)
+    scratch = np.subtract(peak, equity)
+    scratch /= peak
+    max_dd = scratch.max(axis=1)
+    del scratch
+
+    # Step index of the latest peak seen so far; step 0 is the starting equity.
+    steps = np.arange(1, equity.shape[1] + 1, dtype=np.int32)
+    last_peak = np.where(equity >= peak, steps, np.int32(0))
+    np.maximum.accumulate(last_peak, axis=1, out=last_peak)
+    recovery = (steps - last_peak).max(axis=1)
+
+    # Equity at each day boundary (steps 0, d, 2d, ... and the final step).
+    marks = equity[:, steps_per_day - 1::steps_per_day]
+    if equity.shape[1] % steps_per_day:
+        marks = np.concatenate([marks, equity[:, -1:]], axis=1)
+    worst_day = np.diff(marks, axis=1, prepend=initial).min(axis=1)
+    return equity[:, -1].copy(), max_dd, recovery, worst_day
+
+
+def simulate(
+    samples: Sequence[float],
+    initial_equity: float = 10_000.0,
+    n_paths: int = 10_000,
+    n_steps: Optional[int] = None,
+    kind: str = "pnl",
+    method: str = "bootstrap",
+    block: int = 20,
+    steps_per_day: int = 1,
+    max_drawdown: float = 0.2,
+    max_daily_loss: float = -200.0,
+    risk=None,
+    memory_budget: int = 256 * 1024 * 1024,
+    dtype=np.float64,
+    seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """Resample ``samples`` into ``n_paths`` equity paths of ``n_steps``.
+
+    ``kind="pnl"`` treats samples as dollar PnL per trade (equity adds up);
+    ``kind="returns"`` treats them as fractional returns (equity compounds).
+    ``method`` is ``"bootstrap"`` (iid) or ``"block"`` (circular blocks of
+    ``block`` steps). Limits default to ``RiskManager``'s defaults, or are
+    read from ``risk`` when given. ``steps_per_day`` groups steps into days
+    for the daily-loss check.
+    """
+    if kind not in ("pnl", "returns"):
+        raise ValueError("kind must be 'pnl' or 'returns'")
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    dtype = np.dtype(dtype).type
+    data = np.asarray(samples, dtype=dtype)
+    data = data[np.isfinite(data)]
+    if data.size == 0:
+        raise ValueError("no finite samples to resample")
+    if risk is not None:
+        max_drawdown = risk.max_drawdown
+        max_daily_loss = risk.max_daily_loss
+    n_steps = n_steps or data.size
+    steps_per_day = max(1, int(steps_per_day))
+
+    # int32 indices and step markers + sampled equity, peak and scratch arrays
+    bytes_per_path = n_steps * (8 + 3 * np.dtype(dtype).itemsize)
+    batch = int(max(1, min(n_paths, memory_budget // bytes_per_path)))
+    rng = np.random.default_rng(seed)
+
+    final = np.empty(n_paths, dtype=np.float64)
+    max_dd = np.empty(n_paths, dtype=np.float64)
+    recovery = np.empty(n_paths, dtype=np.int64)
+    worst_day = np.empty(n_paths, dtype=np.float64)
+    initial = dtype(initial_equity)
+
+    for lo in range(0, n_paths, batch):
+        hi = min(lo + batch, n_paths)
+        drawn = data[_sample_indices(rng, data.size, hi - lo, n_steps, method, block)]
+        if kind == "pnl":
+            np.cumsum(drawn, axis=1, out=drawn)
+            drawn += initial
+        else:
+            drawn += 1
+            np.cumprod(drawn, axis=1, out=drawn)
+            drawn *= initial
+        final[lo:hi], max_dd[lo:hi], recovery[lo:hi], worst_day[lo:hi] = _path_stats(drawn, initial, steps_per_day)
+
+    result = MonteCarloResult(
+        final_equity=final,
+        max_drawdown=max_dd,
+        time_to_recovery=recovery,
+        drawdown_breach=float(np.mean(max_dd >= max_drawdown)),
+        daily_loss_breach=float(np.mean(worst_day <= max_daily_loss)),
+        initial_equity=float(initial_equity),
+    )
+    logging.info(f"Monte Carlo ({method}, {kind}) {n_paths}x{n_steps}: {result.summary()}")
+    return result
+
+
+def simulate_engine(engine, kind: str = "pnl", **kwargs) -> MonteCarloResult:
+    """Run :func:`simulate` on a finished :class:`BacktestEngine`."""
+    samples = trade_pnl(engine) if kind == "pnl" else equity_returns(engine)
+    initial = engine.equity_curve[0] if len(engine.equity_curve) else engine.balance
+    kwargs.setdefault("initial_equity", float(initial))
+    return simulate(samples, kind=kind, **kwargs)
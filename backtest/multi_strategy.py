@@ -0,0 +1,291 @@
+"""Run many strategies side by side in one pass over shared bars.
+
+Every strategy sees the same read-only close window per bar, and indicator
+values requested through :class:`BarFeatures` are computed once per bar no
+matter how many strategies ask for them. Each strategy keeps its own
+balance, position, trades and equity, with the same fill and sizing rules
+as :class:`BacktestEngine`, so a column here equals a standalone run.
+
+Example::
+
+    python -m backtest.multi_strategy --csv btc_1m.csv \\
+        --strategy strategies.crypto_scalper:CryptoScalper \\
+        --strategy 'strategies.crypto_scalper:CryptoScalper={"scalp_rsi_buy_threshold": 25}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine, RiskManager, Trade
+from backtest.backtest_runner import DEFAULT_WINDOW, bar_handler, load_prices, make_strategy
+from backtest.sweep import load_strategy
+from data.bar_store import BarStore
+from indicators.technical_indicators import (
+    exponential_moving_average,
+    moving_average,
+    relative_strength_index,
+)
+
+
+def _momentum(history, window: int) -> float:
+    return (history[-1] - history[-window]) / history[-window]
+
+
+# name -> fn(history, *params); extend with register_feature().
+FEATURES: Dict[str, Callable] = {
+    "rsi": relative_strength_index,
+    "sma": moving_average,
+    "ema": exponential_moving_average,
+    "momentum": _momentum,
+}
+
+
+def register_feature(name: str, fn: Callable) -> None:
+    """Make ``fn(history, *params)`` available as ``features.get(name, *params)``."""
+    FEATURES[name] = fn
+
+
+class BarFeatures:
+    """Per-bar memo of indicator values shared by all strategies in a pass.
+
+    Values are keyed by ``(name, *params)`` and dropped when the bar advances.
+    """
+
+    def __init__(self):
+        self.history: Optional[np.ndarray] = None
+        self._memo: Dict[tuple, float] = {}
+        self.computed = 0
+        self.requests = 0
+
+    def advance(self, history: np.ndarray) -> None:
+        self.history = history
+        self._memo.clear()
+
+    def get(self, name: str, *params):
+        self.requests += 1
+        key = (name, *params)
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = FEATURES[name](self.history, *params)
+            self._memo[key] = value
+            self.computed += 1
+            return value
+
+    def rsi(self, period: int = 14) -> float:
+        return self.get("rsi", period)
+
+    def sma(self, period: int) -> float:
+        return self.get("sma", period)
+
+    def ema(self, period: int) -> float:
+        return self.get("ema", period)
+
+    def momentum(self, window: int) -> float:
+        return self.get("momentum", window)
+
+
+def signal_generator_handler(generator, sentiment_score: float = 0.0, min_confidence: float = 0.0) -> Callable:
+    """Adapt a :class:`signals.signal_generator.SignalGenerator` to a bar handler."""
+
+    def handler(history, features=None):
+        rsi = features.rsi(14) if features is not None else None
+        signal = generator.generate(history, sentiment_score, rsi=rsi)
+        return signal.action if signal.confidence >= min_confidence else "hold"
+
+    return handler
+
+
+def _handler(strategy) -> Callable:
+    if callable(strategy) and not hasattr(strategy, "on_bar") and not hasattr(strategy, "generate_signal"):
+        return strategy
+    return bar_handler(strategy)
+
+
+def _wants_features(handler: Callable) -> bool:
+    try:
+        return "features" in inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class _Book:
+    """Balance, position and results of one strategy in the pass."""
+
+    __slots__ = ("handler", "features", "balance", "trade", "trades")
+
+    def __init__(self, handler: Callable, balance: float):
+        self.handler = handler
+        self.features = _wants_features(handler)
+        self.balance = balance
+        self.trade: Optional[Trade] = None
+        self.trades: List[Trade] = []
+
+
+class MultiStrategyBacktest:
+    """Backtest several strategies over the same prices in a single loop.
+
+    ``strategies`` maps a column name to a strategy instance (anything
+    :func:`bar_handler` accepts) or a ``fn(history[, features])`` callable.
+    Handlers with a ``features`` parameter receive the shared
+    :class:`BarFeatures`.
+    """
+
+    def __init__(
+        self,
+        prices: pd.DataFrame,
+        strategies: Dict[str, object],
+        initial_balance: float = 10_000.0,
+        risk_pct: float = 0.01,
+        slippage: float = 0.0005,
+        commission: float = 0.001,
+        window: Optional[int] = DEFAULT_WINDOW,
+    ) -> None:
+        if not strategies:
+            raise ValueError("at least one strategy is required")
+        self.prices = prices
+        self.names = list(strategies)
+        self.initial_balance = float(initial_balance)
+        self.risk_pct = risk_pct
+        self.slippage = slippage
+        self.commission = commission
+        self.window = window
+        self.handlers = [_handler(s) for s in strategies.values()]
+        self.features = BarFeatures()
+        self.engines: Dict[str, BacktestEngine] = {}
+
+    def run(self) -> Dict[str, BacktestEngine]:
+        """Run the pass and return one finished :class:`BacktestEngine` per strategy.
+
+        The returned engines hold the trades, open position and equity curve,
+        so ``summary()``, result caching and Monte Carlo work on them as usual.
+        """
+        closes = np.array(self.prices["close"], dtype=np.float64)
+        closes.flags.writeable = False
+        index = self.prices.index
+        n = closes.size
+        risk = RiskManager(self.risk_pct)
+        books = [_Book(h, self.initial_balance) for h in self.handlers]
+        equity = np.empty((len(books), n), dtype=np.float64)
+        features = self.features
+        slippage, commission, window = self.slippage, self.commission, self.window
+
+        for i in range(n):
+            price = float(closes[i])
+            history = closes[0 if window is None else max(0, i + 1 - window):i + 1]
+            features.advance(history)
+            ts = None
+            for k, book in enumerate(books):
+                trade = book.trade
+                if trade:
+                    eq = book.balance + (price - trade.entry_price) * trade.size
+                else:
+                    eq = book.balance
+                equity[k, i] = eq
+
+                signal = book.handler(history, features=features) if book.features else book.handler(history)
+
+                if signal == "buy" and trade is None:
+                    size = risk.get_size(eq, price)
+                    if size > 0:
+                        ts = index[i] if ts is None else ts
+                        entry = price * (1 + slippage)
+                        book.balance -= entry * size * (1 + commission)
+                        book.trade = Trade(ts, None, entry, None, size)
+                elif signal == "sell" and trade is not None:
+                    ts = index[i] if ts is None else ts
+                    exit_price = price * (1 - slippage)
+                    pnl = (exit_price - trade.entry_price) * trade.size
+                    fees = (exit_price * trade.size) * commission
+                    book.balance += exit_price * trade.size - fees
+                    trade.exit_time = ts
+                    trade.exit_price = exit_price
+                    trade.pnl = pnl - (trade.entry_price * trade.size * commission)
+                    book.trades.append(trade)
+                    book.trade = None
+
+        self.engines = {}
+        for k, (name, book) in enumerate(zip(self.names, books)):
+            engine = BacktestEngine(
+                self.prices,
+                self.handlers[k],
+                initial_balance=self.initial_balance,
+                risk_pct=self.risk_pct,
+                slippage=slippage,
+                commission=commission,
+                window=window,
+            )
+            engine.balance = book.balance
+            engine.open_trade = book.trade
+            engine.trades = book.trades
+            engine.equity_curve = equity[k]
+            engine.bars_processed = n
+            self.engines[name] = engine
+        logging.info(
+            f"Multi-strategy pass: {len(books)} strategies x {n} bars, "
+            f"{features.computed}/{features.requests} feature values computed"
+        )
+        return self.engines
+
+    def summary(self) -> pd.DataFrame:
+        """Metrics (rows) by strategy (columns)."""
+        if not self.engines:
+            return pd.DataFrame()
+        return pd.DataFrame({name: engine.summary() for name, engine in self.engines.items()})
+
+
+def run_multi_backtest(
+    strategies: Dict[str, object],
+    prices: pd.DataFrame,
+    **kwargs,
+) -> pd.DataFrame:
+    """Convenience wrapper returning the side-by-side summary matrix."""
+    multi = MultiStrategyBacktest(prices, strategies, **kwargs)
+    multi.run()
+    return multi.summary()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backtest several strategies in one pass")
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        required=True,
+        help="module:ClassName, optionally followed by =JSON config; repeatable",
+    )
+    parser.add_argument("--csv", help="OHLCV CSV with timestamp first column")
+    parser.add_argument("--store", help="Bar store root directory (use with --symbol)")
+    parser.add_argument("--symbol", help="Symbol to read from --store")
+    parser.add_argument("--start", help="First bar timestamp (inclusive)")
+    parser.add_argument("--end", help="Last bar timestamp (exclusive)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--out", help="Write the summary matrix to this CSV")
+    args = parser.parse_args(argv)
+
+    if bool(args.csv) == bool(args.store):
+        parser.error("exactly one of --csv or --store is required")
+    strategies: Dict[str, object] = {}
+    for spec in args.strategy:
+        path, _, raw = spec.partition("=")
+        config = json.loads(raw) if raw else {}
+        name = path.rpartition(":")[2] + (f" {raw}" if raw else "")
+        strategies[name] = make_strategy(load_strategy(path), config)
+
+    prices = load_prices(args.csv, BarStore(args.store) if args.store else None, args.symbol, args.start, args.end)
+    table = run_multi_backtest(strategies, prices, window=args.window)
+    if args.out:
+        table.to_csv(args.out)
+    print(table.to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,198 @@
+"""Multi-symbol portfolio backtester sharing one cash balance.
+
+Prices and targets are ``(time, symbol)`` panels, e.g. NumPy arrays or
+memory maps. Time is processed in chunks sized to ``memory_budget`` so the
+working set stays bounded however long the history is. Between bars where
+any target changes, positions are constant, so mark-to-market for a whole
+block of bars is a single matrix-vector product.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+@dataclass
+class PortfolioResult:
+    """Aggregate equity plus per-symbol contribution from a portfolio run."""
+
+    equity: np.ndarray
+    symbols: List[str]
+    symbol_pnl: np.ndarray
+    symbol_fills: np.ndarray
+    positions: np.ndarray
+    index: Optional[pd.Index] = None
+    symbol_equity: Optional[np.ndarray] = None
+    record_every: Optional[int] = None
+    initial_balance: float = 10_000.0
+
+    def equity_series(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    def summary(self) -> Dict:
+        if self.equity.size == 0:
+            return {}
+        curve = self.equity
+        returns = np.diff(curve) / curve[:-1]
+        peak = np.maximum.accumulate(curve)
+        sharpe = 0.0
+        if returns.size > 1 and np.std(returns) != 0:
+            sharpe = (np.mean(returns) - 0.02) / np.std(returns)
+        return {
+            "equity": float(curve[-1]),
+            "fills": int(self.symbol_fills.sum()),
+            "sharpe_ratio": float(sharpe),
+            "max_drawdown": max(0.0, float(np.max((peak - curve) / peak))),
+            "best_symbol": self.symbols[int(np.argmax(self.symbol_pnl))] if self.symbols else None,
+            "worst_symbol": self.symbols[int(np.argmin(self.symbol_pnl))] if self.symbols else None,
+        }
+
+
+class PortfolioBacktestEngine:
+    """Backtest many symbols at once against a single cash balance.
+
+    ``targets[t, s]`` is the desired direction for symbol ``s`` after bar
+    ``t``: ``1`` long, ``-1`` short, ``0`` flat and ``NaN`` to keep whatever
+    is held. When the direction changes the old position is closed and a new
+    one opened with ``risk_pct`` of current equity, using the same slippage
+    and commission conventions as :class:`BacktestEngine`.
+    """
+
+    def __init__(
+        self,
+        closes: ArrayLike,
+        targets: ArrayLike,
+        symbols: Optional[Sequence[str]] = None,
+        initial_balance: float = 10_000.0,
+        risk_pct: float = 0.01,
+        slippage: float = 0.0005,
+        commission: float = 0.001,
+        dtype=np.float64,
+        memory_budget: int = 256 * 1024 * 1024,
+        record_every: Optional[int] = None,
+    ) -> None:
+        index = None
+        if isinstance(closes, pd.DataFrame):
+            index = closes.index
+            symbols = symbols or [str(c) for c in closes.columns]
+            closes = closes.to_numpy()
+        if isinstance(targets, pd.DataFrame):
+            targets = targets.to_numpy()
+        if closes.ndim != 2 or closes.shape != targets.shape:
+            raise ValueError("closes and targets must be 2D (time, symbol) arrays of the same shape")
+        if record_every is not None and record_every < 1:
+            raise ValueError("record_every must be a positive number of bars")
+
+        self.closes = closes
+        self.targets = targets
+        self.index = index
+        self.symbols = list(symbols) if symbols is not None else [str(i) for i in range(closes.shape[1])]
+        self.initial_balance = float(initial_balance)
+        self.risk_pct = risk_pct
+        self.slippage = slippage
+        self.commission = commission
+        self.dtype = np.dtype(dtype)
+        self.record_every = record_every
+        n_symbols = closes.shape[1]
+        # Peak working set per cell: raw, stacked, forward-filled and marked
+        # prices (4 x itemsize), the int64 forward-fill index, and float32
+        # targets plus their stacked copy, masks and int8 directions.
+        row_bytes = max(n_symbols * (self.dtype.itemsize * 4 + 8 + 12), 1)
+        self.chunk_size = max(1, memory_budget // row_bytes)
+
+    def run(self) -> PortfolioResult:
+        n_bars, n_symbols = self.closes.shape
+        equity = np.empty(n_bars, dtype=np.float64)
+        sym_cash = np.zeros(n_symbols, dtype=np.float64)
+        pos = np.zeros(n_symbols, dtype=np.float64)
+        cur_dir = np.zeros(n_symbols, dtype=np.int8)
+        fills = np.zeros(n_symbols, dtype=np.int64)
+        last_px = np.full(n_symbols, np.nan, dtype=self.dtype)
+        sym_equity = None
+        if self.record_every:
+            n_rec = -(-n_bars // self.record_every)
+            sym_equity = np.empty((n_rec, n_symbols), dtype=self.dtype)
+
+        for t0 in range(0, n_bars, self.chunk_size):
+            t1 = min(t0 + self.chunk_size, n_bars)
+            raw = np.asarray(self.closes[t0:t1], dtype=self.dtype)
+            px = _ffill(raw, last_px)
+            last_px = px[-1].copy()
+            tradable = np.isfinite(raw) & (raw > 0)
+            want = np.asarray(self.targets[t0:t1], dtype=np.float32)
+            want = np.where(tradable, np.sign(want), np.nan)
+            direction = _ffill(want, cur_dir.astype(np.float32))
+            direction = np.nan_to_num(direction).astype(np.int8)
+            mtm_px = np.nan_to_num(px)
+
+            prev = np.vstack([cur_dir[None, :], direction[:-1]])
+            change_rows = np.flatnonzero((direction != prev).any(axis=1))
+
+            seg = 0
+            for r in change_rows:
+                self._mark(equity, sym_equity, mtm_px, sym_cash, pos, t0, seg, r + 1)
+                eq_now = equity[t0 + r]
+                changed = np.flatnonzero(direction[r] != cur_dir)
+                price = px[r, changed].astype(np.float64)
+                old = pos[changed]
+                new_dir = direction[r, changed]
+
+                close_fill = price * (1 - self.slippage * np.sign(old))
+                flow = old * close_fill - np.abs(old) * close_fill * self.commission
+                qty = np.round(new_dir * (eq_now * self.risk_pct) / price, 8)
+                open_fill = price * (1 + self.slippage * new_dir)
+                flow -= qty * open_fill + np.abs(qty) * open_fill * self.commission
+
+                sym_cash[changed] += flow
+                pos[changed] = qty
+                cur_dir[changed] = new_dir
+                fills[changed] += (old != 0).astype(np.int64) + (new_dir != 0)
+                seg = r + 1
+            self._mark(equity, sym_equity, mtm_px, sym_cash, pos, t0, seg, t1 - t0)
+
+        symbol_pnl = sym_cash + pos * np.nan_to_num(last_px.astype(np.float64))
+        logging.info(
+            f"Portfolio backtest finished: {n_symbols} symbols, {n_bars} bars, "
+            f"{int(fills.sum())} fills, equity={equity[-1] if n_bars else self.initial_balance:.2f}"
+        )
+        return PortfolioResult(
+            equity=equity,
+            symbols=self.symbols,
+            symbol_pnl=symbol_pnl,
+            symbol_fills=fills,
+            positions=pos,
+            index=self.index,
+            symbol_equity=sym_equity,
+            record_every=self.record_every,
+            initial_balance=self.initial_balance,
+        )
+
+    def _mark(self, equity, sym_equity, px, sym_cash, pos, t0: int, a: int, b: int) -> None:
+        """Mark bars ``[a, b)`` of the current chunk to market with fixed positions."""
+        if b <= a:
+            return
+        block = px[a:b]
+        cash = self.initial_balance + sym_cash.sum()
+        equity[t0 + a:t0 + b] = cash + block @ pos.astype(block.dtype)
+        if sym_equity is not None:
+            k = self.record_every
+            first = -(-(t0 + a) // k) * k
+            rows = np.arange(first, t0 + b, k)
+            if rows.size:
+                sym_equity[rows // k] = sym_cash + block[rows - t0 - a] * pos
+
+
+def _ffill(block: np.ndarray, seed: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down the time axis, starting from ``seed``."""
+    stacked = np.vstack([seed[None, :].astype(block.dtype), block])
+    valid = ~np.isnan(stacked)
+    idx = np.where(valid, np.arange(stacked.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return stacked[idx, np.arange(stacked.shape[1])][1:]
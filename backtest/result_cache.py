@@ -0,0 +1,230 @@
+"""Content-addressed on-disk cache of backtest results.
+
+A result is keyed by a SHA-256 over
+
+* the price data -- the CSV file bytes, the bar-store segment hashes
+  covering the range, or the raw arrays of an in-memory frame;
+* the strategy code -- the source files of the strategy class, its base
+  classes and the project modules/functions those files import;
+* the strategy config dict and the engine parameters.
+
+Editing strategy code (or the engine itself) changes the key, so stale
+results are never returned. Entries are single ``.npz`` files holding the
+summary, trades and equity curve; the least recently used are evicted once
+the directory grows past ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine, Trade
+
+# Bump when the entry layout or key recipe changes.
+CACHE_VERSION = 1
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# BacktestEngine arguments that change results (unlike e.g. results_dir).
+ENGINE_PARAMS = ("initial_balance", "risk_pct", "slippage", "commission", "window")
+
+
+@dataclass
+class CachedResult:
+    summary: Dict
+    trades: List[Trade]
+    equity: pd.Series
+
+
+def _file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def csv_fingerprint(csv_path: str, start=None, end=None) -> str:
+    return json.dumps(["csv", _file_digest(csv_path), str(start), str(end)])
+
+
+def store_fingerprint(store, symbol: str, start=None, end=None) -> str:
+    """Fingerprint from the segment hashes overlapping ``[start, end)``."""
+    from data.bar_store import _to_ns
+
+    start_ns, end_ns = _to_ns(start), _to_ns(end)
+    hashes = [
+        seg["sha256"]
+        for seg in store.segments(symbol)
+        if (start_ns is None or seg["end_ns"] >= start_ns) and (end_ns is None or seg["start_ns"] < end_ns)
+    ]
+    return json.dumps(["store", symbol.upper(), hashes, start_ns, end_ns])
+
+
+def frame_fingerprint(prices: pd.DataFrame) -> str:
+    """Fingerprint of an in-memory OHLCV frame (index and the five price columns)."""
+    digest = hashlib.sha256(pd.DatetimeIndex(prices.index).as_unit("ns").asi8.tobytes())
+    for col in ("open", "high", "low", "close", "volume"):
+        digest.update(np.ascontiguousarray(prices[col].to_numpy(dtype=np.float64)).tobytes())
+    return json.dumps(["frame", digest.hexdigest()])
+
+
+def _project_file(obj) -> Optional[Path]:
+    try:
+        path = Path(inspect.getsourcefile(obj)).resolve()
+    except (TypeError, OSError):
+        return None
+    return path if PROJECT_ROOT in path.parents else None
+
+
+def code_files(strategy_cls: Type) -> List[Path]:
+    """Project source files a strategy depends on.
+
+    Covers the modules of the class and its bases plus project modules,
+    functions and classes they reference at module level (one level deep).
+    """
+    files = set()
+    for klass in inspect.getmro(strategy_cls):
+        module = sys.modules.get(klass.__module__)
+        path = _project_file(module) if module is not None else None
+        if path is None:
+            continue
+        files.add(path)
+        for value in vars(module).values():
+            if inspect.ismodule(value) or inspect.isfunction(value) or inspect.isclass(value):
+                dep = _project_file(value)
+                if dep is not None:
+                    files.add(dep)
+    files.add(Path(inspect.getsourcefile(BacktestEngine)).resolve())
+    return sorted(files)
+
+
+def code_fingerprint(strategy_cls: Type) -> str:
+    digest = hashlib.sha256(f"{strategy_cls.__module__}.{strategy_cls.__qualname__}".encode())
+    for path in code_files(strategy_cls):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def engine_params(**kwargs) -> Dict:
+    """Engine keyword arguments that affect results, with defaults filled in."""
+    defaults = inspect.signature(BacktestEngine.__init__).parameters
+    return {name: kwargs.get(name, defaults[name].default) for name in ENGINE_PARAMS}
+
+
+class ResultCache:
+    """Directory of ``<key>.npz`` backtest results with size-bounded LRU eviction."""
+
+    def __init__(self, root: str = "backtest/cache", max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._code: Dict[Type, str] = {}
+
+    def __repr__(self) -> str:
+        return f"ResultCache({str(self.root)!r})"
+
+    def __getstate__(self):
+        # Workers recompute code hashes themselves.
+        return {**self.__dict__, "_code": {}}
+
+    def key(self, data_fingerprint: str, strategy_cls: Type, config: Optional[Dict], params: Dict) -> str:
+        if strategy_cls not in self._code:
+            self._code[strategy_cls] = code_fingerprint(strategy_cls)
+        payload = json.dumps(
+            [CACHE_VERSION, data_fingerprint, self._code[strategy_cls], config or {}, params],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                equity = pd.Series(
+                    data["equity"],
+                    index=pd.DatetimeIndex(data["ts"].view("datetime64[ns]")),
+                    name="equity",
+                )
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logging.warning(f"Dropping unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        trades = []
+        for t in meta["trades"]:
+            t["entry_time"] = pd.Timestamp(t["entry_time"])
+            t["exit_time"] = pd.Timestamp(t["exit_time"]) if t["exit_time"] else None
+            trades.append(Trade(**t))
+        return CachedResult(meta["summary"], trades, equity)
+
+    def put(self, key: str, engine: BacktestEngine) -> None:
+        """Store a finished engine's summary, trades and equity curve."""
+        curve = np.asarray(engine.equity_curve, dtype=np.float64)
+        trades = []
+        for t in engine.trades:
+            row = asdict(t)
+            row["entry_time"] = str(t.entry_time)
+            row["exit_time"] = str(t.exit_time) if t.exit_time is not None else None
+            trades.append(row)
+        summary = {k: float(v) for k, v in engine.summary().items()}
+        meta = json.dumps({"summary": summary, "trades": trades})
+        ts = pd.DatetimeIndex(engine.prices.index[: curve.size]).as_unit("ns").asi8
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{key}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp, meta=np.array(meta), equity=curve, ts=ts)
+            tmp.replace(self._path(key))
+        except Exception as e:
+            logging.error(f"Failed to write backtest cache entry: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under ``max_bytes``."""
+        entries = []
+        for path in self.root.glob("*.npz"):
+            if path.name.endswith(".tmp.npz"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*.npz")) if self.root.is_dir() else 0
+
+    def clear(self) -> None:
+        for path in self.root.glob("*.npz"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,261 @@
+"""Parallel parameter sweeps over :class:`BacktestEngine`.
+
+Prices are loaded once, copied into a shared memory block and attached by
+each worker process, so a sweep never pickles the price frame per task.
+
+Example::
+
+    python -m backtest.sweep --strategy strategies.crypto_scalper:CryptoScalper \\
+        --csv btc_1m.csv --grid '{"risk_pct": [0.01, 0.02], "scalp_rsi_buy_threshold": [25, 30]}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine
+from backtest.backtest_runner import DEFAULT_WINDOW, bar_handler, load_prices, make_strategy
+from backtest.result_cache import ENGINE_PARAMS, ResultCache, engine_params, frame_fingerprint
+from data.bar_store import BarStore
+
+# Sweep keys in ENGINE_PARAMS go to BacktestEngine; everything else goes to the strategy config.
+PRICE_COLS = ("open", "high", "low", "close", "volume")
+
+# Worker-process globals populated by _init_worker.
+_SHM: Optional[shared_memory.SharedMemory] = None
+_PRICES: Optional[pd.DataFrame] = None
+
+
+class SharedPrices:
+    """OHLCV frame published to worker processes through shared memory.
+
+    Layout: ``n`` int64 epoch-ns timestamps followed by a ``(5, n)`` float64
+    block of open/high/low/close/volume.
+    """
+
+    def __init__(self, prices: pd.DataFrame):
+        n = len(prices)
+        self.n = n
+        self.shm = shared_memory.SharedMemory(create=True, size=max(n * 8 * 6, 8))
+        index, ohlcv = _layout(self.shm.buf, n)
+        index[:] = pd.DatetimeIndex(prices.index).as_unit("ns").asi8
+        for row, col in enumerate(PRICE_COLS):
+            ohlcv[row] = prices[col].to_numpy(dtype=np.float64)
+
+    @property
+    def spec(self) -> Tuple[str, int]:
+        return self.shm.name, self.n
+
+    @staticmethod
+    def attach(spec: Tuple[str, int]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+        """Map the block named in ``spec`` and wrap it in a zero-copy frame."""
+        name, n = spec
+        shm = shared_memory.SharedMemory(name=name)
+        index, ohlcv = _layout(shm.buf, n)
+        frame = pd.DataFrame(
+            {col: ohlcv[row] for row, col in enumerate(PRICE_COLS)},
+            index=pd.DatetimeIndex(index.view("datetime64[ns]")),
+            copy=False,
+        )
+        return shm, frame
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedPrices":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _layout(buf, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    index = np.ndarray((n,), dtype=np.int64, buffer=buf)
+    ohlcv = np.ndarray((len(PRICE_COLS), n), dtype=np.float64, buffer=buf, offset=n * 8)
+    return index, ohlcv
+
+
+def parameter_grid(grid: Dict[str, Iterable]) -> List[Dict]:
+    """Expand ``{"name": [values...]}`` into every combination."""
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_search(space: Dict, n_iter: int, seed: Optional[int] = None) -> List[Dict]:
+    """Sample ``n_iter`` parameter sets from ``space``.
+
+    Each entry is either a list of choices or ``{"low": a, "high": b}``;
+    ranges with two ints sample integers (inclusive), otherwise floats.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n_iter):
+        params = {}
+        for key, dist in space.items():
+            if isinstance(dist, dict):
+                low, high = dist["low"], dist["high"]
+                if isinstance(low, int) and isinstance(high, int):
+                    params[key] = rng.randint(low, high)
+                else:
+                    params[key] = rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(list(dist))
+        samples.append(params)
+    return samples
+
+
+def split_params(params: Dict) -> Tuple[Dict, Dict]:
+    """Return ``(engine_kwargs, strategy_config)`` for one parameter set."""
+    engine = {k: v for k, v in params.items() if k in ENGINE_PARAMS}
+    config = {k: v for k, v in params.items() if k not in ENGINE_PARAMS}
+    return engine, config
+
+
+def evaluate(
+    strategy_cls: Type,
+    prices: pd.DataFrame,
+    params: Dict,
+    base_config: Optional[Dict] = None,
+    cache: Optional[ResultCache] = None,
+    data_fingerprint: Optional[str] = None,
+) -> Dict:
+    """Run one backtest in-process and return ``summary()`` merged with ``params``.
+
+    With a ``cache`` the run is looked up first; pass ``data_fingerprint``
+    to avoid rehashing ``prices`` on every call.
+    """
+    engine_kwargs, config = split_params(params)
+    engine_kwargs.setdefault("window", DEFAULT_WINDOW)
+    config = {**(base_config or {}), **config}
+    key = None
+    if cache is not None:
+        data_fingerprint = data_fingerprint or frame_fingerprint(prices)
+        key = cache.key(data_fingerprint, strategy_cls, config, engine_params(**engine_kwargs))
+        hit = cache.get(key)
+        if hit is not None:
+            return {**params, **hit.summary}
+    strategy = make_strategy(strategy_cls, config)
+    engine = BacktestEngine(prices, bar_handler(strategy), **engine_kwargs)
+    engine.run(save=False)
+    if key is not None:
+        cache.put(key, engine)
+    summary = {k: float(v) for k, v in engine.summary().items()}
+    return {**params, **summary}
+
+
+def _init_worker(spec: Tuple[str, int]) -> None:
+    global _SHM, _PRICES
+    _SHM, _PRICES = SharedPrices.attach(spec)
+
+
+def _evaluate_shared(task: Tuple) -> Dict:
+    strategy_cls, params, base_config, cache, data_fingerprint = task
+    try:
+        return evaluate(strategy_cls, _PRICES, params, base_config, cache, data_fingerprint)
+    except Exception as e:
+        logging.error(f"Sweep run failed for {params}: {e}")
+        return {**params, "error": str(e)}
+
+
+def run_sweep(
+    strategy_cls: Type,
+    prices: pd.DataFrame,
+    param_sets: List[Dict],
+    workers: Optional[int] = None,
+    base_config: Optional[Dict] = None,
+    rank_by: str = "sharpe_ratio",
+    ascending: bool = False,
+    cache: Optional[ResultCache] = None,
+) -> pd.DataFrame:
+    """Evaluate every parameter set across a process pool.
+
+    Returns one row per run ranked by ``rank_by``. ``strategy_cls`` must be
+    importable by the workers (defined at module level). Runs found in
+    ``cache`` are not recomputed.
+    """
+    if not param_sets:
+        return pd.DataFrame()
+    workers = workers or os.cpu_count() or 1
+    data_fingerprint = frame_fingerprint(prices) if cache is not None else None
+    tasks = [(strategy_cls, params, base_config, cache, data_fingerprint) for params in param_sets]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with SharedPrices(prices) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared.spec,)
+        ) as pool:
+            rows = list(pool.map(_evaluate_shared, tasks, chunksize=chunksize))
+
+    table = pd.DataFrame(rows)
+    if rank_by in table.columns:
+        table = table.sort_values(rank_by, ascending=ascending, na_position="last")
+    return table.reset_index(drop=True)
+
+
+def load_strategy(path: str) -> Type:
+    """Import ``package.module:ClassName``."""
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError("strategy must be given as module:ClassName")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel backtest parameter sweep")
+    parser.add_argument("--strategy", required=True, help="module:ClassName of the strategy")
+    parser.add_argument("--csv", help="OHLCV CSV with timestamp first column")
+    parser.add_argument("--store", help="Bar store root directory (use with --symbol)")
+    parser.add_argument("--symbol", help="Symbol to read from --store")
+    parser.add_argument("--start", help="First bar timestamp (inclusive)")
+    parser.add_argument("--end", help="Last bar timestamp (exclusive)")
+    parser.add_argument("--grid", help="JSON dict of parameter -> list of values")
+    parser.add_argument("--random", help="JSON dict of parameter -> choices or {low, high}")
+    parser.add_argument("--iterations", type=int, default=50, help="Samples for --random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--config", help="JSON dict of fixed strategy config")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="sharpe_ratio")
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--out", help="Write the ranked table to this CSV")
+    parser.add_argument("--cache", help="Result cache directory; reuse identical earlier runs")
+    args = parser.parse_args(argv)
+
+    if bool(args.csv) == bool(args.store):
+        parser.error("exactly one of --csv or --store is required")
+    if bool(args.grid) == bool(args.random):
+        parser.error("exactly one of --grid or --random is required")
+    if args.grid:
+        param_sets = parameter_grid(json.loads(args.grid))
+    else:
+        param_sets = random_search(json.loads(args.random), args.iterations, args.seed)
+
+    table = run_sweep(
+        load_strategy(args.strategy),
+        load_prices(args.csv, BarStore(args.store) if args.store else None, args.symbol, args.start, args.end),
+        param_sets,
+        workers=args.workers,
+        base_config=json.loads(args.config) if args.config else None,
+        rank_by=args.rank_by,
+        ascending=args.ascending,
+        cache=ResultCache(args.cache) if args.cache else None,
+    )
+    if args.out:
+        table.to_csv(args.out, index=False)
+    print(table.to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    main()
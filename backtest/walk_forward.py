@@ -0,0 +1,276 @@
+"""Walk-forward optimization on top of :class:`BacktestEngine`.
+
+The price index is split into rolling in-sample/out-of-sample windows. For
+each window every parameter set is scored on the in-sample slice, the best
+one is replayed on the following out-of-sample slice and the out-of-sample
+equity segments are stitched into one curve. Windows are evaluated
+concurrently; prices reach the workers through :class:`SharedPrices`.
+
+``strategy`` may be a bar strategy class (``generate_signal``/``on_bar``) or
+a vectorized ``signal_fn(close, **params)`` returning one signal per bar
+(it must be causal: bar ``i`` may only look at ``close[:i + 1]``).
+Vectorized signals are computed once per parameter set over the full close
+array and cached per worker as int8 (``1``/``-1``/``0``), so overlapping
+windows slice the same arrays instead of recomputing indicators. Every
+window walks the whole grid, so a run sizes the cache to hold all of its
+parameter sets (at least ``SIGNAL_CACHE_SIZE``), capped at
+``SIGNAL_CACHE_BYTES`` of int8 signals per worker; past that cap the least
+recently used sets are recomputed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine, _normalize_signals
+from backtest.backtest_runner import DEFAULT_WINDOW, bar_handler, load_price_csv, make_strategy
+from backtest.sweep import SharedPrices, evaluate, load_strategy, parameter_grid, split_params
+
+_PRICES: Optional[pd.DataFrame] = None
+_SHM = None
+SIGNAL_CACHE_SIZE = 64
+SIGNAL_CACHE_BYTES = 256 * 1024 * 1024
+_SIGNAL_CACHE: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+_signal_cache_limit = SIGNAL_CACHE_SIZE
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample equity plus the parameters chosen per window."""
+
+    equity: pd.Series
+    windows: pd.DataFrame
+
+
+def walk_forward_windows(n: int, train: int, test: int, step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """Return ``(train_start, test_start, test_end)`` bar offsets.
+
+    Windows roll forward by ``step`` bars (default ``test``) so consecutive
+    out-of-sample slices tile the series without gaps when ``step == test``.
+    """
+    if train <= 0 or test <= 0:
+        raise ValueError("train and test must be positive bar counts")
+    step = step or test
+    if step < test:
+        raise ValueError("step must be >= test so out-of-sample windows do not overlap")
+    windows = []
+    start = 0
+    while start + train < n:
+        test_start = start + train
+        windows.append((start, test_start, min(test_start + test, n)))
+        start += step
+    return windows
+
+
+def _is_signal_fn(strategy) -> bool:
+    return callable(strategy) and not inspect.isclass(strategy)
+
+
+def signal_cache_limit(n_param_sets: int, n_bars: int) -> int:
+    """Return how many signal arrays a run over ``n_param_sets`` should keep."""
+    wanted = max(SIGNAL_CACHE_SIZE, n_param_sets)
+    return max(1, min(wanted, SIGNAL_CACHE_BYTES // max(n_bars, 1)))
+
+
+def _cached_signals(signal_fn: Callable, close: np.ndarray, params: Dict) -> np.ndarray:
+    key = (signal_fn.__module__, signal_fn.__qualname__, tuple(sorted(params.items())))
+    signals = _SIGNAL_CACHE.get(key)
+    if signals is None:
+        signals = _normalize_signals(signal_fn(close, **params))
+        _SIGNAL_CACHE[key] = signals
+        while len(_SIGNAL_CACHE) > _signal_cache_limit:
+            _SIGNAL_CACHE.popitem(last=False)
+    else:
+        _SIGNAL_CACHE.move_to_end(key)
+    return signals
+
+
+def _score(strategy, prices: pd.DataFrame, start: int, end: int, params: Dict, base_config: Optional[Dict]):
+    """Return ``(summary, equity_array)`` for ``params`` on bars ``[start, end)``."""
+    window = prices.iloc[start:end]
+    if not _is_signal_fn(strategy):
+        return evaluate(strategy, window, params, base_config), None
+    engine_kwargs, config = split_params(params)
+    engine_kwargs.pop("window", None)
+    close = prices["close"].to_numpy(dtype=np.float64)
+    signals = _cached_signals(strategy, close, {**(base_config or {}), **config})
+    engine = BacktestEngine(window, None, **engine_kwargs)
+    engine.run_vectorized(signals[start:end], save=False)
+    summary = {k: float(v) for k, v in engine.summary().items()}
+    return summary, np.asarray(engine.equity_curve)
+
+
+def _run_oos(strategy, prices: pd.DataFrame, start: int, end: int, params: Dict, base_config: Optional[Dict]):
+    if _is_signal_fn(strategy):
+        return _score(strategy, prices, start, end, params, base_config)
+    engine_kwargs, config = split_params(params)
+    engine_kwargs.setdefault("window", DEFAULT_WINDOW)
+    strat = make_strategy(strategy, {**(base_config or {}), **config})
+    engine = BacktestEngine(prices.iloc[start:end], bar_handler(strat), **engine_kwargs)
+    engine.run(save=False)
+    summary = {k: float(v) for k, v in engine.summary().items()}
+    return summary, np.asarray(engine.equity_curve, dtype=np.float64)
+
+
+def evaluate_window(
+    strategy,
+    prices: pd.DataFrame,
+    bounds: Tuple[int, int, int],
+    param_sets: List[Dict],
+    base_config: Optional[Dict] = None,
+    rank_by: str = "sharpe_ratio",
+    ascending: bool = False,
+) -> Dict:
+    """Optimize on the in-sample slice of ``bounds`` and test the winner."""
+    train_start, test_start, test_end = bounds
+    best_params, best_score = None, None
+    for params in param_sets:
+        summary, _ = _score(strategy, prices, train_start, test_start, params, base_config)
+        score = summary.get(rank_by)
+        if score is None or np.isnan(score):
+            continue
+        better = best_score is None or (score < best_score if ascending else score > best_score)
+        if better:
+            best_params, best_score = params, score
+    if best_params is None:
+        best_params = param_sets[0]
+    oos_summary, oos_equity = _run_oos(strategy, prices, test_start, test_end, best_params, base_config)
+    return {
+        "bounds": bounds,
+        "params": best_params,
+        "in_sample_score": best_score,
+        "oos_summary": oos_summary,
+        "oos_equity": oos_equity,
+    }
+
+
+def _init_worker(spec: Tuple[str, int], cache_limit: int = SIGNAL_CACHE_SIZE) -> None:
+    global _SHM, _PRICES, _signal_cache_limit
+    _SHM, _PRICES = SharedPrices.attach(spec)
+    _signal_cache_limit = cache_limit
+
+
+def _evaluate_window_shared(task) -> Dict:
+    strategy, bounds, param_sets, base_config, rank_by, ascending = task
+    return evaluate_window(strategy, _PRICES, bounds, param_sets, base_config, rank_by, ascending)
+
+
+def walk_forward(
+    strategy: Union[type, Callable],
+    prices: pd.DataFrame,
+    param_sets: List[Dict],
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    workers: Optional[int] = None,
+    base_config: Optional[Dict] = None,
+    rank_by: str = "sharpe_ratio",
+    ascending: bool = False,
+    initial_balance: float = 10_000.0,
+) -> WalkForwardResult:
+    """Run a walk-forward optimization and stitch the out-of-sample equity.
+
+    Each out-of-sample segment starts flat from ``initial_balance``; segments
+    are chained by their growth factor so the stitched curve compounds the
+    way one continuous account would.
+    """
+    if not param_sets:
+        raise ValueError("param_sets must not be empty")
+    bounds = walk_forward_windows(len(prices), train, test, step)
+    if not bounds:
+        raise ValueError("not enough bars for a single train/test window")
+    param_sets = [{"initial_balance": initial_balance, **p} for p in param_sets]
+    workers = workers or os.cpu_count() or 1
+    tasks = [(strategy, b, param_sets, base_config, rank_by, ascending) for b in bounds]
+    cache_limit = signal_cache_limit(len(param_sets), len(prices))
+
+    if workers == 1:
+        global _signal_cache_limit
+        # The signal cache is keyed by function and params only, so it must
+        # not outlive this price series.
+        _SIGNAL_CACHE.clear()
+        previous_limit, _signal_cache_limit = _signal_cache_limit, cache_limit
+        try:
+            results = [
+                evaluate_window(strategy, prices, b, param_sets, base_config, rank_by, ascending)
+                for b in bounds
+            ]
+        finally:
+            _signal_cache_limit = previous_limit
+            _SIGNAL_CACHE.clear()
+    else:
+        with SharedPrices(prices) as shared:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(shared.spec, cache_limit)
+            ) as pool:
+                results = list(pool.map(_evaluate_window_shared, tasks))
+
+    segments, index_parts, rows = [], [], []
+    level = 1.0
+    for res in results:
+        train_start, test_start, test_end = res["bounds"]
+        curve = res["oos_equity"] / res["params"]["initial_balance"]
+        segments.append(curve * level * initial_balance)
+        index_parts.append(prices.index[test_start:test_end])
+        if curve.size:
+            level *= curve[-1]
+        rows.append({
+            "train_start": prices.index[train_start],
+            "test_start": prices.index[test_start],
+            "test_end": prices.index[test_end - 1],
+            "in_sample_score": res["in_sample_score"],
+            **{k: v for k, v in res["params"].items() if k != "initial_balance"},
+            **{f"oos_{k}": v for k, v in res["oos_summary"].items()},
+        })
+
+    equity = pd.Series(np.concatenate(segments), index=index_parts[0].append(index_parts[1:]), name="equity")
+    return WalkForwardResult(equity=equity, windows=pd.DataFrame(rows))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Walk-forward backtest optimization")
+    parser.add_argument("--strategy", required=True, help="module:ClassName or module:signal_fn")
+    parser.add_argument("--csv", required=True, help="OHLCV CSV with timestamp first column")
+    parser.add_argument("--grid", required=True, help="JSON dict of parameter -> list of values")
+    parser.add_argument("--train", type=int, required=True, help="In-sample bars per window")
+    parser.add_argument("--test", type=int, required=True, help="Out-of-sample bars per window")
+    parser.add_argument("--step", type=int, default=None)
+    parser.add_argument("--config", help="JSON dict of fixed strategy config")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="sharpe_ratio")
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--out", help="Write the stitched equity curve to this CSV")
+    args = parser.parse_args(argv)
+
+    result = walk_forward(
+        load_strategy(args.strategy),
+        load_price_csv(args.csv),
+        parameter_grid(json.loads(args.grid)),
+        train=args.train,
+        test=args.test,
+        step=args.step,
+        workers=args.workers,
+        base_config=json.loads(args.config) if args.config else None,
+        rank_by=args.rank_by,
+        ascending=args.ascending,
+    )
+    if args.out:
+        result.equity.to_csv(args.out)
+    print(result.windows.to_string())
+    print(f"Final out-of-sample equity: {result.equity.iloc[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    main()
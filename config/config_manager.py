@@ -42,6 +42,8 @@ class ConfigManager:
         self.base_config['FOREX_ENABLED'] = os.getenv('FOREX_ENABLED', 'false').lower() in ('true', '1', 'yes')
         self.base_config['LIVE_TRADING_ENABLED'] = os.getenv('LIVE_TRADING_ENABLED', 'true').lower() in ('true', '1', 'yes')
         self.base_config['SHOW_MANUAL_TRADING_UI'] = os.getenv('SHOW_MANUAL_TRADING_UI', 'false').lower() in ('true', '1', 'yes')
+        self.base_config['RECORD_TICKS'] = os.getenv('RECORD_TICKS', 'false').lower() in ('true', '1', 'yes')
+        self.base_config['tick_record_dir'] = os.getenv('TICK_RECORD_DIR', 'data/ticks')
         self.base_config['log_level'] = os.getenv('LOG_LEVEL', 'INFO')
         self.base_config['db_path'] = os.getenv('DB_PATH', 'trades.db')
         self.base_config['config_path'] = os.getenv('CONFIG_PATH', 'config.json')
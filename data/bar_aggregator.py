@@ -0,0 +1,284 @@
+# data/bar_aggregator.py
+"""Incremental OHLCV bars at several resolutions from a tick stream.
+
+:class:`BarAggregator` turns ticks into bars at the finest resolution
+(``1s`` by default). Each coarser resolution (``1m``, ``5m``, ``1h``) is
+built only from the closed bars of the level below, so a tick touches one
+bar and higher levels do work once per lower-level close. Buckets are
+aligned to epoch multiples of the resolution.
+
+A bar closes when the first tick of a later bucket arrives (or on
+:meth:`BarAggregator.flush`), at every resolution whose bucket has ended;
+buckets without ticks produce no bar.
+Subscribers registered with :meth:`BarAggregator.subscribe` receive each
+closed :class:`Bar`; coroutine callbacks are scheduled on the running loop.
+
+:func:`aggregate_ticks` builds the same bars from tick arrays in one
+vectorized pass, so backtests over recorded ticks see exactly the bars live
+strategies do.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+NS = 1_000_000_000
+DEFAULT_RESOLUTIONS = ("1s", "1m", "5m", "1h")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def resolution_seconds(resolution: Union[str, int]) -> int:
+    """``"5m"`` -> ``300``; integers are taken as seconds."""
+    if isinstance(resolution, (int, np.integer)):
+        return int(resolution)
+    try:
+        return int(resolution[:-1]) * _UNITS[resolution[-1]]
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"bad resolution {resolution!r}; use e.g. '1s', '5m', '1h'") from None
+
+
+@dataclass(slots=True)
+class Bar:
+    symbol: str
+    resolution: str
+    start_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 1
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(self.start_ns, unit="ns")
+
+    def merge(self, other: "Bar") -> None:
+        """Fold a later bar (or partial bar) into this one."""
+        if other.high > self.high:
+            self.high = other.high
+        if other.low < self.low:
+            self.low = other.low
+        self.close = other.close
+        self.volume += other.volume
+        self.ticks += other.ticks
+
+
+class BarAggregator:
+    """Per-symbol bar pyramid; see the module docstring.
+
+    ``resolutions`` must be increasing and each must divide the next.
+    ``history`` closed bars are kept per symbol and resolution.
+    """
+
+    def __init__(self, resolutions: Sequence[Union[str, int]] = DEFAULT_RESOLUTIONS, history: int = 500):
+        names = [r if isinstance(r, str) else f"{int(r)}s" for r in resolutions]
+        seconds = [resolution_seconds(r) for r in resolutions]
+        if not seconds:
+            raise ValueError("need at least one resolution")
+        for lo, hi in zip(seconds, seconds[1:]):
+            if hi <= lo or hi % lo:
+                raise ValueError(f"resolutions must increase and divide each other: {names}")
+        self.resolutions: List[str] = names
+        self._widths = [s * NS for s in seconds]
+        self.history = history
+        self._open: Dict[str, List[Optional[Bar]]] = {}
+        self._closed: Dict[Tuple[str, str], deque] = {}
+        self._subscribers: List[Tuple[Callable, Optional[str], Optional[str]]] = []
+        self.ticks = 0
+        self.bars_closed = 0
+
+    # ------------------------------------------------------------------
+    def subscribe(self, callback: Callable[[Bar], object], resolution: Optional[str] = None,
+                  symbol: Optional[str] = None) -> Callable[[], None]:
+        """Call ``callback(bar)`` on every bar close matching the filters.
+
+        Returns a function that removes the subscription.
+        """
+        if resolution is not None and resolution not in self.resolutions:
+            raise ValueError(f"unknown resolution {resolution!r}; have {self.resolutions}")
+        entry = (callback, resolution, symbol)
+        self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def _emit(self, bar: Bar) -> None:
+        self.bars_closed += 1
+        closed = self._closed.get((bar.symbol, bar.resolution))
+        if closed is None:
+            closed = self._closed[(bar.symbol, bar.resolution)] = deque(maxlen=self.history)
+        closed.append(bar)
+        for callback, resolution, symbol in self._subscribers:
+            if (resolution is None or resolution == bar.resolution) and (symbol is None or symbol == bar.symbol):
+                try:
+                    result = callback(bar)
+                    if inspect.isawaitable(result):
+                        asyncio.ensure_future(result)
+                except Exception as e:
+                    logging.error(f"Bar subscriber failed for {bar.symbol} {bar.resolution}: {e}")
+
+    def _roll_up(self, symbol: str, levels: List[Optional[Bar]], level: int, bar: Bar) -> None:
+        """Feed a closed bar of ``level - 1`` into ``level``, cascading closes."""
+        while level < len(levels):
+            width = self._widths[level]
+            start = bar.start_ns - bar.start_ns % width
+            current = levels[level]
+            if current is not None and current.start_ns == start:
+                current.merge(bar)
+                return
+            levels[level] = Bar(symbol, self.resolutions[level], start, bar.open, bar.high,
+                                bar.low, bar.close, bar.volume, bar.ticks)
+            if current is None:
+                return
+            self._emit(current)
+            bar = current
+            level += 1
+
+    def on_tick(self, symbol: str, price: float, volume: float = 0.0, ts_ns: Optional[int] = None) -> None:
+        """Add one trade/quote. Ticks must arrive in time order per symbol."""
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        self.ticks += 1
+        levels = self._open.get(symbol)
+        if levels is None:
+            levels = self._open[symbol] = [None] * len(self._widths)
+        width = self._widths[0]
+        start = ts_ns - ts_ns % width
+        current = levels[0]
+        if current is not None and current.start_ns == start:
+            if price > current.high:
+                current.high = price
+            elif price < current.low:
+                current.low = price
+            current.close = price
+            current.volume += volume
+            current.ticks += 1
+            return
+        if current is not None and start < current.start_ns:
+            logging.debug(f"Out-of-order tick for {symbol} dropped")
+            return
+        self._close_ended(symbol, levels, start)
+        levels[0] = Bar(symbol, self.resolutions[0], start, price, price, price, price, volume)
+
+    def _close_ended(self, symbol: str, levels: List[Optional[Bar]], now_ns: Optional[int]) -> None:
+        for level, bar in enumerate(levels):
+            if bar is None:
+                continue
+            if now_ns is not None and bar.start_ns + self._widths[level] > now_ns:
+                # Coarser levels cover this bucket too.
+                break
+            levels[level] = None
+            self._emit(bar)
+            self._roll_up(symbol, levels, level + 1, bar)
+
+    async def run_flush_loop(self, interval: float = 1.0) -> None:
+        """Close ended bars on a timer so quiet symbols still emit them."""
+        while True:
+            await asyncio.sleep(interval)
+            self.flush(time.time_ns())
+
+    def flush(self, now_ns: Optional[int] = None) -> None:
+        """Close every open bar whose bucket ended by ``now_ns``.
+
+        Call it from a timer so quiet symbols still close their bars; without
+        ``now_ns`` all open bars are closed (e.g. at shutdown).
+        """
+        for symbol, levels in self._open.items():
+            self._close_ended(symbol, levels, now_ns)
+
+    # ------------------------------------------------------------------
+    def current(self, symbol: str, resolution: str) -> Optional[Bar]:
+        """The in-progress bar at ``resolution``, including finer open bars."""
+        levels = self._open.get(symbol)
+        if levels is None:
+            return None
+        level = self.resolutions.index(resolution)
+        width = self._widths[level]
+        latest = next((bar for bar in levels[:level + 1] if bar is not None), None)
+        if latest is None:
+            return None
+        bucket = latest.start_ns - latest.start_ns % width
+        merged: Optional[Bar] = None
+        for bar in reversed(levels[:level + 1]):
+            if bar is None or bar.start_ns - bar.start_ns % width != bucket:
+                continue
+            if merged is None:
+                merged = Bar(symbol, resolution, bucket, bar.open, bar.high, bar.low,
+                             bar.close, bar.volume, bar.ticks)
+            else:
+                merged.merge(bar)
+        return merged
+
+    def bars(self, symbol: str, resolution: str, n: Optional[int] = None) -> List[Bar]:
+        """Up to ``n`` most recent closed bars, oldest first."""
+        closed = self._closed.get((symbol, resolution), ())
+        bars = list(closed)
+        return bars if n is None else bars[-n:]
+
+    def closes(self, symbol: str, resolution: str, n: Optional[int] = None) -> np.ndarray:
+        return np.array([bar.close for bar in self.bars(symbol, resolution, n)], dtype=np.float64)
+
+    def frame(self, symbol: str, resolution: str) -> pd.DataFrame:
+        """Closed bars as an OHLCV DataFrame, the layout ``BacktestEngine`` reads."""
+        return _bars_frame(self.bars(symbol, resolution))
+
+
+def _bars_frame(bars: List[Bar]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open": [b.open for b in bars],
+            "high": [b.high for b in bars],
+            "low": [b.low for b in bars],
+            "close": [b.close for b in bars],
+            "volume": [b.volume for b in bars],
+        },
+        index=pd.DatetimeIndex([b.start_ns for b in bars], name="timestamp"),
+    )
+
+
+def aggregate_ticks(ts_ns, prices, resolution: Union[str, int] = "1m", volume=None) -> pd.DataFrame:
+    """Vectorized OHLCV bars from time-ordered tick arrays.
+
+    Produces the bars :class:`BarAggregator` would close at ``resolution``
+    (empty buckets skipped), indexed by bucket start.
+    """
+    ts = np.asarray(ts_ns, dtype=np.int64)
+    px = np.asarray(prices, dtype=np.float64)
+    vol = np.zeros_like(px) if volume is None else np.asarray(volume, dtype=np.float64)
+    if ts.size == 0:
+        return _bars_frame([])
+    width = resolution_seconds(resolution) * NS
+    bucket = ts - ts % width
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], ts.size] - 1
+    return pd.DataFrame(
+        {
+            "open": px[starts],
+            "high": np.maximum.reduceat(px, starts),
+            "low": np.minimum.reduceat(px, starts),
+            "close": px[ends],
+            "volume": np.add.reduceat(vol, starts),
+        },
+        index=pd.DatetimeIndex(bucket[starts], name="timestamp"),
+    )
+
+
+_DEFAULT_AGGREGATOR = BarAggregator()
+
+
+def default_aggregator() -> BarAggregator:
+    """Process-wide aggregator fed by the market data loops."""
+    return _DEFAULT_AGGREGATOR
@@ -0,0 +1,210 @@
+# data/bar_store.py
+"""Columnar, memory-mapped OHLCV store for backtests.
+
+Each symbol lives in its own directory of append-only segments::
+
+    <root>/<SYMBOL>/index.json
+    <root>/<SYMBOL>/<segment>/ts.npy      int64 epoch-ns
+    <root>/<SYMBOL>/<segment>/close.npy   float64 (likewise open/high/low/volume)
+
+``index.json`` records the ``[start_ns, end_ns]`` range, row count and a
+content hash for every segment. Reads memory-map only the segments that
+overlap the requested range and binary-search their timestamps, so slicing
+a multi-GB history never loads the whole file.
+
+Convert a CSV once with::
+
+    python -m data.bar_store --csv btc_1m.csv --symbol BTC-USD --root data/bars
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+TimeLike = Union[str, int, pd.Timestamp, None]
+
+
+def _to_ns(value: TimeLike) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.as_unit("ns").value)
+
+
+class BarStore:
+    """Handle on a bar store directory. Cheap to create and to pickle."""
+
+    def __init__(self, root: str = "data/bars"):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f"BarStore({str(self.root)!r})"
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / symbol.upper()
+
+    def symbols(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "index.json").is_file())
+
+    def segments(self, symbol: str) -> List[Dict]:
+        """Return the segment index for ``symbol`` (empty if unknown)."""
+        path = self._symbol_dir(symbol) / "index.json"
+        if not path.is_file():
+            return []
+        return json.loads(path.read_text())["segments"]
+
+    def date_range(self, symbol: str) -> Optional[tuple]:
+        segs = self.segments(symbol)
+        if not segs:
+            return None
+        return pd.Timestamp(segs[0]["start_ns"]), pd.Timestamp(segs[-1]["end_ns"])
+
+    def write(self, symbol: str, bars: pd.DataFrame) -> Optional[Dict]:
+        """Append ``bars`` (DatetimeIndex + OHLCV columns) as a new segment.
+
+        Bars must be sorted and start after the last stored timestamp.
+        """
+        if bars.empty:
+            return None
+        missing = set(COLUMNS) - set(bars.columns)
+        if missing:
+            raise ValueError(f"bars missing columns {sorted(missing)}")
+        index = pd.DatetimeIndex(bars.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        ts = np.ascontiguousarray(index.as_unit("ns").asi8)
+        if np.any(np.diff(ts) <= 0):
+            raise ValueError("bar timestamps must be strictly increasing")
+
+        sym_dir = self._symbol_dir(symbol)
+        segs = self.segments(symbol)
+        if segs and ts[0] <= segs[-1]["end_ns"]:
+            raise ValueError(
+                f"{symbol}: new bars start at {pd.Timestamp(int(ts[0]))}, "
+                f"not after stored end {pd.Timestamp(segs[-1]['end_ns'])}"
+            )
+
+        name = f"{len(segs):06d}"
+        seg_dir = sym_dir / name
+        seg_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        arrays = {"ts": ts}
+        arrays.update({c: np.ascontiguousarray(bars[c].to_numpy(dtype=np.float64)) for c in COLUMNS})
+        for col, arr in arrays.items():
+            np.save(seg_dir / f"{col}.npy", arr)
+            digest.update(arr.tobytes())
+        seg = {
+            "name": name,
+            "start_ns": int(ts[0]),
+            "end_ns": int(ts[-1]),
+            "rows": int(ts.size),
+            "sha256": digest.hexdigest(),
+        }
+        segs.append(seg)
+        tmp = sym_dir / "index.json.tmp"
+        tmp.write_text(json.dumps({"symbol": symbol.upper(), "segments": segs}, indent=2))
+        tmp.replace(sym_dir / "index.json")
+        return seg
+
+    def read_arrays(
+        self,
+        symbol: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> Dict[str, np.ndarray]:
+        """Return ``ts`` plus ``columns`` for ``[start, end)``.
+
+        A range inside one segment comes back as read-only memory-mapped
+        views; ranges spanning segments are concatenated.
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        sym_dir = self._symbol_dir(symbol)
+        parts: Dict[str, List[np.ndarray]] = {c: [] for c in ("ts", *columns)}
+        for seg in self.segments(symbol):
+            if start_ns is not None and seg["end_ns"] < start_ns:
+                continue
+            if end_ns is not None and seg["start_ns"] >= end_ns:
+                break
+            seg_dir = sym_dir / seg["name"]
+            ts = np.load(seg_dir / "ts.npy", mmap_mode="r")
+            lo = 0 if start_ns is None else int(np.searchsorted(ts, start_ns, side="left"))
+            hi = ts.size if end_ns is None else int(np.searchsorted(ts, end_ns, side="left"))
+            if hi <= lo:
+                continue
+            parts["ts"].append(ts[lo:hi])
+            for col in columns:
+                parts[col].append(np.load(seg_dir / f"{col}.npy", mmap_mode="r")[lo:hi])
+        out = {}
+        for col, chunks in parts.items():
+            dtype = np.int64 if col == "ts" else np.float64
+            if not chunks:
+                out[col] = np.empty(0, dtype=dtype)
+            elif len(chunks) == 1:
+                out[col] = chunks[0]
+            else:
+                out[col] = np.concatenate(chunks)
+        return out
+
+    def read(
+        self,
+        symbol: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> pd.DataFrame:
+        """Return bars for ``[start, end)`` as a DataFrame with a DatetimeIndex."""
+        arrays = self.read_arrays(symbol, start, end, columns)
+        index = pd.DatetimeIndex(arrays.pop("ts").view("datetime64[ns]"), name="timestamp")
+        return pd.DataFrame(arrays, index=index, copy=False)
+
+
+def csv_to_store(
+    csv_path: str,
+    store: BarStore,
+    symbol: str,
+    chunksize: int = 5_000_000,
+) -> int:
+    """Stream an OHLCV CSV (timestamp first column) into ``store``.
+
+    Each ``chunksize`` block becomes one segment, so conversion memory stays
+    bounded regardless of file size. Returns the number of rows written.
+    """
+    rows = 0
+    for chunk in pd.read_csv(csv_path, parse_dates=[0], chunksize=chunksize):
+        chunk.set_index(chunk.columns[0], inplace=True)
+        store.write(symbol, chunk)
+        rows += len(chunk)
+    logging.info(f"Stored {rows} bars for {symbol} in {store.root}")
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert an OHLCV CSV into a bar store")
+    parser.add_argument("--csv", required=True)
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--root", default="data/bars")
+    parser.add_argument("--chunksize", type=int, default=5_000_000)
+    args = parser.parse_args(argv)
+    rows = csv_to_store(args.csv, BarStore(args.root), args.symbol, args.chunksize)
+    print(f"Wrote {rows} bars for {args.symbol.upper()} to {args.root}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,390 @@
+# data/binance_streams.py
+"""Binance ticker streams sharded across combined-stream connections.
+
+One websocket per shard of at most ``shard_size`` symbols (Binance caps a
+connection at 1024 streams), each subscribed through the combined-stream
+URL ``/stream?streams=a@ticker/b@ticker``. A failing connection only
+reconnects its own shard, with exponential backoff; symbols added or removed
+while running are (un)subscribed on the shard that owns them.
+
+Frames are decoded by :func:`parse_ticker`, which slices the two fields the
+feed needs (symbol, last price) straight out of the frame text with
+``str.find`` and only falls back to a full JSON parse (``orjson`` when
+installed) for frames it does not recognise.
+
+The ticker stream carries no per-tick traded volume: ``Q`` is the size of
+the last trade only and ``v`` is a rolling 24h total, so ticks are published
+with volume ``0`` and bars built from them have no meaningful volume. Use
+the trade streams where volume matters.
+
+:meth:`BinanceStreamManager.stats` reports frames/sec, parse latency and
+reconnects, overall and per shard.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import websockets
+
+from .price_cache import update_price
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - orjson optional
+    orjson = None
+
+BINANCE_STREAM_URL = "wss://stream.binance.us:9443/stream"
+MAX_STREAMS_PER_CONNECTION = 1024
+DEFAULT_SHARD_SIZE = 200
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+Ticker = Tuple[str, float]
+
+
+def stream_name(symbol: str) -> str:
+    """``BTC-USD`` -> ``btcusd@ticker``."""
+    return f"{symbol.lower().replace('-', '')}@ticker"
+
+
+def _parse_full(raw) -> Optional[Ticker]:
+    msg = _loads(raw)
+    data = msg.get("data", msg) if isinstance(msg, dict) else None
+    if not isinstance(data, dict) or data.get("e") != "24hrTicker":
+        return None
+    return data["s"], float(data["c"])
+
+
+def parse_ticker(raw) -> Optional[Ticker]:
+    """``(symbol, last price)`` from a 24hr ticker frame.
+
+    Returns ``None`` for other frames (e.g. subscription acks).
+    """
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode()
+    start = raw.find('"e":"24hrTicker"')
+    if start < 0:
+        # Not a ticker, or not in Binance's compact layout.
+        return _parse_full(raw) if '"24hrTicker"' in raw else None
+    i = raw.find('"s":"', start) + 5
+    j = raw.find('"', i)
+    k = raw.find('"c":"', j) + 5
+    if i < 5 or k < 5:
+        return _parse_full(raw)
+    try:
+        return raw[i:j], float(raw[k:raw.find('"', k)])
+    except ValueError:
+        return _parse_full(raw)
+
+
+@dataclass
+class ShardStats:
+    frames: int = 0
+    ticks: int = 0
+    parse_ns: int = 0
+    max_parse_ns: int = 0
+    reconnects: int = 0
+    connected: bool = False
+    last_error: str = ""
+
+
+class _Shard:
+    def __init__(self, index: int):
+        self.index = index
+        self.symbols: List[str] = []
+        self.ws = None
+        # (UN)SUBSCRIBE messages issued while the connection was opening.
+        self.pending: List[str] = []
+        self.task: Optional[asyncio.Task] = None
+        self.stats = ShardStats()
+
+
+class BinanceStreamManager:
+    """Live Binance tickers for any number of symbols; see the module docstring.
+
+    Each tick updates the price cache (unless ``update_cache`` is off) and is
+    passed to ``recorder`` (``TickRecorder``), ``aggregator``
+    (``BarAggregator``) and ``bus`` (``MarketBus``) when given, then to
+    ``on_message`` in the payload shape ``start_crypto_market_feed`` always
+    used. ``connect`` defaults to ``websockets.connect``.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        on_message: Optional[Callable] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        url: str = BINANCE_STREAM_URL,
+        recorder=None,
+        aggregator=None,
+        bus=None,
+        update_cache: bool = True,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
+        connect: Optional[Callable] = None,
+    ):
+        if not 1 <= shard_size <= MAX_STREAMS_PER_CONNECTION:
+            raise ValueError(f"shard_size must be between 1 and {MAX_STREAMS_PER_CONNECTION}")
+        self.on_message = on_message
+        self.shard_size = shard_size
+        self.url = url
+        self.recorder = recorder
+        self.aggregator = aggregator
+        self.bus = bus
+        self.update_cache = update_cache
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._connect = connect or websockets.connect
+        self.shards: List[_Shard] = []
+        # Binance symbol (BTCUSD) -> canonical symbol (BTC-USD)
+        self.symbol_map: Dict[str, str] = {}
+        self._owner: Dict[str, _Shard] = {}
+        self._running = False
+        self._started = time.monotonic()
+        self._request_id = 0
+        self.add_symbols(symbols)
+
+    # ------------------------------------------------------------------
+    def add_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """Subscribe new symbols, filling existing shards before opening another."""
+        added = []
+        touched: Dict[int, List[str]] = {}
+        for symbol in symbols:
+            symbol = symbol.upper()
+            if symbol in self._owner:
+                continue
+            shard = next((s for s in self.shards if len(s.symbols) < self.shard_size), None)
+            if shard is None:
+                shard = _Shard(len(self.shards))
+                self.shards.append(shard)
+            shard.symbols.append(symbol)
+            self._owner[symbol] = shard
+            self.symbol_map[symbol.replace("-", "")] = symbol
+            touched.setdefault(shard.index, []).append(symbol)
+            added.append(symbol)
+        if self._running:
+            for index, new in touched.items():
+                shard = self.shards[index]
+                if shard.task is None or shard.task.done():
+                    self._start(shard)
+                else:
+                    self._request(shard, "SUBSCRIBE", new)
+        return added
+
+    def remove_symbols(self, symbols: Iterable[str]) -> None:
+        """Unsubscribe symbols; a shard left empty closes its connection."""
+        touched: Dict[int, List[str]] = {}
+        for symbol in symbols:
+            shard = self._owner.pop(symbol.upper(), None)
+            if shard is None:
+                continue
+            shard.symbols.remove(symbol.upper())
+            self.symbol_map.pop(symbol.upper().replace("-", ""), None)
+            touched.setdefault(shard.index, []).append(symbol.upper())
+        for index, gone in touched.items():
+            shard = self.shards[index]
+            if not shard.symbols and shard.task is not None:
+                shard.task.cancel()
+                # The cancelled task may not have unwound yet; forget it so a
+                # symbol added before then opens a fresh connection instead
+                # of subscribing on the closing one.
+                shard.task = None
+            elif self._running:
+                self._request(shard, "UNSUBSCRIBE", gone)
+
+    def _request(self, shard: _Shard, method: str, symbols: List[str]) -> None:
+        """Send a (UN)SUBSCRIBE on the shard's connection, or queue it until
+        the connection being opened is up. A shard that is waiting to
+        reconnect picks the change up from its URL instead."""
+        self._request_id += 1
+        msg = json.dumps({"method": method, "params": [stream_name(s) for s in symbols], "id": self._request_id})
+        if shard.ws is None:
+            shard.pending.append(msg)
+            return
+        asyncio.ensure_future(shard.ws.send(msg))
+
+    def shard_url(self, shard: _Shard) -> str:
+        return f"{self.url}?streams=" + "/".join(stream_name(s) for s in shard.symbols)
+
+    # ------------------------------------------------------------------
+    def handle_frame(self, raw, stats: Optional[ShardStats] = None) -> Optional[Tuple[str, float]]:
+        """Decode one frame and fan the tick out; returns ``(symbol, price)``."""
+        t0 = time.perf_counter_ns()
+        ticker = parse_ticker(raw)
+        elapsed = time.perf_counter_ns() - t0
+        if stats is not None:
+            stats.frames += 1
+            stats.parse_ns += elapsed
+            if elapsed > stats.max_parse_ns:
+                stats.max_parse_ns = elapsed
+        if ticker is None:
+            return None
+        symbol_raw, price = ticker
+        symbol = self.symbol_map.get(symbol_raw, symbol_raw)
+        ts_ns = time.time_ns()
+        if self.update_cache:
+            update_price(symbol, price, "binance", ts_ns)
+        if self.recorder is not None:
+            self.recorder.record(symbol, price, "binance", ts_ns=ts_ns)
+        if self.aggregator is not None:
+            self.aggregator.on_tick(symbol, price, 0.0, ts_ns)
+        if self.bus is not None:
+            self.bus.publish(symbol, price, "binance", ts_ns)
+        if stats is not None:
+            stats.ticks += 1
+        return symbol, price
+
+    async def _run_shard(self, shard: _Shard) -> None:
+        failures = 0
+        stats = shard.stats
+        while shard.symbols:
+            url = self.shard_url(shard)
+            # The URL already carries every change queued before this point.
+            shard.pending.clear()
+            ws = None
+            try:
+                async with self._connect(url) as ws:
+                    while shard.pending:
+                        await ws.send(shard.pending.pop(0))
+                    shard.ws = ws
+                    stats.connected = True
+                    logging.info(f"Binance shard {shard.index} connected ({len(shard.symbols)} streams)")
+                    async for raw in ws:
+                        failures = 0
+                        tick = self.handle_frame(raw, stats)
+                        if tick is not None and self.on_message is not None:
+                            await self.on_message({
+                                "symbol": tick[0],
+                                "price": str(tick[1]),
+                                "timestamp": datetime.utcnow().isoformat(),
+                            })
+                raise ConnectionError("stream closed by server")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.reconnects += 1
+                stats.last_error = str(e)
+                delay = min(self.reconnect_delay * 2 ** failures, self.max_reconnect_delay)
+                failures += 1
+                logging.error(f"Binance shard {shard.index} error: {e}; reconnecting in {delay:.0f}s")
+            finally:
+                # A cancelled run may finish closing after its replacement
+                # has connected; leave the replacement's state alone.
+                if shard.ws is ws:
+                    shard.ws = None
+                    stats.connected = False
+            await asyncio.sleep(delay)
+
+    def _start(self, shard: _Shard) -> None:
+        shard.task = asyncio.ensure_future(self._run_shard(shard))
+
+    async def run(self) -> None:
+        """Run every shard until cancelled."""
+        self._running = True
+        self._started = time.monotonic()
+        for shard in self.shards:
+            self._start(shard)
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            self._running = False
+            for shard in self.shards:
+                if shard.task is not None:
+                    shard.task.cancel()
+
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict:
+        """Frames/sec since start, parse latency (µs), reconnects, per shard."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        shards = [shard.stats for shard in self.shards]
+        frames = sum(s.frames for s in shards)
+        parse_ns = sum(s.parse_ns for s in shards)
+        return {
+            "symbols": len(self._owner),
+            "shards": len(shards),
+            "connected": sum(s.connected for s in shards),
+            "frames": frames,
+            "ticks": sum(s.ticks for s in shards),
+            "frames_per_sec": frames / elapsed,
+            "parse_us_mean": parse_ns / frames / 1e3 if frames else 0.0,
+            "parse_us_max": max((s.max_parse_ns for s in shards), default=0) / 1e3,
+            "reconnects": sum(s.reconnects for s in shards),
+            "per_shard": [
+                {"streams": len(shard.symbols), "frames": shard.stats.frames, "reconnects": shard.stats.reconnects,
+                 "connected": shard.stats.connected, "last_error": shard.stats.last_error}
+                for shard in self.shards
+            ],
+        }
+
+    async def run_stats_loop(self, interval: float = 60.0) -> None:
+        """Log a one-line summary of :meth:`stats` every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            s = self.stats()
+            logging.info(
+                f"Binance feed: {s['connected']}/{s['shards']} shards, {s['symbols']} symbols, "
+                f"{s['frames_per_sec']:.1f} frames/s, parse {s['parse_us_mean']:.2f} us, "
+                f"{s['reconnects']} reconnects"
+            )
+
+
+def sample_frame(symbol: str = "BTCUSD", price: float = 43000.12) -> str:
+    """A combined-stream 24hr ticker frame as Binance sends it."""
+    data = {
+        "e": "24hrTicker", "E": 1700000000000, "s": symbol, "p": "12.50000000", "P": "0.029",
+        "w": "42980.11000000", "x": "42987.62000000", "c": f"{price:.8f}", "Q": "0.01250000",
+        "b": f"{price - 0.01:.8f}", "B": "0.50000000", "a": f"{price + 0.01:.8f}", "A": "0.42000000",
+        "o": "42987.62000000", "h": "43120.00000000", "l": "42810.55000000", "v": "1532.10000000",
+        "q": "65850000.12000000", "O": 1699913600000, "C": 1700000000000, "F": 1, "L": 181500, "n": 181500,
+    }
+    return json.dumps({"stream": f"{symbol.lower()}@ticker", "data": data}, separators=(",", ":"))
+
+
+def benchmark(n_frames: int = 200_000, n_symbols: int = 1000) -> Dict[str, float]:
+    """Decode cost per frame (µs) and end-to-end frames/sec through
+    :meth:`BinanceStreamManager.handle_frame` with the price cache on."""
+    frames = [sample_frame(f"SYM{i}USD", 100.0 + i) for i in range(n_symbols)]
+    results = {}
+    for name, fn in (("json", lambda f: json.loads(f)["data"]), ("parse_ticker", parse_ticker)):
+        start = time.perf_counter()
+        for i in range(n_frames):
+            fn(frames[i % n_symbols])
+        results[f"{name}_us"] = (time.perf_counter() - start) / n_frames * 1e6
+    manager = BinanceStreamManager([f"SYM{i}-USD" for i in range(n_symbols)])
+    stats = ShardStats()
+    start = time.perf_counter()
+    for i in range(n_frames):
+        manager.handle_frame(frames[i % n_symbols], stats)
+    results["frames_per_sec"] = n_frames / (time.perf_counter() - start)
+    results["shards"] = len(manager.shards)
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Binance frame decoding throughput")
+    parser.add_argument("--frames", type=int, default=200_000)
+    parser.add_argument("--symbols", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.frames, args.symbols)
+    logging.info(
+        f"json.loads {results['json_us']:.2f} us/frame, parse_ticker {results['parse_ticker_us']:.2f} us/frame; "
+        f"{results['frames_per_sec']:,.0f} frames/s end to end over {results['shards']:.0f} shards"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+    main()
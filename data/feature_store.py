@@ -0,0 +1,153 @@
+# data/feature_store.py
+"""Per-symbol feature values shared by every strategy on that symbol.
+
+Price history is read from a :class:`data.tick_buffer.TickBuffers` (the
+process-wide buffers for :func:`default_store`), so the store holds no copy of
+its own. Features are keyed by ``(symbol, feature, params)``; the first read
+after a new tick computes the value and every later read until the next tick
+is a dictionary lookup, so CPU grows with symbols and distinct features
+rather than with the number of strategy configurations reading them.
+
+Cached values are tagged with the ring's tick count, so a tick written
+straight to the buffers invalidates them just like :meth:`FeatureStore.update`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from data.tick_buffer import TickBuffers, default_buffers
+from indicators.technical_indicators import (
+    bollinger_bands,
+    exponential_moving_average,
+    moving_average,
+    relative_strength_index,
+)
+
+
+def _volatility(history, window: int = 10) -> float:
+    if len(history) <= 2:
+        return 0.0
+    return float(np.std(np.diff(history[-window:])))
+
+
+def _slope(history, window: int = 5) -> float:
+    """Least-squares slope of the last ``window`` prices (0.0 if too short)."""
+    if len(history) < window:
+        return 0.0
+    t = np.arange(window) - (window - 1) / 2
+    return float(t @ np.asarray(history[-window:]) / (t @ t))
+
+
+def _support(history, window: int = 20) -> Optional[float]:
+    return float(np.min(history[-window:])) if len(history) else None
+
+
+def _resistance(history, window: int = 20) -> Optional[float]:
+    return float(np.max(history[-window:])) if len(history) else None
+
+
+# name -> fn(history, *params) where history is a read-only float64 array of
+# prices (oldest first).
+FEATURES: Dict[str, Callable] = {
+    "volatility": _volatility,
+    "slope": _slope,
+    "support": _support,
+    "resistance": _resistance,
+    "rsi": relative_strength_index,
+    "sma": moving_average,
+    "ema": exponential_moving_average,
+    "bollinger": bollinger_bands,
+}
+
+
+def register_feature(name: str, fn: Callable) -> None:
+    """Make ``fn(history, *params)`` readable as ``store.get(symbol, name, *params)``."""
+    FEATURES[name] = fn
+
+
+class FeatureStore:
+    """Memoized indicator values per symbol, invalidated on each new tick.
+
+    ``maxlen`` bounds the history features see; they must not look further
+    back than that. ``ticks`` defaults to private buffers of that capacity.
+    ``hits``, ``misses`` and ``compute_time`` (seconds per feature name) are
+    kept for :meth:`stats`.
+    """
+
+    def __init__(self, maxlen: int = 500, ticks: Optional[TickBuffers] = None):
+        self.maxlen = maxlen
+        self.ticks = ticks if ticks is not None else TickBuffers(capacity=maxlen)
+        # symbol -> (tick count the values were computed at, values)
+        self._memo: Dict[str, Tuple[int, Dict[Tuple, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.compute_time: Dict[str, float] = {}
+
+    def update(self, symbol: str, price: float, timestamp: Optional[int] = None) -> bool:
+        """Append a tick (epoch-ns ``timestamp``) to the buffers.
+
+        Returns ``False`` (and changes nothing) when ``timestamp`` repeats the
+        last one recorded for ``symbol``.
+        """
+        return self.ticks.append(symbol, price, timestamp)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Forget cached features for ``symbol`` (all symbols if ``None``)."""
+        if symbol is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(symbol, None)
+
+    def version(self, symbol: str) -> int:
+        """Number of ticks ingested for ``symbol``; changes on every update."""
+        ring = self.ticks.get(symbol)
+        return ring.count if ring is not None else 0
+
+    def history(self, symbol: str) -> np.ndarray:
+        """Read-only view of the last ``maxlen`` prices for ``symbol``."""
+        return self.ticks.last(symbol, self.maxlen)
+
+    def get(self, symbol: str, name: str, *params):
+        version = self.version(symbol)
+        entry = self._memo.get(symbol)
+        if entry is None or entry[0] != version:
+            entry = self._memo[symbol] = (version, {})
+        memo = entry[1]
+        key = (name, *params)
+        try:
+            value = memo[key]
+        except KeyError:
+            self.misses += 1
+            start = time.perf_counter()
+            value = FEATURES[name](self.history(symbol), *params)
+            self.compute_time[name] = self.compute_time.get(name, 0.0) + time.perf_counter() - start
+            memo[key] = value
+            return value
+        self.hits += 1
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self.ticks),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "compute_time": dict(self.compute_time),
+        }
+
+
+_DEFAULT_STORE = FeatureStore(ticks=default_buffers())
+
+
+def default_store() -> FeatureStore:
+    """Process-wide store used by strategies unless they are given one."""
+    return _DEFAULT_STORE
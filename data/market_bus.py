@@ -0,0 +1,224 @@
+# data/market_bus.py
+"""In-process pub/sub for live prices.
+
+Market data feeds :meth:`MarketBus.publish` every tick they receive;
+strategies hold a :class:`Subscription` for their symbols and ``await
+subscription.wait()`` instead of sleeping on a timer, so they wake as soon as
+data arrives.
+
+Subscriptions conflate: between two wake-ups only the latest event per symbol
+is kept, so a slow consumer never builds a backlog. ``throttle`` sets the
+minimum number of seconds between wake-ups; ticks arriving in the meantime
+are delivered together at the next one.
+
+A bus built with a ``features`` store appends every published tick to that
+store's tick buffers before delivering it, and one built with ``bars`` rolls
+it into that :class:`data.bar_aggregator.BarAggregator`, so feeds and
+strategies record through the bus rather than writing either themselves. A
+tick whose timestamp is not newer than the symbol's last one is dropped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from data.bar_aggregator import BarAggregator, default_aggregator
+from data.feature_store import FeatureStore, default_store
+
+
+@dataclass(slots=True)
+class MarketEvent:
+    symbol: str
+    price: float
+    ts_ns: int
+    source: str = ""
+    volume: float = 0.0
+
+
+class Subscription:
+    """Latest events for a set of symbols (all symbols if ``None``)."""
+
+    def __init__(self, bus: "MarketBus", symbols: Optional[Iterable[str]] = None, throttle: float = 0.0):
+        self._bus = bus
+        self.symbols = None if symbols is None else frozenset(symbols)
+        self.throttle = throttle
+        self._pending: Dict[str, MarketEvent] = {}
+        self._ready = asyncio.Event()
+        self._last_wake = float("-inf")
+        self.received = 0
+        self.wakeups = 0
+
+    def _push(self, event: MarketEvent) -> None:
+        self._pending[event.symbol] = event
+        self.received += 1
+        self._ready.set()
+
+    async def wait(self, timeout: Optional[float] = None) -> Dict[str, MarketEvent]:
+        """Latest event per symbol updated since the previous call.
+
+        Waits at least ``throttle`` seconds after the previous wake-up, then
+        for data; returns ``{}`` if ``timeout`` passes without any.
+        """
+        loop = asyncio.get_running_loop()
+        if self.throttle:
+            delay = self._last_wake + self.throttle - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return {}
+        events = self._pending
+        self._pending = {}
+        self._ready.clear()
+        self._last_wake = loop.time()
+        self.wakeups += 1
+        return events
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, MarketEvent]:
+        return await self.wait()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class MarketBus:
+    """Routes published ticks to the subscriptions interested in them.
+
+    ``features`` (a :class:`FeatureStore`) and ``bars`` (a
+    :class:`BarAggregator`) receive every tick first.
+    """
+
+    def __init__(self, features: Optional[FeatureStore] = None, bars: Optional[BarAggregator] = None):
+        self.features = features
+        self.bars = bars
+        self._by_symbol: Dict[str, List[Subscription]] = {}
+        self._wildcard: List[Subscription] = []
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, symbols: Optional[Iterable[str]] = None, throttle: float = 0.0) -> Subscription:
+        """Subscribe to ``symbols`` (canonical names, e.g. ``BTC-USD``) or,
+        with ``None``, to everything."""
+        sub = Subscription(self, symbols, throttle)
+        if sub.symbols is None:
+            self._wildcard.append(sub)
+        else:
+            for symbol in sub.symbols:
+                self._by_symbol.setdefault(symbol, []).append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub.symbols is None:
+            if sub in self._wildcard:
+                self._wildcard.remove(sub)
+            return
+        for symbol in sub.symbols:
+            subs = self._by_symbol.get(symbol)
+            if subs and sub in subs:
+                subs.remove(sub)
+                if not subs:
+                    del self._by_symbol[symbol]
+
+    def publish(self, symbol: str, price: float, source: str = "", ts_ns: Optional[int] = None,
+                volume: float = 0.0, exclude: Optional[Subscription] = None) -> int:
+        """Record and deliver a tick; returns the number of subscriptions it reached.
+
+        ``exclude`` is skipped, e.g. the publisher's own subscription.
+        """
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        if self.features is not None and not self.features.update(symbol, price, ts_ns):
+            self.dropped += 1
+            return 0
+        if self.bars is not None:
+            self.bars.on_tick(symbol, price, volume, ts_ns)
+        self.published += 1
+        subs = self._by_symbol.get(symbol)
+        if not subs and not self._wildcard:
+            return 0
+        event = MarketEvent(symbol, price, ts_ns, source, volume)
+        count = 0
+        for group in (subs or (), self._wildcard):
+            for sub in group:
+                if sub is not exclude:
+                    sub._push(event)
+                    count += 1
+        self.delivered += count
+        return count
+
+    def subscriber_count(self, symbol: Optional[str] = None) -> int:
+        if symbol is None:
+            return len(self._wildcard) + len({id(s) for subs in self._by_symbol.values() for s in subs})
+        return len(self._by_symbol.get(symbol, ())) + len(self._wildcard)
+
+
+_DEFAULT_BUS = MarketBus(features=default_store(), bars=default_aggregator())
+
+
+def default_bus() -> MarketBus:
+    """Process-wide bus the market data feeds publish to; it writes the
+    default feature store's tick buffers and the default bar aggregator."""
+    return _DEFAULT_BUS
+
+
+async def _measure(n_events: int, n_subscribers: int) -> Dict[str, float]:
+    bus = MarketBus()
+    latencies: List[float] = []
+
+    async def consumer(sub: Subscription) -> None:
+        while True:
+            events = await sub.wait()
+            now = time.perf_counter_ns()
+            for event in events.values():
+                latencies.append((now - event.ts_ns) / 1e3)
+
+    tasks = [asyncio.create_task(consumer(bus.subscribe(["BTC-USD"]))) for _ in range(n_subscribers)]
+    await asyncio.sleep(0)
+    for i in range(n_events):
+        # Timestamps on the perf counter clock so the consumer can diff them.
+        bus.publish("BTC-USD", 100.0 + i, "bench", time.perf_counter_ns())
+        await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+    latencies.sort()
+    return {
+        "events": float(len(latencies)),
+        "median_us": latencies[len(latencies) // 2],
+        "p99_us": latencies[int(len(latencies) * 0.99)],
+    }
+
+
+def benchmark(n_events: int = 10_000, n_subscribers: int = 4) -> Dict[str, float]:
+    """Publish-to-wake latency in microseconds on a fresh event loop."""
+    return asyncio.run(_measure(n_events, n_subscribers))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Market bus publish-to-wake latency")
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--subscribers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    stats = benchmark(args.events, args.subscribers)
+    logging.info(
+        f"{stats['events']:.0f} wake-ups: median {stats['median_us']:.1f} us, p99 {stats['p99_us']:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+    main()
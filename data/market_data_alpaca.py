@@ -15,15 +15,31 @@ async def start_stock_ws_feed(
     base_url: str,
     data_feed: str = "iex",
     on_bar=None,
+    recorder=None,
+    aggregator=None,
+    bus=None,
 ):
-    """Run a websocket loop streaming live bars from Alpaca."""
+    """Run a websocket loop streaming live bars from Alpaca.
+
+    ``recorder`` optionally captures each bar close for offline replay,
+    ``aggregator`` (a ``BarAggregator``) rolls it, with the bar's volume,
+    into the coarser bars and ``bus`` (a ``MarketBus``) receives it as a
+    tick for waiting strategies.
+    """
 
     async def handle_bar(bar):
         data = {
             "symbol": bar["symbol"],
             "price": float(bar["close"]),
             "time": bar.get("timestamp", ""),
+            "volume": float(bar.get("volume") or 0.0),
         }
+        if recorder is not None:
+            recorder.record(data["symbol"], data["price"], "alpaca")
+        if aggregator is not None:
+            aggregator.on_tick(data["symbol"], data["price"], data["volume"])
+        if bus is not None:
+            bus.publish(data["symbol"], data["price"], "alpaca", volume=data["volume"])
         if on_bar:
             await on_bar(data)
         else:
@@ -50,6 +66,7 @@ async def start_stock_ws_feed(
                             "symbol": bar.get("S"),
                             "close": bar.get("c"),
                             "timestamp": bar.get("t"),
+                            "volume": bar.get("v"),
                         }
                         await handle_bar(parsed)
         except Exception as e:
@@ -1,12 +1,8 @@
 # data/market_data_crypto.py
 
-import asyncio
-import websockets
-import json
 import logging
-from datetime import datetime
 
-from .price_cache import update_price
+from .binance_streams import DEFAULT_SHARD_SIZE, BinanceStreamManager
 
 # This module is configured to use Binance.US endpoints
 
@@ -22,41 +18,33 @@ async def handle_market_message(message: dict):
     logging.info(f"[CRYPTO WS] Ticker update: {message.get('symbol')} @ {message.get('price')}")
 
 
-async def start_crypto_market_feed(symbols: list[str], on_message=handle_market_message):
-    """Launch a Binance WebSocket connection for real-time ticker data."""
+async def start_crypto_market_feed(
+    symbols: list[str],
+    on_message=handle_market_message,
+    recorder=None,
+    aggregator=None,
+    bus=None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+):
+    """Stream real-time Binance tickers for ``symbols``.
+
+    Pass a :class:`data.tick_recorder.TickRecorder` as ``recorder`` to keep
+    every tick for offline replay, and a
+    :class:`data.bar_aggregator.BarAggregator` as ``aggregator`` to build
+    OHLCV bars from the stream. Ticks are published to ``bus`` (a
+    :class:`data.market_bus.MarketBus`) to wake subscribed strategies.
+    Symbols are spread over connections of ``shard_size`` streams; use
+    :class:`data.binance_streams.BinanceStreamManager` directly to add
+    symbols or read feed metrics while running.
+    """
     # Coinbase WebSocket does not provide unique sentiment streams, so we use
     # Binance for market data and trading. Coinbase support has been removed.
-    # Connect to Binance.US WebSocket endpoint
-    uri = "wss://stream.binance.us:9443/stream"
-    stream = "/".join([f"{s.lower().replace('-', '')}@ticker" for s in symbols])
-    subscribe_msg = {
-        "method": "SUBSCRIBE",
-        "params": [f"{s.lower().replace('-', '')}@ticker" for s in symbols],
-        "id": 1,
-    }
-
-    # Map Binance symbol strings back to canonical symbols (e.g. BTCUSD -> BTC-USD)
-    symbol_map = {s.replace("-", "").upper(): s.upper() for s in symbols}
-
-    while True:
-        try:
-            async with websockets.connect(uri) as ws:
-                await ws.send(json.dumps(subscribe_msg))
-                logging.info("Connected to Binance WebSocket feed.")
-                async for raw_msg in ws:
-                    msg = json.loads(raw_msg)
-                    data = msg.get("data", {})
-                    if data.get("e") == "24hrTicker":
-                        symbol_raw = data.get("s")
-                        price = data.get("c")
-                        canonical = symbol_map.get(symbol_raw, symbol_raw)
-                        update_price(canonical, float(price), "binance")
-                        await on_message({
-                            "symbol": canonical,
-                            "price": price,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        })
-        except Exception as e:
-            logging.error(f"WebSocket error: {e}")
-            logging.info("Reconnecting in 5 seconds...")
-            await asyncio.sleep(5)
+    manager = BinanceStreamManager(
+        symbols,
+        on_message=on_message,
+        shard_size=shard_size,
+        recorder=recorder,
+        aggregator=aggregator,
+        bus=bus,
+    )
+    await manager.run()
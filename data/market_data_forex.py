@@ -25,20 +25,31 @@ async def fetch_forex_prices(session, instruments: list[str], api_key: str, acco
         logging.error(f"Forex REST price fetch failed: {e}")
         return []
 
-async def start_forex_polling_loop(instruments, api_key, account_id, interval=5, on_price=None):
+async def start_forex_polling_loop(instruments, api_key, account_id, interval=5, on_price=None, recorder=None, aggregator=None, bus=None):
     """
     Polls OANDA for forex prices every `interval` seconds.
+    Quotes are passed to ``recorder`` (if given) for offline replay and their
+    mid price to ``aggregator`` (a ``BarAggregator``) for bars. The bid, the
+    price forex strategies trade on, is published to ``bus`` (a ``MarketBus``).
     """
     async with aiohttp.ClientSession() as session:
         while True:
             prices = await fetch_forex_prices(session, instruments, api_key, account_id)
             now = datetime.utcnow().isoformat()
             for p in prices:
+                bid = p.get("bids", [{}])[0].get("price")
+                ask = p.get("asks", [{}])[0].get("price")
+                if recorder is not None and bid and ask:
+                    recorder.record(p.get("instrument"), None, "oanda", bid=float(bid), ask=float(ask))
+                if aggregator is not None and bid and ask:
+                    aggregator.on_tick(p.get("instrument"), (float(bid) + float(ask)) / 2)
+                if bus is not None and bid:
+                    bus.publish(p.get("instrument"), float(bid), "oanda")
                 if on_price:
                     await on_price({
                         "instrument": p.get("instrument"),
-                        "bid": p.get("bids", [{}])[0].get("price"),
-                        "ask": p.get("asks", [{}])[0].get("price"),
+                        "bid": bid,
+                        "ask": ask,
                         "time": now
                     })
             await asyncio.sleep(interval)
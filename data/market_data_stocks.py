@@ -27,14 +27,22 @@ async def fetch_stock_prices(alpaca: AlpacaManager, symbols: list[str]):
     return results
 
 
-async def start_stock_polling_loop(symbols, alpaca: AlpacaManager, interval=10, on_price=None):
-    """Poll stock prices every `interval` seconds via Alpaca."""
+async def start_stock_polling_loop(symbols, alpaca: AlpacaManager, interval=10, on_price=None, aggregator=None, bus=None):
+    """Poll stock prices every `interval` seconds via Alpaca.
+
+    Polled prices are fed to ``aggregator`` (a ``BarAggregator``) and
+    published to ``bus`` (a ``MarketBus``) if given.
+    """
     logging.info(
         f"Starting Alpaca polling loop for: {', '.join(symbols)} every {interval}s"
     )
     while True:
         prices = await fetch_stock_prices(alpaca, symbols)
         for p in prices:
+            if aggregator is not None and p["price"]:
+                aggregator.on_tick(p["symbol"], float(p["price"]))
+            if bus is not None and p["price"]:
+                bus.publish(p["symbol"], float(p["price"]), "alpaca")
             if on_price:
                 await on_price(p)
         await asyncio.sleep(interval)
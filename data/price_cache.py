@@ -1,15 +1,64 @@
 from __future__ import annotations
 
-"""In-memory cache of the latest ticker prices by symbol."""
+"""In-memory cache of the latest ticker prices by symbol.
 
-from datetime import datetime
-from typing import Dict
+Each symbol owns a slot in preallocated arrays holding its price, a source
+id, an epoch-nanosecond timestamp and the global version at which it last
+changed. :func:`update_price` only writes into those arrays; no per-tick
+dicts or timestamp strings are built. Readers can poll :func:`version` and
+ask :func:`changed_since` which symbols moved instead of copying the cache.
 
-# key -> {'price': float, 'source': str, 'time': ISO8601}
-_PRICE_CACHE: Dict[str, Dict[str, str | float]] = {}
+:func:`get_price` and :func:`get_all` keep returning the original
+``{'price', 'source', 'time'}`` dicts, built on demand.
+"""
 
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
-def update_price(symbol: str, price: float, source: str) -> None:
+import numpy as np
+
+_INITIAL_SLOTS = 64
+
+_slots: Dict[str, int] = {}  # symbol (as given and upper-cased) -> slot
+_symbols: List[str] = []  # slot -> canonical symbol
+_sources: List[str] = []  # source id -> name
+_source_ids: Dict[str, int] = {}
+_price = np.zeros(_INITIAL_SLOTS, dtype=np.float64)
+_source = np.zeros(_INITIAL_SLOTS, dtype=np.int32)
+_time_ns = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+_seq = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+_version = 0
+
+
+def _new_slot(symbol: str) -> int:
+    global _price, _source, _time_ns, _seq
+    canonical = symbol.upper()
+    slot = _slots.get(canonical)
+    if slot is None:
+        slot = len(_symbols)
+        if slot == _price.size:
+            _price = np.concatenate([_price, np.zeros(slot)])
+            _source = np.concatenate([_source, np.zeros(slot, dtype=np.int32)])
+            _time_ns = np.concatenate([_time_ns, np.zeros(slot, dtype=np.int64)])
+            _seq = np.concatenate([_seq, np.zeros(slot, dtype=np.int64)])
+        _symbols.append(canonical)
+        _slots[canonical] = slot
+    _slots[symbol] = slot
+    return slot
+
+
+def _source_id(source: str) -> int:
+    sid = _source_ids.get(source)
+    if sid is None:
+        sid = _source_ids[source] = len(_sources)
+        _sources.append(source)
+    return sid
+
+
+def update_price(symbol: str, price: float, source: str, ts_ns: Optional[int] = None) -> None:
     """Update cached price for a symbol.
 
     Parameters
@@ -20,19 +69,130 @@ def update_price(symbol: str, price: float, source: str) -> None:
         Latest trade/last price.
     source : str
         Data source identifier such as ``binance`` or ``alpaca``.
+    ts_ns : int, optional
+        Epoch nanoseconds of the tick; defaults to now.
     """
-    _PRICE_CACHE[symbol.upper()] = {
-        "price": float(price),
-        "source": source,
-        "time": datetime.utcnow().isoformat(),
+    global _version
+    slot = _slots.get(symbol)
+    if slot is None:
+        slot = _new_slot(symbol)
+    sid = _source_ids.get(source)
+    if sid is None:
+        sid = _source_id(source)
+    _version += 1
+    _price[slot] = price
+    _source[slot] = sid
+    _time_ns[slot] = time.time_ns() if ts_ns is None else ts_ns
+    _seq[slot] = _version
+
+
+def _entry(slot: int) -> Dict[str, str | float]:
+    ts = datetime.fromtimestamp(int(_time_ns[slot]) / 1e9, timezone.utc).replace(tzinfo=None)
+    return {
+        "price": float(_price[slot]),
+        "source": _sources[_source[slot]],
+        "time": ts.isoformat(),
     }
 
 
 def get_price(symbol: str) -> Dict[str, str | float] | None:
     """Return cached price entry for ``symbol`` if present."""
-    return _PRICE_CACHE.get(symbol.upper())
+    slot = _slots.get(symbol)
+    if slot is None:
+        slot = _slots.get(symbol.upper())
+        if slot is None:
+            return None
+    return _entry(slot)
 
 
 def get_all() -> Dict[str, Dict[str, str | float]]:
     """Return the full cache."""
-    return dict(_PRICE_CACHE)
+    return {symbol: _entry(slot) for slot, symbol in enumerate(_symbols)}
+
+
+def last_price(symbol: str) -> Optional[float]:
+    """Latest price for ``symbol`` without building a dict."""
+    slot = _slots.get(symbol)
+    if slot is None:
+        slot = _slots.get(symbol.upper())
+        if slot is None:
+            return None
+    return float(_price[slot])
+
+
+def version() -> int:
+    """Counter incremented by every :func:`update_price` call."""
+    return _version
+
+
+def changed_since(seen_version: int) -> List[str]:
+    """Symbols updated after ``seen_version`` (a value from :func:`version`)."""
+    n = len(_symbols)
+    return [_symbols[i] for i in np.flatnonzero(_seq[:n] > seen_version)]
+
+
+def arrays() -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """``(symbols, prices, time_ns, versions)`` views indexed by slot.
+
+    The arrays are views into the cache, valid until a new symbol forces a
+    reallocation; fetch them again when :func:`version` moves if needed.
+    """
+    n = len(_symbols)
+    return list(_symbols), _price[:n], _time_ns[:n], _seq[:n]
+
+
+def clear() -> None:
+    """Drop every symbol (mainly for tests)."""
+    global _price, _source, _time_ns, _seq, _version
+    _slots.clear()
+    _symbols.clear()
+    _sources.clear()
+    _source_ids.clear()
+    _price = np.zeros(_INITIAL_SLOTS, dtype=np.float64)
+    _source = np.zeros(_INITIAL_SLOTS, dtype=np.int32)
+    _time_ns = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+    _seq = np.zeros(_INITIAL_SLOTS, dtype=np.int64)
+    _version = 0
+
+
+def benchmark(n_updates: int = 500_000, n_symbols: int = 200) -> Dict[str, float]:
+    """Updates per second of the previous dict-based cache and this one.
+
+    Writes ``n_symbols`` dummy symbols into the live cache; run it in its own
+    process (``python -m data.price_cache``).
+    """
+    symbols = [f"SYM{i}-USD" for i in range(n_symbols)]
+    legacy: Dict[str, Dict[str, str | float]] = {}
+
+    def legacy_update(symbol: str, price: float, source: str) -> None:
+        legacy[symbol.upper()] = {
+            "price": float(price),
+            "source": source,
+            "time": datetime.utcnow().isoformat(),
+        }
+
+    results = {}
+    for name, fn in (("dict", legacy_update), ("array", update_price)):
+        start = time.perf_counter()
+        for i in range(n_updates):
+            fn(symbols[i % n_symbols], 100.0 + i, "binance")
+        results[name] = n_updates / (time.perf_counter() - start)
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Price cache update throughput")
+    parser.add_argument("--updates", type=int, default=500_000)
+    parser.add_argument("--symbols", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for name, rate in benchmark(args.updates, args.symbols).items():
+        logging.info(f"{name:>6}: {rate:,.0f} updates/s")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+    main()
@@ -0,0 +1,138 @@
+# data/tick_buffer.py
+"""Fixed-capacity per-symbol tick history shared by every strategy.
+
+:class:`TickRing` stores prices and epoch-ns timestamps in flat arrays of
+twice the capacity: each tick is written at ``head`` and ``head + capacity``
+so the latest ``n`` ticks are always one contiguous slice. :meth:`TickRing.last`
+therefore returns a zero-copy (read-only NumPy) view, and appending never
+allocates.
+
+:class:`TickBuffers` maps symbols to rings; :func:`default_buffers` is the
+process-wide instance strategies read through ``BaseStrategy.ticks``.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+
+class TickRing:
+    """Ring buffer of ``(price, ts_ns)`` with contiguous window views.
+
+    Views returned by :meth:`last` are read-only and only valid until
+    ``capacity - n`` further ticks have been appended; copy them to keep.
+    """
+
+    __slots__ = ("capacity", "count", "_head", "_prices", "_times", "_prices_view", "_times_view")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.count = 0  # ticks ever appended
+        self._head = 0  # next write position in [0, capacity)
+        # Writes go through array.array (cheap scalar stores); reads through
+        # read-only NumPy views of the same memory.
+        self._prices = array("d", bytes(16 * capacity))
+        self._times = array("q", bytes(16 * capacity))
+        self._prices_view = np.frombuffer(self._prices, dtype=np.float64)
+        self._times_view = np.frombuffer(self._times, dtype=np.int64)
+        self._prices_view.flags.writeable = False
+        self._times_view.flags.writeable = False
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, price: float, ts_ns: Optional[int] = None) -> None:
+        head = self._head
+        mirror = head + self.capacity
+        prices = self._prices
+        times = self._times
+        prices[head] = prices[mirror] = price
+        times[head] = times[mirror] = time.time_ns() if ts_ns is None else ts_ns
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        self.count += 1
+
+    def _bounds(self, n: Optional[int]):
+        size = self.count if self.count < self.capacity else self.capacity
+        if n is None or n > size:
+            n = size
+        end = self._head + self.capacity
+        return end - n, end
+
+    def last(self, n: Optional[int] = None) -> np.ndarray:
+        """The latest ``n`` prices (all retained if ``None``), oldest first."""
+        start, end = self._bounds(n)
+        return self._prices_view[start:end]
+
+    def last_times(self, n: Optional[int] = None) -> np.ndarray:
+        """Epoch-ns timestamps matching :meth:`last`."""
+        start, end = self._bounds(n)
+        return self._times_view[start:end]
+
+    @property
+    def latest(self) -> Optional[float]:
+        return self._prices[self._head + self.capacity - 1] if self.count else None
+
+    @property
+    def latest_ts(self) -> Optional[int]:
+        return self._times[self._head + self.capacity - 1] if self.count else None
+
+
+class TickBuffers:
+    """One :class:`TickRing` per symbol, created on first write."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._rings: Dict[str, TickRing] = {}
+
+    def ring(self, symbol: str) -> TickRing:
+        ring = self._rings.get(symbol)
+        if ring is None:
+            ring = self._rings[symbol] = TickRing(self.capacity)
+        return ring
+
+    def get(self, symbol: str) -> Optional[TickRing]:
+        """The ring for ``symbol`` or ``None`` if nothing was recorded yet."""
+        return self._rings.get(symbol)
+
+    def append(self, symbol: str, price: float, ts_ns: Optional[int] = None) -> bool:
+        """Record a tick; returns ``False`` unless ``ts_ns`` is newer than the last one.
+
+        Dropping repeated and out-of-order timestamps keeps each ring sorted
+        by time, whichever feeds write to it.
+        """
+        ring = self.ring(symbol)
+        if ts_ns is not None and ring.count and ts_ns <= ring.latest_ts:
+            return False
+        ring.append(price, ts_ns)
+        return True
+
+    def last(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        ring = self._rings.get(symbol)
+        if ring is None:
+            return np.empty(0)
+        return ring.last(n)
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rings)
+
+
+_DEFAULT_BUFFERS = TickBuffers()
+
+
+def default_buffers() -> TickBuffers:
+    """Process-wide buffers shared by all strategies."""
+    return _DEFAULT_BUFFERS
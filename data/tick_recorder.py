@@ -0,0 +1,312 @@
+# data/tick_recorder.py
+"""Record live ticks to compact segment files and replay them offline.
+
+Ticks are normalized to ``(symbol, epoch-ns, bid, ask, source)``; last-price
+feeds store ``bid == ask == price``. Files are append-only, one per symbol
+per UTC hour::
+
+    <root>/<SYMBOL>/<YYYYMMDDHH>.ticks
+
+Each file is a sequence of independently decodable blocks::
+
+    b"LTK1" | uint32 length | zlib(header_len uint16 | header json |
+                                   ts deltas | bid deltas | spreads)
+
+Timestamps and prices (fixed-point, ``PRICE_SCALE``) are delta encoded as
+int64, which compresses to a few bytes per tick. A crash loses at most the
+ticks still buffered in memory.
+
+The replayer merges segments in timestamp order and pushes them through the
+same callbacks the live feeds use, at 1x, Nx or maximum speed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import struct
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_aggregator import aggregate_ticks
+from .price_cache import update_price
+
+MAGIC = b"LTK1"
+PRICE_SCALE = 10 ** 8
+NS_PER_HOUR = 3_600_000_000_000
+
+# (ts_ns, symbol, bid, ask, source)
+Tick = Tuple[int, str, float, float, str]
+
+
+def _hour_name(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns // 1_000_000_000, tz=timezone.utc).strftime("%Y%m%d%H")
+
+
+def encode_block(ts: np.ndarray, bid: np.ndarray, ask: np.ndarray, source: str) -> bytes:
+    """Encode one block of ticks for a single symbol/source."""
+    bid_i = np.round(bid * PRICE_SCALE).astype(np.int64)
+    spread = np.round(ask * PRICE_SCALE).astype(np.int64) - bid_i
+    header = json.dumps({"n": int(ts.size), "source": source}).encode()
+    body = b"".join(
+        [
+            struct.pack("<H", len(header)),
+            header,
+            np.diff(ts, prepend=0).astype("<i8").tobytes(),
+            np.diff(bid_i, prepend=0).astype("<i8").tobytes(),
+            spread.astype("<i8").tobytes(),
+        ]
+    )
+    payload = zlib.compress(body, 6)
+    return MAGIC + struct.pack("<I", len(payload)) + payload
+
+
+def decode_blocks(data: bytes) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, str]]:
+    """Yield ``(ts, bid, ask, source)`` arrays for each complete block."""
+    pos = 0
+    while pos + 8 <= len(data):
+        if data[pos:pos + 4] != MAGIC:
+            raise ValueError(f"corrupt tick segment at byte {pos}")
+        (length,) = struct.unpack_from("<I", data, pos + 4)
+        if pos + 8 + length > len(data):
+            logging.warning("Truncated tick block ignored")
+            return
+        body = zlib.decompress(data[pos + 8:pos + 8 + length])
+        pos += 8 + length
+        (hlen,) = struct.unpack_from("<H", body, 0)
+        header = json.loads(body[2:2 + hlen])
+        n = header["n"]
+        cols = np.frombuffer(body, dtype="<i8", offset=2 + hlen, count=3 * n).reshape(3, n)
+        ts = np.cumsum(cols[0])
+        bid_i = np.cumsum(cols[1])
+        bid = bid_i / PRICE_SCALE
+        ask = (bid_i + cols[2]) / PRICE_SCALE
+        yield ts, bid, ask, header["source"]
+
+
+class TickRecorder:
+    """Buffer normalized ticks per symbol and append them as compressed blocks."""
+
+    def __init__(self, root: str = "data/ticks", block_size: int = 4096):
+        self.root = Path(root)
+        self.block_size = block_size
+        self._buffers: Dict[str, Dict] = {}
+        self.recorded = 0
+
+    def record(
+        self,
+        symbol: str,
+        price: Optional[float],
+        source: str,
+        ts_ns: Optional[int] = None,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+    ) -> None:
+        """Buffer one tick. Pass ``bid``/``ask`` for quote feeds, else ``price``."""
+        ts_ns = time.time_ns() if ts_ns is None else int(ts_ns)
+        bid = float(price if bid is None else bid)
+        ask = float(bid if ask is None else ask)
+        symbol = symbol.upper()
+        hour = ts_ns // NS_PER_HOUR
+        buf = self._buffers.get(symbol)
+        if buf is not None and (buf["hour"] != hour or buf["source"] != source):
+            self._flush_symbol(symbol)
+            buf = None
+        if buf is None:
+            buf = {"hour": hour, "source": source, "ts": [], "bid": [], "ask": []}
+            self._buffers[symbol] = buf
+        buf["ts"].append(ts_ns)
+        buf["bid"].append(bid)
+        buf["ask"].append(ask)
+        self.recorded += 1
+        if len(buf["ts"]) >= self.block_size:
+            self._flush_symbol(symbol)
+
+    def _flush_symbol(self, symbol: str) -> None:
+        buf = self._buffers.pop(symbol, None)
+        if not buf or not buf["ts"]:
+            return
+        ts = np.asarray(buf["ts"], dtype=np.int64)
+        block = encode_block(ts, np.asarray(buf["bid"]), np.asarray(buf["ask"]), buf["source"])
+        path = self.root / symbol / f"{_hour_name(int(ts[0]))}.ticks"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(block)
+        except Exception as e:
+            logging.error(f"Failed to write tick block for {symbol}: {e}")
+
+    def flush(self) -> None:
+        """Write all buffered ticks."""
+        for symbol in list(self._buffers):
+            self._flush_symbol(symbol)
+
+    def close(self) -> None:
+        self.flush()
+
+    async def run_flush_loop(self, interval: float = 30.0) -> None:
+        """Periodically flush partial blocks so idle symbols reach disk."""
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+
+def read_segment(path: Path, symbol: str) -> Iterator[Tick]:
+    for ts, bid, ask, source in decode_blocks(Path(path).read_bytes()):
+        for i in range(ts.size):
+            yield int(ts[i]), symbol, float(bid[i]), float(ask[i]), source
+
+
+def _epoch_ns(value: Optional[datetime]) -> Optional[int]:
+    """Naive datetimes are taken as UTC, matching ``datetime.utcnow()`` elsewhere."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000) * 1000
+
+
+def _iso(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def feed_message(tick: Tick) -> Dict:
+    """Shape a tick like the callback payload of the feed that produced it."""
+    ts_ns, symbol, bid, ask, source = tick
+    if source == "oanda":
+        return {"instrument": symbol, "bid": str(bid), "ask": str(ask), "time": _iso(ts_ns)}
+    if source == "alpaca":
+        return {"symbol": symbol, "price": bid, "time": _iso(ts_ns)}
+    return {"symbol": symbol, "price": str(bid), "timestamp": _iso(ts_ns)}
+
+
+class TickReplayer:
+    """Replay recorded ticks in timestamp order through feed callbacks."""
+
+    def __init__(
+        self,
+        root: str = "data/ticks",
+        symbols: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        self.root = Path(root)
+        self.symbols = [s.upper() for s in symbols] if symbols else None
+        self.start_ns = _epoch_ns(start)
+        self.end_ns = _epoch_ns(end)
+
+    def _segments(self, symbol_dir: Path) -> List[Path]:
+        paths = sorted(symbol_dir.glob("*.ticks"))
+        if self.start_ns is not None:
+            first = _hour_name(self.start_ns)
+            paths = [p for p in paths if p.stem >= first]
+        if self.end_ns is not None:
+            last = _hour_name(self.end_ns)
+            paths = [p for p in paths if p.stem <= last]
+        return paths
+
+    def _symbol_ticks(self, symbol_dir: Path) -> Iterator[Tick]:
+        for path in self._segments(symbol_dir):
+            yield from read_segment(path, symbol_dir.name)
+
+    def iter_ticks(self) -> Iterator[Tick]:
+        """Yield ticks from every selected symbol merged by timestamp."""
+        if not self.root.is_dir():
+            return
+        dirs = [d for d in sorted(self.root.iterdir()) if d.is_dir()]
+        if self.symbols is not None:
+            dirs = [d for d in dirs if d.name in self.symbols]
+        for tick in heapq.merge(*(self._symbol_ticks(d) for d in dirs)):
+            if self.start_ns is not None and tick[0] < self.start_ns:
+                continue
+            if self.end_ns is not None and tick[0] >= self.end_ns:
+                return
+            yield tick
+
+    def bars(self, symbol: str, resolution: str = "1m") -> pd.DataFrame:
+        """OHLC bars of mid prices for ``symbol``, as the live aggregator builds them."""
+        ticks = [
+            t for t in self._symbol_ticks(self.root / symbol.upper())
+            if (self.start_ns is None or t[0] >= self.start_ns) and (self.end_ns is None or t[0] < self.end_ns)
+        ]
+        ts = np.fromiter((t[0] for t in ticks), dtype=np.int64, count=len(ticks))
+        mid = np.fromiter(((t[2] + t[3]) / 2 for t in ticks), dtype=np.float64, count=len(ticks))
+        return aggregate_ticks(ts, mid, resolution)
+
+    async def replay(
+        self,
+        speed: Optional[float] = 1.0,
+        on_message: Optional[Callable] = None,
+        on_bar: Optional[Callable] = None,
+        on_price: Optional[Callable] = None,
+        update_cache: bool = True,
+        yield_every: int = 1000,
+        aggregator=None,
+        bus=None,
+    ) -> Dict[str, float]:
+        """Push ticks to the matching callback and return throughput stats.
+
+        ``on_message`` receives Binance-style ticks, ``on_bar`` Alpaca and
+        ``on_price`` OANDA, mirroring the live feed signatures. ``speed=None``
+        (or ``0``) replays as fast as possible, yielding to the loop every
+        ``yield_every`` ticks. Mid prices are also fed to ``aggregator``
+        (a :class:`data.bar_aggregator.BarAggregator`) and published to
+        ``bus`` (a :class:`data.market_bus.MarketBus`) if given.
+        """
+        callbacks = {"binance": on_message, "alpaca": on_bar, "oanda": on_price}
+        count = 0
+        wall_start = time.perf_counter()
+        first_ts = None
+        for tick in self.iter_ticks():
+            ts_ns, symbol, bid, ask, source = tick
+            if speed:
+                if first_ts is None:
+                    first_ts = ts_ns
+                due = (ts_ns - first_ts) / 1e9 / speed - (time.perf_counter() - wall_start)
+                if due > 0:
+                    await asyncio.sleep(due)
+            elif count % yield_every == 0:
+                await asyncio.sleep(0)
+            if update_cache:
+                update_price(symbol, (bid + ask) / 2, source, ts_ns)
+            if aggregator is not None:
+                aggregator.on_tick(symbol, (bid + ask) / 2, 0.0, ts_ns)
+            if bus is not None:
+                bus.publish(symbol, (bid + ask) / 2, source, ts_ns)
+            callback = callbacks.get(source, on_message)
+            if callback is not None:
+                await callback(feed_message(tick))
+            count += 1
+        elapsed = time.perf_counter() - wall_start
+        stats = {
+            "ticks": count,
+            "seconds": elapsed,
+            "ticks_per_sec": count / elapsed if elapsed > 0 else 0.0,
+        }
+        logging.info(f"Tick replay finished: {stats}")
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded ticks")
+    parser.add_argument("--root", default="data/ticks")
+    parser.add_argument("--symbols", help="Comma separated symbols (default: all)")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 0 = max speed")
+    args = parser.parse_args(argv)
+    symbols = args.symbols.split(",") if args.symbols else None
+    stats = asyncio.run(TickReplayer(args.root, symbols).replay(speed=args.speed))
+    print(f"Replayed {stats['ticks']} ticks in {stats['seconds']:.2f}s ({stats['ticks_per_sec']:.0f}/s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,217 @@
+# indicators/cross_section.py
+"""Indicators and cross-sectional ranks for a whole symbol universe per bar.
+
+:class:`CrossSection` keeps a rolling ``(window, n_symbols)`` matrix of
+closes in a ring buffer. Each :meth:`CrossSection.update` takes one close
+per symbol and refreshes, for all symbols in a handful of array operations:
+
+* ``momentum``: return over the last ``momentum`` bars, and
+  ``momentum_pct``, its percentile rank across symbols (0 = weakest, 1 = strongest);
+* ``rsi``: Wilder RSI (same recurrence as :class:`indicators.streaming.RSI`),
+  and ``rsi_z``, its cross-sectional z-score;
+* ``volatility``: standard deviation of the last ``vol_window`` bar returns,
+  and ``rel_volatility``, volatility divided by the universe median.
+
+Values are ``NaN`` for a symbol until it has enough bars. A missing close
+(``NaN``) repeats the symbol's previous close.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("close", "momentum", "momentum_pct", "rsi", "rsi_z", "volatility", "rel_volatility")
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Rank of each finite value scaled to [0, 1]; ties share the mean rank."""
+    out = np.full(values.shape, np.nan)
+    finite = np.flatnonzero(np.isfinite(values))
+    if finite.size == 0:
+        return out
+    if finite.size == 1:
+        out[finite] = 0.5
+        return out
+    vals = values[finite]
+    order = np.argsort(vals, kind="stable")
+    ranks = np.empty(finite.size)
+    ranks[order] = np.arange(finite.size)
+    sorted_vals = vals[order]
+    if np.any(sorted_vals[1:] == sorted_vals[:-1]):
+        # Average the ranks of tied values.
+        _, first, counts = np.unique(sorted_vals, return_index=True, return_counts=True)
+        mean_rank = first + (counts - 1) / 2
+        ranks[order] = np.repeat(mean_rank, counts)
+    out[finite] = ranks / (finite.size - 1)
+    return out
+
+
+def zscore(values: np.ndarray) -> np.ndarray:
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.full(values.shape, np.nan)
+    mean = values[finite].mean()
+    std = values[finite].std()
+    if std == 0:
+        return np.where(finite, 0.0, np.nan)
+    return (values - mean) / std
+
+
+class CrossSection:
+    """Rolling time x symbol close matrix with vectorized per-bar indicators."""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        momentum: int = 20,
+        rsi_period: int = 14,
+        vol_window: int = 20,
+    ):
+        if momentum < 1 or rsi_period < 1 or vol_window < 2:
+            raise ValueError("momentum and rsi_period must be >= 1 and vol_window >= 2")
+        self.momentum_period = momentum
+        self.rsi_period = rsi_period
+        self.vol_window = vol_window
+        self.window = max(momentum, vol_window) + 1
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.bars = 0
+        self._pos = -1
+        self._allocate(0)
+        self.add_symbols(symbols)
+
+    # ------------------------------------------------------------------
+    def _allocate(self, n: int) -> None:
+        self.closes = np.full((self.window, n), np.nan)
+        self.counts = np.zeros(n, dtype=np.int64)
+        self._avg_gain = np.zeros(n)
+        self._avg_loss = np.zeros(n)
+        for field in FIELDS:
+            setattr(self, field, np.full(n, np.nan))
+
+    def add_symbols(self, symbols: Iterable[str]) -> None:
+        """Append new columns; their indicators warm up from the next bar."""
+        new = [s for s in dict.fromkeys(symbols) if s not in self._index]
+        if not new:
+            return
+        k = len(new)
+        self.closes = np.hstack([self.closes, np.full((self.window, k), np.nan)])
+        self.counts = np.concatenate([self.counts, np.zeros(k, dtype=np.int64)])
+        self._avg_gain = np.concatenate([self._avg_gain, np.zeros(k)])
+        self._avg_loss = np.concatenate([self._avg_loss, np.zeros(k)])
+        for field in FIELDS:
+            setattr(self, field, np.concatenate([getattr(self, field), np.full(k, np.nan)]))
+        for symbol in new:
+            self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def _row(self, prices: Union[Mapping[str, float], Sequence[float], np.ndarray]) -> np.ndarray:
+        if isinstance(prices, Mapping):
+            row = np.full(len(self.symbols), np.nan)
+            index = self._index
+            for symbol, price in prices.items():
+                i = index.get(symbol)
+                if i is not None:
+                    row[i] = price
+            return row
+        row = np.asarray(prices, dtype=np.float64)
+        if row.shape != (len(self.symbols),):
+            raise ValueError(f"expected {len(self.symbols)} prices, got shape {row.shape}")
+        return row
+
+    # ------------------------------------------------------------------
+    def update(self, prices: Union[Mapping[str, float], Sequence[float], np.ndarray]) -> None:
+        """Add one bar: a close per symbol (array in ``symbols`` order or a
+        ``{symbol: close}`` mapping) and recompute every field."""
+        row = self._row(prices)
+        window = self.window
+        prev = self.closes[self._pos % window] if self.bars else np.full_like(row, np.nan)
+        row = np.where(np.isnan(row), prev, row)
+        self._pos = (self._pos + 1) % window
+        self.closes[self._pos] = row
+        self.bars += 1
+        seen = ~np.isnan(row)
+        self.counts += seen
+        counts = self.counts
+        self.close = row
+
+        # Wilder RSI: sum the first `period` moves, then smooth.
+        period = self.rsi_period
+        delta = row - prev
+        moved = seen & ~np.isnan(prev)
+        gain = np.where(moved & (delta > 0), delta, 0.0)
+        loss = np.where(moved & (delta < 0), -delta, 0.0)
+        warming = counts <= period + 1
+        smoothing = ~warming
+        self._avg_gain[warming] += gain[warming]
+        self._avg_loss[warming] += loss[warming]
+        seeded = counts == period + 1
+        self._avg_gain[seeded] /= period
+        self._avg_loss[seeded] /= period
+        keep = (period - 1) / period
+        self._avg_gain[smoothing] = self._avg_gain[smoothing] * keep + gain[smoothing] / period
+        self._avg_loss[smoothing] = self._avg_loss[smoothing] * keep + loss[smoothing] / period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+        flat = self._avg_loss == 0
+        rsi[flat] = np.where(self._avg_gain[flat] > 0, 100.0, 50.0)
+        rsi[counts <= period] = np.nan
+        self.rsi = rsi
+
+        m = self.momentum_period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            momentum = row / self.closes[(self._pos - m) % window] - 1.0
+        momentum[counts <= m] = np.nan
+        self.momentum = momentum
+
+        v = self.vol_window
+        idx = (self._pos - np.arange(v + 1)) % window
+        recent = self.closes[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = recent[:-1] / recent[1:] - 1.0
+        vol = returns.std(axis=0, ddof=1) if self.bars > v else np.full_like(row, np.nan)
+        vol[counts <= v] = np.nan
+        self.volatility = vol
+
+        self.momentum_pct = percentile_rank(momentum)
+        self.rsi_z = zscore(rsi)
+        finite = np.isfinite(vol)
+        median = np.median(vol[finite]) if finite.any() else np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.rel_volatility = vol / median
+
+    def extend(self, closes: Union[np.ndarray, pd.DataFrame]) -> None:
+        """Feed a ``(bars, symbols)`` history one row at a time."""
+        if isinstance(closes, pd.DataFrame):
+            self.add_symbols(closes.columns)
+            closes = closes.reindex(columns=self.symbols).to_numpy(dtype=np.float64)
+        for row in np.asarray(closes, dtype=np.float64):
+            self.update(row)
+
+    # ------------------------------------------------------------------
+    def frame(self) -> pd.DataFrame:
+        """Latest values, one row per symbol and one column per field."""
+        return pd.DataFrame({field: getattr(self, field) for field in FIELDS}, index=self.symbols)
+
+    def get(self, symbol: str) -> Dict[str, float]:
+        i = self._index[symbol]
+        return {field: float(getattr(self, field)[i]) for field in FIELDS}
+
+    def top(self, n: int = 10, by: str = "momentum_pct", ascending: bool = False) -> List[str]:
+        """Symbols with the highest (or lowest) ``by`` on the latest bar."""
+        values = getattr(self, by)
+        valid = np.flatnonzero(np.isfinite(values))
+        order = valid[np.argsort(values[valid], kind="stable")]
+        if not ascending:
+            order = order[::-1]
+        return [self.symbols[i] for i in order[:n]]
+
+    def history(self, symbol: Optional[str] = None) -> np.ndarray:
+        """Closes in the ring, oldest first (all symbols, or one column)."""
+        rows = min(self.bars, self.window)
+        idx = (self._pos - np.arange(rows)[::-1]) % self.window
+        data = self.closes[idx]
+        return data if symbol is None else data[:, self._index[symbol]]
@@ -0,0 +1,368 @@
+# indicators/streaming.py
+"""Stateful indicators updated in O(1) time and memory per tick.
+
+Each indicator keeps just enough state to fold in the next price, so a
+strategy can call ``update(price)`` on every tick instead of recomputing
+:mod:`indicators.technical_indicators` over the whole history. Values are
+not rounded; the list-based functions round their results.
+
+Run ``python -m indicators.streaming`` for a per-tick microbenchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class StreamingIndicator:
+    """Common helpers; subclasses implement ``update`` and set ``value``."""
+
+    __slots__ = ()
+
+    def update(self, price: float):
+        raise NotImplementedError
+
+    def extend(self, prices: Iterable[float]):
+        """Feed a batch of prices (e.g. to warm up from history)."""
+        update = self.update
+        value = self.value
+        for price in prices:
+            value = update(price)
+        return value
+
+
+class SMA(StreamingIndicator):
+    """Rolling mean; like ``moving_average`` it averages what it has until full."""
+
+    __slots__ = ("period", "value", "count", "_window", "_sum")
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.value = 0.0
+        self.count = 0
+        self._window: deque = deque(maxlen=period)
+        self._sum = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, price: float) -> float:
+        window = self._window
+        count = self.count = self.count + 1
+        if count > self.period:
+            self._sum += price - window[0]
+            window.append(price)
+            self.value = self._sum / self.period
+        else:
+            self._sum += price
+            window.append(price)
+            self.value = self._sum / count
+        return self.value
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the first price.
+
+    Matches ``pandas.Series.ewm(span=period, adjust=False)`` and therefore
+    ``exponential_moving_average``.
+    """
+
+    __slots__ = ("period", "alpha", "value", "count")
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, price: float) -> float:
+        self.count += 1
+        if self.value is None:
+            self.value = price
+        else:
+            self.value += self.alpha * (price - self.value)
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """Relative strength index, 50.0 until ``period + 1`` prices were seen.
+
+    ``smoothing="wilder"`` (default) is Wilder's RSI: a simple average of the
+    first ``period`` gains/losses, then ``avg = (avg * (period - 1) + x) / period``.
+    ``smoothing="simple"`` reproduces ``relative_strength_index``: the mean
+    of the last ``period`` up-moves and the last ``period`` down-moves.
+    """
+
+    __slots__ = (
+        "period", "smoothing", "value", "count", "prev",
+        "avg_gain", "avg_loss", "_gains", "_losses", "_keep",
+    )
+
+    def __init__(self, period: int = 14, smoothing: str = "wilder"):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        if smoothing not in ("wilder", "simple"):
+            raise ValueError(f"unknown smoothing {smoothing!r}")
+        self.period = period
+        self.smoothing = smoothing
+        self.value = 50.0
+        self.count = 0
+        self.prev: Optional[float] = None
+        # Running sums while warming up (wilder) or for the whole run (simple).
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self._gains: deque = deque(maxlen=period)
+        self._losses: deque = deque(maxlen=period)
+        self._keep = (period - 1) / period
+
+    @property
+    def ready(self) -> bool:
+        return self.count > self.period
+
+    def update(self, price: float) -> float:
+        prev = self.prev
+        self.prev = price
+        count = self.count = self.count + 1
+        if prev is None:
+            return self.value
+        delta = price - prev
+        if self.smoothing == "simple":
+            return self._update_simple(delta, count)
+
+        period = self.period
+        if count > period + 1:
+            keep = self._keep
+            if delta > 0:
+                gain = self.avg_gain = self.avg_gain * keep + delta / period
+                loss = self.avg_loss = self.avg_loss * keep
+            else:
+                gain = self.avg_gain = self.avg_gain * keep
+                loss = self.avg_loss = self.avg_loss * keep - delta / period
+        else:
+            if delta > 0:
+                self.avg_gain += delta
+            else:
+                self.avg_loss -= delta
+            if count <= period:
+                return self.value
+            gain = self.avg_gain = self.avg_gain / period
+            loss = self.avg_loss = self.avg_loss / period
+        if loss == 0:
+            self.value = 100.0 if gain > 0 else 50.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+        return self.value
+
+    def _update_simple(self, delta: float, count: int) -> float:
+        period = self.period
+        if delta > 0:
+            gains = self._gains
+            if len(gains) == period:
+                self.avg_gain -= gains[0]
+            gains.append(delta)
+            self.avg_gain += delta
+        elif delta < 0:
+            losses = self._losses
+            if len(losses) == period:
+                self.avg_loss -= losses[0]
+            losses.append(-delta)
+            self.avg_loss -= delta
+        if count <= period:
+            return self.value
+        avg_loss = self.avg_loss / period if self._losses else 1e-6
+        rs = (self.avg_gain / period) / avg_loss
+        self.value = 100.0 - 100.0 / (1.0 + rs)
+        return self.value
+
+
+class Bollinger(StreamingIndicator):
+    """Rolling mean +/- ``multiplier`` sample standard deviations.
+
+    The window mean and sum of squared deviations are updated with Welford's
+    add/replace recurrences, so no sum of squares ever cancels. ``value`` is
+    ``(upper, lower)``, ``(None, None)`` until ``period`` prices were seen,
+    like ``bollinger_bands``.
+    """
+
+    __slots__ = ("period", "multiplier", "value", "count", "mean", "_m2", "_window")
+
+    def __init__(self, period: int = 20, multiplier: float = 2.0):
+        if period < 2:
+            raise ValueError("period must be >= 2")
+        self.period = period
+        self.multiplier = multiplier
+        self.value: Tuple[Optional[float], Optional[float]] = (None, None)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._window: deque = deque(maxlen=period)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def std(self) -> float:
+        n = len(self._window)
+        return math.sqrt(max(self._m2, 0.0) / (n - 1)) if n > 1 else 0.0
+
+    def update(self, price: float) -> Tuple[Optional[float], Optional[float]]:
+        window = self._window
+        n = len(window)
+        self.count += 1
+        if n == self.period:
+            old = window[0]
+            window.append(price)
+            old_mean = self.mean
+            mean = self.mean = old_mean + (price - old) / n
+            m2 = self._m2 = self._m2 + (price - old) * (price - mean + old - old_mean)
+        else:
+            delta = price - self.mean
+            mean = self.mean = self.mean + delta / (n + 1)
+            m2 = self._m2 = self._m2 + delta * (price - mean)
+            window.append(price)
+            n += 1
+            if n < self.period:
+                return self.value
+        band = self.multiplier * math.sqrt(m2 / (n - 1)) if m2 > 0 else 0.0
+        self.value = (mean + band, mean - band)
+        return self.value
+
+
+class ATR(StreamingIndicator):
+    """Wilder's average true range.
+
+    ``update(close, high, low)``; with only a close the true range is the
+    absolute close-to-close move. Averages what it has until ``period``
+    bars were seen, then applies Wilder smoothing.
+    """
+
+    __slots__ = ("period", "value", "count", "prev_close", "_keep")
+
+    def __init__(self, period: int = 14):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.value = 0.0
+        self.count = 0
+        self.prev_close: Optional[float] = None
+        self._keep = (period - 1) / period
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, price: float, high: Optional[float] = None, low: Optional[float] = None) -> float:
+        prev = self.prev_close
+        self.prev_close = price
+        if high is None and low is None:
+            tr = 0.0 if prev is None else abs(price - prev)
+        else:
+            high = price if high is None else high
+            low = price if low is None else low
+            tr = high - low if prev is None else max(high - low, abs(high - prev), abs(low - prev))
+        count = self.count = self.count + 1
+        if count > self.period:
+            self.value = self.value * self._keep + tr / self.period
+        else:
+            self.value += (tr - self.value) / count
+        return self.value
+
+
+class MACD(StreamingIndicator):
+    """MACD line, signal line and histogram from ``adjust=False`` EMAs.
+
+    ``value`` is ``(macd, signal, histogram)``.
+    """
+
+    __slots__ = ("fast", "slow", "signal", "value", "count", "_fast", "_slow", "_signal", "_a_fast", "_a_slow", "_a_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        if not 1 <= fast < slow or signal < 1:
+            raise ValueError("need 1 <= fast < slow and signal >= 1")
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.value: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self.count = 0
+        self._fast = self._slow = self._signal = 0.0
+        self._a_fast = 2.0 / (fast + 1)
+        self._a_slow = 2.0 / (slow + 1)
+        self._a_signal = 2.0 / (signal + 1)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.slow + self.signal - 1
+
+    def update(self, price: float) -> Tuple[float, float, float]:
+        # The three EMAs are inlined; this runs once per tick per symbol.
+        if self.count == 0:
+            self._fast = self._slow = price
+            self._signal = 0.0
+        else:
+            self._fast += self._a_fast * (price - self._fast)
+            self._slow += self._a_slow * (price - self._slow)
+        self.count += 1
+        macd = self._fast - self._slow
+        if self.count > 1:
+            self._signal += self._a_signal * (macd - self._signal)
+        self.value = (macd, self._signal, macd - self._signal)
+        return self.value
+
+
+def benchmark(n_ticks: int = 200_000, seed: int = 0) -> Dict[str, float]:
+    """Return nanoseconds per ``update`` call for each indicator."""
+    rng = random.Random(seed)
+    prices = [100.0]
+    for _ in range(n_ticks - 1):
+        prices.append(prices[-1] * (1 + rng.gauss(0, 0.001)))
+
+    indicators = {
+        "sma20": SMA(20),
+        "ema20": EMA(20),
+        "rsi14": RSI(14),
+        "rsi14_simple": RSI(14, smoothing="simple"),
+        "bollinger20": Bollinger(20),
+        "atr14": ATR(14),
+        "macd": MACD(),
+    }
+    results = {}
+    for name, indicator in indicators.items():
+        update = indicator.update
+        start = time.perf_counter()
+        for price in prices:
+            update(price)
+        results[name] = (time.perf_counter() - start) / n_ticks * 1e9
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Per-tick cost of streaming indicators")
+    parser.add_argument("--ticks", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    for name, ns in benchmark(args.ticks).items():
+        logging.info(f"{name:>14}: {ns:7.1f} ns/tick")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+    main()
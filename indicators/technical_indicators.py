@@ -4,7 +4,7 @@ import pandas as pd
 
 def moving_average(prices: list[float], period: int) -> float:
     """Simple moving average with basic safety checks."""
-    if not prices:
+    if len(prices) == 0:
         return 0.0
     if len(prices) < period:
         return sum(prices) / len(prices)
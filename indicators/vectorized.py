@@ -0,0 +1,187 @@
+# indicators/vectorized.py
+"""Whole-series indicators over NumPy arrays.
+
+The functions in :mod:`indicators.technical_indicators` return the latest
+value only; these return one value per bar so feature columns can be built
+for a full history in a single call. Time runs along axis 0 and a 2D
+``(n_bars, n_symbols)`` input computes every column at once, which is the
+layout :meth:`BacktestEngine.run_vectorized` signals and
+:func:`strategy.signal_backtester.backtest_matrix` consume.
+
+Bars before an indicator has a full window are ``NaN``. Rolling means use
+cumulative sums, rolling dispersion and slopes use ``sliding_window_view``
+and the exponential/Wilder averages run a blocked closed-form recursive
+filter, so nothing loops per bar in Python. Values agree with the
+streaming classes in :mod:`indicators.streaming` once those are ready.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_CHUNK_ELEMENTS = 1 << 22
+
+
+def _as_array(x) -> np.ndarray:
+    arr = np.asarray(x, dtype=np.float64)
+    if arr.ndim not in (1, 2):
+        raise ValueError(f"expected a 1D or 2D array, got shape {arr.shape}")
+    return arr
+
+
+def _check_period(period: int, minimum: int = 1) -> None:
+    if period < minimum:
+        raise ValueError(f"period must be >= {minimum}")
+
+
+def _windowed(x: np.ndarray, period: int, reduce) -> np.ndarray:
+    """Apply ``reduce`` to ``sliding_window_view`` chunks (window on the last
+    axis), bounding temporaries to roughly ``_CHUNK_ELEMENTS`` values."""
+    out = np.full_like(x, np.nan)
+    n = x.shape[0]
+    if n < period:
+        return out
+    width = x[0].size * period
+    rows = max(1, _CHUNK_ELEMENTS // width)
+    for start in range(period - 1, n, rows):
+        stop = min(start + rows, n)
+        windows = sliding_window_view(x[start - period + 1:stop], period, axis=0)
+        out[start:stop] = reduce(windows)
+    return out
+
+
+def ewm_filter(x, alpha: float, init=None) -> np.ndarray:
+    """Run ``y[t] = (1 - alpha) * y[t-1] + alpha * x[t]`` down axis 0.
+
+    ``init`` is ``y[-1]``; by default ``x[0]`` (so ``y[0] == x[0]``, as in
+    ``ewm(adjust=False)``). Within blocks short enough that the decay factor
+    stays representable, the recursion is a scaled cumulative sum; the state
+    is carried from block to block.
+    """
+    x = _as_array(x)
+    out = np.empty_like(x)
+    if x.shape[0] == 0:
+        return out
+    decay = 1.0 - alpha
+    state = np.array(x[0] if init is None else init, dtype=np.float64)
+    if decay <= 0.0:
+        out[:] = x
+        return out
+    # decay ** -block stays below ~1e100.
+    block = max(1, min(x.shape[0], int(230.0 / -math.log(decay)) if decay < 1.0 else x.shape[0]))
+    steps = np.arange(1, block + 1, dtype=np.float64)
+    grow = decay ** -steps  # weights for x[s + j], j = 0..block-1
+    shrink = decay ** steps  # carry of the previous state into y[s + j]
+    if x.ndim == 2:
+        grow, shrink = grow[:, None], shrink[:, None]
+    for start in range(0, x.shape[0], block):
+        seg = x[start:start + block]
+        m = seg.shape[0]
+        acc = np.cumsum(seg * grow[:m], axis=0)
+        y = shrink[:m] * (state + alpha * acc)
+        out[start:start + m] = y
+        state = y[-1]
+    return out
+
+
+def sma(x, period: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Rolling mean. With ``min_periods=1`` the warm-up bars average what
+    is available, like ``moving_average``."""
+    _check_period(period)
+    x = _as_array(x)
+    min_periods = period if min_periods is None else min_periods
+    n = x.shape[0]
+    out = np.full_like(x, np.nan)
+    if n == 0:
+        return out
+    # Summing offsets from the first bar keeps the cumulative sum small.
+    base = x[0]
+    csum = np.cumsum(x - base, axis=0)
+    counts = np.minimum(np.arange(1, n + 1), period).astype(np.float64)
+    if x.ndim == 2:
+        counts = counts[:, None]
+    totals = csum.copy()
+    totals[period:] -= csum[:-period]
+    means = totals / counts + base
+    start = max(min_periods, 1) - 1
+    out[start:] = means[start:]
+    return out
+
+
+def ema(x, period: int) -> np.ndarray:
+    """Exponential moving average matching ``ewm(span=period, adjust=False)``."""
+    _check_period(period)
+    return ewm_filter(x, 2.0 / (period + 1))
+
+
+def _wilder(values: np.ndarray, period: int, first: int) -> np.ndarray:
+    """Wilder average of ``values[first:]`` seeded with the mean of its first
+    ``period`` entries; NaN before the seed."""
+    out = np.full_like(values, np.nan)
+    seed_at = first + period - 1
+    if values.shape[0] <= seed_at:
+        return out
+    seed = values[first:seed_at + 1].mean(axis=0)
+    out[seed_at] = seed
+    out[seed_at + 1:] = ewm_filter(values[seed_at + 1:], 1.0 / period, init=seed)
+    return out
+
+
+def rsi(x, period: int = 14) -> np.ndarray:
+    """Wilder's RSI; the first value is at bar ``period``."""
+    _check_period(period)
+    x = _as_array(x)
+    delta = np.zeros_like(x)
+    delta[1:] = np.diff(x, axis=0)
+    gain = _wilder(np.clip(delta, 0.0, None), period, 1)
+    loss = _wilder(np.clip(-delta, 0.0, None), period, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    flat = (loss == 0) & ~np.isnan(gain)
+    out[flat] = np.where(gain[flat] > 0, 100.0, 50.0)
+    return out
+
+
+def rolling_std(x, period: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation (sample by default, like pandas)."""
+    _check_period(period, 2 if ddof else 1)
+
+    def reduce(windows):
+        dev = windows - windows.mean(axis=-1, keepdims=True)
+        return np.sqrt(np.einsum("...i,...i", dev, dev) / (period - ddof))
+
+    return _windowed(_as_array(x), period, reduce)
+
+
+def bollinger(x, period: int = 20, multiplier: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Upper and lower bands at ``multiplier`` sample deviations from the SMA."""
+    _check_period(period, 2)
+    middle = sma(x, period)
+    band = multiplier * rolling_std(x, period)
+    return middle + band, middle - band
+
+
+def atr(close, period: int = 14, high=None, low=None) -> np.ndarray:
+    """Wilder's average true range; close-to-close moves if no high/low."""
+    _check_period(period)
+    close = _as_array(close)
+    high = close if high is None else _as_array(high)
+    low = close if low is None else _as_array(low)
+    tr = high - low
+    if close.shape[0] > 1:
+        prev = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+    return _wilder(tr, period, 0)
+
+
+def linreg_slope(x, period: int) -> np.ndarray:
+    """Least-squares slope per bar over the trailing ``period`` values."""
+    _check_period(period, 2)
+    t = np.arange(period, dtype=np.float64)
+    t -= t.mean()
+    weights = t / (t @ t)
+    return _windowed(_as_array(x), period, lambda w: w @ weights)
@@ -21,8 +21,7 @@ def log_trade_decision(snapshot, decision: dict):
         "volatility": snapshot.volatility,
         "decision": decision,
     }
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
+    os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
     with open(LOG_PATH, "a") as f:
         f.write(json.dumps(log_entry) + "\n")
 
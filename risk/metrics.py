@@ -0,0 +1,101 @@
+# risk/metrics.py
+"""Online performance metrics updated in O(1) per equity point.
+
+:class:`StreamingMetrics` tracks the running peak, current and max
+drawdown, Welford mean/variance of period returns and win/loss tallies, so
+backtests can drop or downsample their equity curve and live loops can
+report Sharpe and drawdown without keeping history.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional
+
+
+class StreamingMetrics:
+    """Running equivalents of :meth:`BacktestEngine.summary`.
+
+    Call :meth:`update` with every equity value (one per bar or snapshot)
+    and :meth:`record_trade` with every closed trade's PnL. ``risk_free`` is
+    the per-period rate subtracted in the Sharpe ratio, matching the engine.
+    """
+
+    __slots__ = (
+        "risk_free", "count", "equity", "peak", "drawdown", "max_drawdown",
+        "n_returns", "mean_return", "_m2",
+        "wins", "losses", "gross_profit", "gross_loss",
+    )
+
+    def __init__(self, risk_free: float = 0.02):
+        self.risk_free = risk_free
+        self.count = 0
+        self.equity: Optional[float] = None
+        self.peak: Optional[float] = None
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self._m2 = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def update(self, equity: float) -> None:
+        prev = self.equity
+        if prev is not None:
+            r = (equity - prev) / prev
+            self.n_returns += 1
+            delta = r - self.mean_return
+            self.mean_return += delta / self.n_returns
+            self._m2 += delta * (r - self.mean_return)
+        self.equity = equity
+        self.count += 1
+        if self.peak is None or equity > self.peak:
+            self.peak = equity
+        self.drawdown = (self.peak - equity) / self.peak
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+
+    def record_trade(self, pnl: float) -> None:
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        else:
+            self.losses += 1
+            self.gross_loss += pnl
+
+    @property
+    def return_std(self) -> float:
+        """Population standard deviation of period returns."""
+        return math.sqrt(self._m2 / self.n_returns) if self.n_returns else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        std = self.return_std
+        if self.n_returns > 1 and std != 0:
+            return (self.mean_return - self.risk_free) / std
+        return 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        if not self.losses or self.gross_loss == 0:
+            return float("inf")
+        return abs(self.gross_profit) / abs(self.gross_loss)
+
+    def summary(self) -> Dict:
+        """Same keys as :meth:`BacktestEngine.summary` (empty before any update)."""
+        if self.count == 0:
+            return {}
+        trades = self.wins + self.losses
+        return {
+            "equity": self.equity,
+            "trades": trades,
+            "win_rate": self.wins / max(trades, 1),
+            "avg_gain": self.gross_profit / self.wins if self.wins else 0.0,
+            "avg_loss": self.gross_loss / self.losses if self.losses else 0.0,
+            "profit_factor": self.profit_factor,
+            "sharpe_ratio": self.sharpe,
+            "max_drawdown": self.max_drawdown,
+        }
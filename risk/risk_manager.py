@@ -2,6 +2,7 @@
 
 import logging
 import asyncio
+from risk.metrics import StreamingMetrics
 from utils.notifications import send_slack_message
 
 class RiskManager:
@@ -17,6 +18,8 @@ class RiskManager:
         self.consec_losses = 0
         self.last_equity = None
         self.start_equity = None
+        # Running peak/drawdown/Sharpe over every equity snapshot seen.
+        self.metrics = StreamingMetrics()
         self.webhook = config.get("api_keys", {}).get("slack_webhook")
 
     async def _alert(self, message: str):
@@ -31,6 +34,8 @@ class RiskManager:
             self.last_equity = float(info["portfolio_value"])
         else:
             logging.warning("RiskManager: Could not retrieve equity from API.")
+            return self.last_equity
+        self.metrics.update(self.last_equity)
         return self.last_equity
 
     def get_position_size(self, price: float) -> float:
@@ -0,0 +1,320 @@
+# services/ai_decision_store.py
+"""Record and replay AI trade decisions for deterministic backtests.
+
+Live decisions from :func:`services.ai_strategist.get_ai_trade_decision` are
+written to an indexed SQLite store alongside ``logs/ai_decisions.log``
+(existing logs can be imported with :meth:`DecisionStore.import_log`).
+During a backtest :func:`use_replay` makes ``get_ai_trade_decision`` answer
+from the store instead of calling the API:
+
+1. exact match on the context (volatile fields such as ``timestamp`` are
+   ignored),
+2. match on a quantized context, where numbers are rounded to a few
+   significant digits (or per-field absolute steps),
+3. on a miss, an optional local surrogate such as :class:`NearestNeighborSurrogate`,
+   otherwise a neutral ``hold``.
+
+Example::
+
+    store = DecisionStore("logs/ai_decisions.db")
+    store.import_log("logs/ai_decisions.log")
+    with use_replay(store, surrogate=NearestNeighborSurrogate.fit(store)):
+        run_simulation(MomentumStrategy, prices)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DB = "logs/ai_decisions.db"
+# Context fields that change on every call and never influence the decision.
+IGNORED_FIELDS = ("timestamp",)
+HOLD = {"action": "hold", "confidence": 0.5, "reason": "replay miss"}
+
+Surrogate = Callable[[Dict], Optional[Dict]]
+
+
+def _canonical(context: Dict, ignore=IGNORED_FIELDS) -> Dict:
+    return {k: v for k, v in context.items() if k not in ignore}
+
+
+def _round_sig(value: float, digits: int) -> float:
+    if value == 0 or not math.isfinite(value):
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def quantize(context: Dict, significant: int = 3, steps: Optional[Dict[str, float]] = None) -> Dict:
+    """Round numeric fields to ``significant`` digits or to ``steps[field]``."""
+    steps = steps or {}
+    out = {}
+    for key, value in context.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            out[key] = value
+        elif key in steps:
+            out[key] = round(round(value / steps[key]) * steps[key], 12)
+        else:
+            out[key] = _round_sig(float(value), significant)
+    return out
+
+
+def context_key(context: Dict) -> str:
+    payload = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DecisionStore:
+    """SQLite table of ``context -> decision`` pairs indexed by exact and quantized key."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB,
+        significant: int = 3,
+        steps: Optional[Dict[str, float]] = None,
+    ):
+        self.path = path
+        self.significant = significant
+        self.steps = dict(steps or {})
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._initialize_tables()
+
+    def _initialize_tables(self) -> None:
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS decisions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts TEXT NOT NULL,
+                    exact_key TEXT NOT NULL,
+                    quant_key TEXT NOT NULL,
+                    context TEXT NOT NULL,
+                    decision TEXT NOT NULL,
+                    UNIQUE (exact_key, ts)
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_exact ON decisions (exact_key)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_quant ON decisions (quant_key)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        quant = json.dumps({"significant": self.significant, "steps": self.steps}, sort_keys=True)
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'quantization'").fetchone()
+        if row is None or row[0] != quant:
+            self._reindex(quant)
+
+    def _reindex(self, quant: str) -> None:
+        """Recompute quantized keys after the quantization settings change."""
+        rows = self.conn.execute("SELECT id, context FROM decisions").fetchall()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE decisions SET quant_key = ? WHERE id = ?",
+                [(self.quant_key(json.loads(ctx)), row_id) for row_id, ctx in rows],
+            )
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('quantization', ?)", (quant,))
+        if rows:
+            logging.info(f"Re-indexed {len(rows)} AI decisions for new quantization")
+
+    def exact_key(self, context: Dict) -> str:
+        return context_key(_canonical(context))
+
+    def quant_key(self, context: Dict) -> str:
+        return context_key(quantize(_canonical(context), self.significant, self.steps))
+
+    def record(self, context: Dict, decision: Dict, ts: Optional[str] = None) -> None:
+        ts = ts or context.get("timestamp") or datetime.utcnow().isoformat()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO decisions (ts, exact_key, quant_key, context, decision) VALUES (?, ?, ?, ?, ?)",
+                (
+                    str(ts),
+                    self.exact_key(context),
+                    self.quant_key(context),
+                    json.dumps(context, default=str),
+                    json.dumps(decision, default=str),
+                ),
+            )
+
+    def lookup(self, context: Dict, quantized: bool = True) -> Tuple[Optional[Dict], Optional[str]]:
+        """Return ``(decision, "exact"|"quantized")`` or ``(None, None)``.
+
+        When a context was recorded more than once the latest decision wins.
+        """
+        queries = [("exact", "exact_key", self.exact_key(context))]
+        if quantized:
+            queries.append(("quantized", "quant_key", self.quant_key(context)))
+        with self._lock:
+            for kind, column, key in queries:
+                row = self.conn.execute(
+                    f"SELECT decision FROM decisions WHERE {column} = ? ORDER BY ts DESC, id DESC LIMIT 1",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0]), kind
+        return None, None
+
+    def __iter__(self) -> Iterator[Tuple[Dict, Dict]]:
+        for ctx, dec in self.conn.execute("SELECT context, decision FROM decisions ORDER BY id"):
+            yield json.loads(ctx), json.loads(dec)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+
+    def import_log(self, log_path: str = "logs/ai_decisions.log") -> int:
+        """Load ``<iso> context=<json> decision=<json>`` lines; returns rows read."""
+        path = Path(log_path)
+        if not path.is_file():
+            return 0
+        count = 0
+        with open(path) as f:
+            for line in f:
+                try:
+                    ts, rest = line.rstrip("\n").split(" ", 1)
+                    ctx_str, dec_str = rest[len("context="):].split(" decision=", 1)
+                    self.record(json.loads(ctx_str), json.loads(dec_str), ts)
+                    count += 1
+                except Exception as e:
+                    logging.warning(f"Skipping malformed AI decision log line: {e}")
+        logging.info(f"Imported {count} AI decisions from {log_path}")
+        return count
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class NearestNeighborSurrogate:
+    """k-nearest-neighbour stand-in for the LLM, fitted on recorded decisions.
+
+    Numeric context fields are standardized; each differing text field
+    (``recent_trend``, ``position_status`` ...) adds one unit of distance.
+    The action is a confidence-weighted vote of the ``k`` nearest records.
+    """
+
+    def __init__(self, contexts: List[Dict], decisions: List[Dict], k: int = 5):
+        if not contexts:
+            raise ValueError("surrogate needs at least one recorded decision")
+        self.k = k
+        contexts = [_canonical(c) for c in contexts]
+        fields = sorted({key for c in contexts for key in c})
+        self.numeric = [f for f in fields if all(_is_number(c.get(f, 0)) for c in contexts)]
+        self.text = [f for f in fields if f not in self.numeric]
+        x = np.array([[float(c.get(f, 0)) for f in self.numeric] for c in contexts], dtype=np.float64)
+        self.mean = x.mean(axis=0) if x.size else x
+        std = x.std(axis=0) if x.size else x
+        self.std = np.where(std > 0, std, 1.0)
+        self.x = (x - self.mean) / self.std if x.size else np.zeros((len(contexts), 0))
+        self.labels = np.array([[str(c.get(f)) for f in self.text] for c in contexts], dtype=object).reshape(
+            len(contexts), len(self.text)
+        )
+        self.actions = np.array([str(d.get("action", "hold")) for d in decisions], dtype=object)
+        self.confidence = np.array([float(d.get("confidence", 0.5)) for d in decisions])
+
+    @classmethod
+    def fit(cls, store: DecisionStore, k: int = 5) -> "NearestNeighborSurrogate":
+        pairs = list(store)
+        return cls([c for c, _ in pairs], [d for _, d in pairs], k)
+
+    def __call__(self, context: Dict) -> Dict:
+        context = _canonical(context)
+        q = np.array([float(context.get(f, 0)) if _is_number(context.get(f, 0)) else 0.0 for f in self.numeric])
+        dist = np.sqrt((((self.x - (q - self.mean) / self.std)) ** 2).sum(axis=1))
+        if self.text:
+            labels = np.array([str(context.get(f)) for f in self.text], dtype=object)
+            dist = dist + (self.labels != labels).sum(axis=1)
+        nearest = np.argsort(dist, kind="stable")[: self.k]
+        votes: Dict[str, float] = {}
+        for i in nearest:
+            votes[self.actions[i]] = votes.get(self.actions[i], 0.0) + self.confidence[i]
+        action = max(votes, key=votes.get)
+        chosen = [i for i in nearest if self.actions[i] == action]
+        return {
+            "action": action,
+            "confidence": round(float(self.confidence[chosen].mean()), 4),
+            "reason": f"surrogate knn k={len(nearest)}",
+        }
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class DecisionReplay:
+    """Answers ``get_ai_trade_decision`` from a store during backtests."""
+
+    def __init__(
+        self,
+        store: DecisionStore,
+        surrogate: Optional[Surrogate] = None,
+        quantized: bool = True,
+        allow_live: bool = False,
+    ):
+        self.store = store
+        self.surrogate = surrogate
+        self.quantized = quantized
+        self.allow_live = allow_live
+        self.stats = {"exact": 0, "quantized": 0, "surrogate": 0, "miss": 0}
+
+    def decide(self, context: Dict) -> Optional[Dict]:
+        """Replayed decision, or ``None`` to fall through to the live API."""
+        decision, kind = self.store.lookup(context, self.quantized)
+        if decision is not None:
+            self.stats[kind] += 1
+            return decision
+        if self.surrogate is not None:
+            decision = self.surrogate(context)
+            if decision is not None:
+                self.stats["surrogate"] += 1
+                return decision
+        self.stats["miss"] += 1
+        return None if self.allow_live else dict(HOLD)
+
+
+# Set by use_replay(); consulted by get_ai_trade_decision.
+_ACTIVE_REPLAY: Optional[DecisionReplay] = None
+_RECORDER: Optional[DecisionStore] = None
+
+
+def active_replay() -> Optional[DecisionReplay]:
+    return _ACTIVE_REPLAY
+
+
+@contextmanager
+def use_replay(
+    store: DecisionStore,
+    surrogate: Optional[Surrogate] = None,
+    quantized: bool = True,
+    allow_live: bool = False,
+) -> Iterator[DecisionReplay]:
+    """Serve AI decisions from ``store`` inside the ``with`` block."""
+    global _ACTIVE_REPLAY
+    previous = _ACTIVE_REPLAY
+    _ACTIVE_REPLAY = DecisionReplay(store, surrogate, quantized, allow_live)
+    try:
+        yield _ACTIVE_REPLAY
+    finally:
+        logging.info(f"AI decision replay stats: {_ACTIVE_REPLAY.stats}")
+        _ACTIVE_REPLAY = previous
+
+
+def record_decision(context: Dict, decision: Dict) -> None:
+    """Add a live decision to the store at ``AI_DECISION_DB`` (default ``logs/ai_decisions.db``)."""
+    global _RECORDER
+    try:
+        if _RECORDER is None:
+            _RECORDER = DecisionStore(os.getenv("AI_DECISION_DB", DEFAULT_DB))
+        _RECORDER.record(context, decision)
+    except Exception as e:
+        logging.error(f"Failed to record AI decision: {e}")
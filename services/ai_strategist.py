@@ -9,6 +9,8 @@ import asyncio
 import openai
 from dotenv import load_dotenv
 
+from services.ai_decision_store import active_replay, record_decision
+
 # Ensure .env variables are loaded before accessing the API key.  This allows
 # modules that import ai_strategist before the main configuration loads the
 # environment to still pick up the key.
@@ -62,10 +64,17 @@ def _log_decision(context: dict, decision: dict) -> None:
             f.write(line)
     except Exception as e:
         logging.error(f"Failed to log AI decision: {e}")
+    record_decision(context, decision)
 
 
 async def get_ai_trade_decision(context: dict) -> dict:
     """Analyze market context with GPT-3.5 and return a trade decision."""
+    replay = active_replay()
+    if replay is not None:
+        decision = replay.decide(context)
+        if decision is not None:
+            return decision
+
     enabled = os.getenv("ENABLE_AI_STRATEGY", "true").lower() in ("true", "1", "yes")
     if not enabled:
         return {"action": "hold", "confidence": 0.5, "reason": "AI disabled"}
@@ -8,9 +8,12 @@ from api.crypto_api import CryptoAPI
 from api.forex_api import ForexAPI
 from risk.risk_manager import RiskManager
 from strategies.crypto.momentum import MomentumStrategy
-from data.market_data_crypto import start_crypto_market_feed
+from data.binance_streams import DEFAULT_SHARD_SIZE, BinanceStreamManager
 from data.market_data_coingecko import start_coingecko_polling
 from data.market_data_alpaca import start_stock_ws_feed
+from data.bar_aggregator import default_aggregator
+from data.market_bus import default_bus
+from data.tick_recorder import TickRecorder
 from db.db_manager import DatabaseManager
 from services.background_tasks import BackgroundTasks
 from services.sim_portfolio import SimulatedPortfolio
@@ -42,10 +45,25 @@ class BotLauncher:
             self.sim_portfolio = SimulatedPortfolio(
                 starting_balance=starting, state_file=state_file
             )
+        # Live OHLCV bars shared with strategies through BaseStrategy.bars.
+        self.bar_aggregator = default_aggregator()
+        # Feeds publish every tick here; the bus records it into the shared
+        # tick buffers and bar_aggregator, and strategies wake on it
+        # (BaseStrategy.bus). Feeds are therefore not given the aggregator.
+        self.market_bus = default_bus()
+        self.crypto_feed = None
+        self.tick_recorder = None
+        if self.config.get("RECORD_TICKS", False):
+            self.tick_recorder = TickRecorder(
+                self.config.get("tick_record_dir", "data/ticks")
+            )
 
     def start_all_bots(self):
         asyncio.create_task(self.bg_tasks.run_sentiment_loop())
         asyncio.create_task(heartbeat())
+        asyncio.create_task(self.bar_aggregator.run_flush_loop())
+        if self.tick_recorder:
+            asyncio.create_task(self.tick_recorder.run_flush_loop())
 
         if self.config.get("ENABLE_CRYPTO_TRADING", True):
             asyncio.create_task(self.start_crypto_bots())
@@ -94,7 +112,16 @@ class BotLauncher:
 
         await crypto_api.fetch_account_info()
 
-        asyncio.create_task(start_crypto_market_feed(all_symbols))
+        # No on_message: ticks are no longer logged one by one at INFO;
+        # run_stats_loop logs per-shard throughput instead.
+        self.crypto_feed = BinanceStreamManager(
+            all_symbols,
+            shard_size=self.config.get("binance_streams_per_connection", DEFAULT_SHARD_SIZE),
+            recorder=self.tick_recorder,
+            bus=self.market_bus,
+        )
+        asyncio.create_task(self.crypto_feed.run())
+        asyncio.create_task(self.crypto_feed.run_stats_loop())
         asyncio.create_task(start_coingecko_polling(all_symbols))
 
         strategy_cfgs = settings.get("strategies") or [settings]
@@ -164,13 +191,19 @@ class BotLauncher:
 
         from data.market_data_stocks import start_stock_polling_loop
 
-        asyncio.create_task(start_stock_polling_loop(base_symbols, stock_api))
+        asyncio.create_task(
+            start_stock_polling_loop(
+                base_symbols, stock_api, bus=self.market_bus
+            )
+        )
         asyncio.create_task(
             start_stock_ws_feed(
                 base_symbols,
                 alpaca_key,
                 alpaca_secret,
                 base_url,
+                recorder=self.tick_recorder,
+                bus=self.market_bus,
             )
         )
 
@@ -224,6 +257,8 @@ class BotLauncher:
                 base_instruments,
                 api_key,
                 account_id,
+                recorder=self.tick_recorder,
+                bus=self.market_bus,
             )
         )
 
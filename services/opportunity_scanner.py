@@ -2,13 +2,15 @@ import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 import aiohttp
 from config.config_manager import ConfigManager
+from indicators.cross_section import CrossSection
 from signals.signal_fusion_engine import SignalFusionEngine
 
 COINGECKO_URL = "https://api.coingecko.com/api/v3/search/trending"
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
 
 class OpportunityScanner:
     """Background service to find trending crypto opportunities."""
@@ -17,14 +19,49 @@ class OpportunityScanner:
         self.config = config
         self.trade_symbols = set(config.get("TRADE_SYMBOLS", []))
         self.temp_symbols: Dict[str, datetime] = {}
+        # symbol -> CoinGecko coin id, for price lookups of scanned coins
+        self.coin_ids: Dict[str, str] = {}
         self.fusion = SignalFusionEngine(config)
+        self.universe: Optional[CrossSection] = None
+
+    def update_universe(self, prices: Dict[str, float]) -> None:
+        """Feed one bar of closes for every screened symbol (called by :meth:`scan`)."""
+        if self.universe is None:
+            self.universe = CrossSection(list(prices))
+        else:
+            self.universe.add_symbols(prices)
+        self.universe.update(prices)
 
     async def fetch_trending(self) -> List[str]:
         async with aiohttp.ClientSession() as session:
             async with session.get(COINGECKO_URL) as resp:
                 data = await resp.json()
                 coins = data.get("coins", [])
-                return [c["item"]["symbol"].upper() + "-USD" for c in coins[:7]]
+                symbols = []
+                for c in coins[:7]:
+                    symbol = c["item"]["symbol"].upper() + "-USD"
+                    self.coin_ids[symbol] = c["item"]["id"]
+                    symbols.append(symbol)
+                return symbols
+
+    async def fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """USD prices for ``symbols`` in one CoinGecko request."""
+        ids = {self.coin_ids[s]: s for s in symbols if s in self.coin_ids}
+        if not ids:
+            return {}
+        params = {"ids": ",".join(ids), "vs_currencies": "usd"}
+        async with aiohttp.ClientSession() as session:
+            async with session.get(COINGECKO_PRICE_URL, params=params) as resp:
+                data = await resp.json()
+        return {ids[i]: float(v["usd"]) for i, v in data.items() if i in ids and v.get("usd")}
+
+    def record_prices(self, prices: Dict[str, float]) -> None:
+        """Append scanned prices to the feature store history they are scored on.
+
+        These symbols are not traded, so no feed or strategy records them.
+        """
+        for symbol, price in prices.items():
+            self.fusion.features.update(symbol, price)
 
     def cleanup_temp(self):
         now = datetime.utcnow()
@@ -34,17 +71,32 @@ class OpportunityScanner:
 
     async def scan(self) -> List[Dict]:
         results = []
-        trending = await self.fetch_trending()
+        trending = [s for s in await self.fetch_trending() if s not in self.trade_symbols]
+        # Keep sampling recently trending coins so their history builds up
+        # across scans.
+        scanned = list(dict.fromkeys(trending + list(self.temp_symbols)))
+        try:
+            prices = await self.fetch_prices(scanned)
+        except Exception as e:
+            logging.error(f"OpportunityScanner price fetch failed: {e}")
+            prices = {}
+        if prices:
+            self.record_prices(prices)
+            # One cross-sectional bar per scan ranks the scanned coins
+            # against each other.
+            self.update_universe(prices)
         for symbol in trending:
-            if symbol in self.trade_symbols:
-                continue
-            prices = []  # placeholder for price history
-            score_data = await self.fusion.score_symbol(symbol, prices)
+            # Scored on the feature store history built by record_prices.
+            score_data = await self.fusion.score_symbol(symbol)
+            details = dict(score_data.details)
+            if self.universe is not None and symbol in self.universe.symbols:
+                ranks = self.universe.get(symbol)
+                details.update({k: ranks[k] for k in ("momentum_pct", "rsi_z", "rel_volatility")})
             results.append(
                 {
                     "symbol": symbol,
                     "score": score_data.conviction,
-                    "details": score_data.details,
+                    "details": details,
                 }
             )
             self.temp_symbols[symbol] = datetime.utcnow()
@@ -57,10 +109,20 @@ class OpportunityScanner:
         self.cleanup_temp()
         return list(self.trade_symbols | set(self.temp_symbols.keys()))
 
+    async def run(self, interval: Optional[float] = None):
+        """Scan every ``interval`` seconds (``opportunity_scan_interval``)."""
+        interval = interval or float(self.config.get("opportunity_scan_interval", 300))
+        while True:
+            try:
+                await self.scan()
+            except Exception as e:
+                logging.error(f"OpportunityScanner scan failed: {e}")
+            await asyncio.sleep(interval)
+
 async def main():
     config = ConfigManager().load_config()
     scanner = OpportunityScanner(config)
-    await scanner.scan()
+    await scanner.run()
 
 if __name__ == "__main__":
     asyncio.run(main())
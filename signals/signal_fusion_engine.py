@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from indicators.technical_indicators import (
     exponential_moving_average,
@@ -9,6 +9,7 @@ from indicators.technical_indicators import (
     bollinger_bands,
 )
 
+from data.feature_store import FeatureStore, default_store
 from data.sentiment import (
     fetch_newsapi_sentiment,
     fetch_reddit_sentiment,
@@ -28,13 +29,14 @@ class FusionResult:
 class SignalFusionEngine:
     """Fuse technical, sentiment and market data signals into a conviction score."""
 
-    def __init__(self, config: Dict[str, float]):
+    def __init__(self, config: Dict[str, float], features: Optional[FeatureStore] = None):
         self.tech_weight = float(config.get("TECH_WEIGHT", 0.5))
         self.sent_weight = float(config.get("SENT_WEIGHT", 0.3))
         self.market_weight = float(config.get("MARKET_WEIGHT", 0.2))
         self.reddit_subs = config.get("REDDIT_SUBS", ["CryptoCurrency"])
         self.news_key = config.get("NEWSAPI_KEY")
         self.loop = asyncio.get_event_loop()
+        self.features = features or default_store()
 
     async def sentiment_score(self, symbol: str) -> float:
         """Aggregate sentiment from multiple sources."""
@@ -69,12 +71,19 @@ class SignalFusionEngine:
             logging.error(f"Pytrends failed: {e}")
             return 0.0
 
-    def technical_score(self, prices: List[float]) -> float:
+    def technical_score(self, prices: List[float], symbol: Optional[str] = None) -> float:
+        """Score ``prices``; with ``symbol`` the indicators are read from the
+        shared feature store, whose history ``prices`` must then be."""
         if len(prices) < 5:
             return 0.5
-        ema = exponential_moving_average(prices, 10)
-        rsi = relative_strength_index(prices)
-        upper, lower = bollinger_bands(prices)
+        if symbol is not None:
+            ema = self.features.get(symbol, "ema", 10)
+            rsi = self.features.get(symbol, "rsi", 14)
+            upper, lower = self.features.get(symbol, "bollinger", 20, 2.0)
+        else:
+            ema = exponential_moving_average(prices, 10)
+            rsi = relative_strength_index(prices)
+            upper, lower = bollinger_bands(prices)
         price = prices[-1]
         tech = 0.5
         if price > ema and rsi > 50:
@@ -94,8 +103,13 @@ class SignalFusionEngine:
         score = 0.5 + momentum - (volatility / prices[-1])
         return min(max(score, 0), 1)
 
-    async def score_symbol(self, symbol: str, prices: List[float]) -> FusionResult:
-        tech = self.technical_score(prices)
+    async def score_symbol(self, symbol: str, prices: Optional[List[float]] = None) -> FusionResult:
+        """Score ``symbol``; without ``prices`` the feature store history is used."""
+        if prices is None:
+            prices = self.features.history(symbol)
+            tech = self.technical_score(prices, symbol)
+        else:
+            tech = self.technical_score(prices)
         sent = await self.sentiment_score(symbol)
         trend = await self.google_trend_score(symbol.split("-")[0])
         market = self.market_score(prices)
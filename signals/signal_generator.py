@@ -14,8 +14,10 @@ class SignalGenerator:
         self.tech_weight = tech_weight
         self.sentiment_weight = sentiment_weight
 
-    def generate(self, prices: list[float], sentiment_score: float) -> Signal:
-        rsi = relative_strength_index(prices)
+    def generate(self, prices: list[float], sentiment_score: float, rsi: float | None = None) -> Signal:
+        """Pass a precomputed 14-period ``rsi`` to skip recomputing it."""
+        if rsi is None:
+            rsi = relative_strength_index(prices)
         action = "hold"
         base_conf = 0.0
         if rsi > 70:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+from typing import Sequence
 
 from services.ai_strategist import get_conviction_score
 from signals.sentiment_manager import get_sentiment_score
@@ -26,10 +26,13 @@ class AIMomentumFusion:
         except Exception:
             return 0.5
 
-    def generate_signal(self, history: List[float]) -> str:
+    def generate_signal(self, history: Sequence[float], features=None) -> str:
         if len(history) <= self.window:
             return "hold"
-        momentum = (history[-1] - history[-self.window]) / history[-self.window]
+        if features is not None:
+            momentum = features.momentum(self.window)
+        else:
+            momentum = (history[-1] - history[-self.window]) / history[-self.window]
         sentiment = get_sentiment_score(self.symbol)
         score = self._ai_score({"momentum": momentum, "sentiment": sentiment})
 
@@ -1,6 +1,15 @@
 # strategies/base_strategy.py
 
 import abc
+import logging
+import time
+
+import numpy as np
+
+from data.bar_aggregator import default_aggregator
+from data.feature_store import FEATURES, default_store
+from data.market_bus import default_bus
+from utils.helpers import parse_price
 
 class BaseStrategy(abc.ABC):
     """
@@ -13,7 +22,140 @@ class BaseStrategy(abc.ABC):
         self.config = config
         self.db = db
         self.symbols = symbol_list
-        self.price_history = {symbol: [] for symbol in symbol_list}
+        # Tick history and indicator values shared with other strategies
+        # on the same symbols.
+        self.features = default_store()
+        self.ticks = self.features.ticks
+        # OHLCV bars built from the ticks on ``bus``; subscribe for bar closes.
+        self.bars = default_aggregator()
+        # Live ticks pushed by the feeds; the bus also writes them to
+        # ``ticks``. ``interval`` is the decision cadence and the REST
+        # polling fallback for symbols nothing published for that long;
+        # ``throttle`` the minimum seconds between wake-ups. ``clock`` stamps
+        # polled prices (epoch ns).
+        self.bus = default_bus()
+        self.interval = 10
+        self.throttle = float(config.get("min_decision_interval", 0.0))
+        self.clock = time.time_ns
+        self._subscription = None
+        self._seen: dict[str, int] = {}
+        self._polled: dict[str, float] = {}
+
+    def use_market_data(self, bus) -> None:
+        """Take ticks from ``bus`` and read history and bars from the store
+        and aggregator it writes."""
+        self.stop_listening()
+        self.bus = bus
+        if bus.features is not None:
+            self.features = bus.features
+            self.ticks = bus.features.ticks
+        if bus.bars is not None:
+            self.bars = bus.bars
+
+    @property
+    def price_history(self):
+        """Read-only ``{symbol: prices}`` views of the shared tick buffers."""
+        return {symbol: self.ticks.last(symbol) for symbol in self.symbols}
+
+    def record_price(self, symbol: str, price: float, ts_ns=None) -> None:
+        """Publish a price this strategy fetched itself, e.g. a REST poll.
+
+        The bus appends it to the shared tick buffers and wakes the other
+        strategies on ``symbol``. ``ts_ns`` defaults to :attr:`clock`; a tick
+        not newer than the symbol's last one is dropped.
+        """
+        if ts_ns is None:
+            ts_ns = self.clock()
+        self._seen[symbol] = ts_ns
+        self.bus.publish(symbol, price, type(self).__name__, ts_ns, exclude=self._subscription)
+
+    def history(self, symbol: str, n=None):
+        """Zero-copy view of the last ``n`` ticks for ``symbol``, oldest first."""
+        return self.ticks.last(symbol, n)
+
+    def sampled(self, symbol: str, n: int, every=None, end_ns=None) -> np.ndarray:
+        """Last ``n`` prices for ``symbol`` taken every ``every`` seconds.
+
+        Each sample is the last tick at or before its grid time; the grid
+        ends at ``end_ns`` (default: the latest tick) and is spaced
+        ``every`` seconds (default :attr:`interval`), so an ``n``-sample
+        lookback spans ``n * every`` seconds however often the symbol
+        ticks. Grid times before the oldest retained tick are dropped.
+        """
+        ring = self.ticks.get(symbol)
+        if ring is None or not ring.count:
+            return np.empty(0)
+        times = ring.last_times()
+        if end_ns is None:
+            end_ns = int(times[-1])
+        step = int((every or self.interval) * 1e9)
+        grid = end_ns - step * np.arange(n - 1, -1, -1, dtype=np.int64)
+        idx = np.searchsorted(times, grid, side="right") - 1
+        return ring.last()[idx[idx >= 0]]
+
+    def sampled_feature(self, symbol: str, name: str, window: int):
+        """Feature ``name`` (see ``FEATURES``) over the last ``window``
+        :meth:`sampled` prices rather than the last ``window`` ticks."""
+        return FEATURES[name](self.sampled(symbol, window), window)
+
+    async def poll_price(self, symbol: str) -> float:
+        """REST price lookup used when no feed is publishing ``symbol``."""
+        return parse_price(await self.api.fetch_market_price(symbol))
+
+    def _last_update(self, symbol: str) -> float:
+        """Time of the latest tick for ``symbol`` from any source, or of this
+        strategy's last poll attempt if that is later."""
+        ring = self.ticks.get(symbol)
+        latest = ring.latest_ts if ring is not None and ring.count else float("-inf")
+        return max(latest, self._polled.get(symbol, float("-inf")))
+
+    async def next_prices(self) -> dict:
+        """Wait for new prices and return ``{symbol: (price, ts_ns)}``.
+
+        Wakes as soon as the bus delivers ticks for this strategy's symbols
+        (no sooner than ``throttle`` after the previous wake-up). Symbols
+        with no tick from any source for ``interval`` seconds are polled over
+        REST and the result published, so strategies sharing a symbol poll
+        it once per interval between them and see the same samples.
+        """
+        if self._subscription is None:
+            self._subscription = self.bus.subscribe(self.symbols, throttle=self.throttle)
+        interval_ns = self.interval * 1e9
+        # Wait no longer than until the next symbol is due for a poll.
+        due = min((self._last_update(s) for s in self.symbols), default=self.clock()) + interval_ns
+        events = await self._subscription.wait(timeout=max((due - self.clock()) / 1e9, 0.0))
+        prices = {}
+        for symbol, event in events.items():
+            if event.ts_ns > self._seen.get(symbol, -1):
+                self._seen[symbol] = event.ts_ns
+                prices[symbol] = (event.price, event.ts_ns)
+        now = self.clock()
+        for symbol in self.symbols:
+            if symbol in prices:
+                continue
+            if now - self._last_update(symbol) >= interval_ns:
+                self._polled[symbol] = now
+                try:
+                    price = await self.poll_price(symbol)
+                except Exception as e:
+                    logging.error(f"[{type(self).__name__}] Price poll failed for {symbol}: {e}")
+                    continue
+                ts_ns = self.clock()
+                self.record_price(symbol, price, ts_ns)
+                prices[symbol] = (price, ts_ns)
+                continue
+            ring = self.ticks.get(symbol)
+            if ring is not None and ring.count and ring.latest_ts > self._seen.get(symbol, -1):
+                # Recorded since our last look, e.g. polled by another strategy.
+                self._seen[symbol] = ring.latest_ts
+                prices[symbol] = (ring.latest, ring.latest_ts)
+        return prices
+
+    def stop_listening(self) -> None:
+        """Drop the bus subscription (a later :meth:`next_prices` renews it)."""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
 
     @abc.abstractmethod
     async def run(self):
@@ -1,6 +1,5 @@
 # strategies/crypto/mean_reversion.py
 
-import asyncio
 import logging
 from indicators.technical_indicators import moving_average
 from strategies.base_strategy import BaseStrategy
@@ -12,16 +11,10 @@ class MeanReversionStrategy(BaseStrategy):
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_market_price(symbol)
-                    price = float(data.get("price", 0))
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > 100:
-                        self.price_history[symbol] = self.price_history[symbol][-100:]
-
-                    ma = moving_average(self.price_history[symbol], 20)
+                    ma = moving_average(self.sampled(symbol, 20), 20)
 
                     if price < 0.98 * ma:
                         await self.enter_trade(symbol, price, "buy")
@@ -31,8 +24,6 @@ class MeanReversionStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[MeanReversion] Error on {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
-
     async def enter_trade(self, symbol, price, side):
         if not await self.risk.check_daily_loss():
             logging.warning("Daily loss limit reached. Trade blocked.")
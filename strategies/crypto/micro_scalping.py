@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from indicators.technical_indicators import relative_strength_index
 from strategies.base_strategy import BaseStrategy
@@ -16,21 +15,23 @@ class MicroScalpingStrategy(BaseStrategy):
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_market_price(symbol)
-                    price = float(data.get("price") or data.get("bid") or 0)
-                    self.price_history[symbol].append(price)
-                    if len(self.price_history[symbol]) > self.rsi_period + 2:
-                        self.price_history[symbol] = self.price_history[symbol][- (self.rsi_period + 2):]
-                        rsi = relative_strength_index(self.price_history[symbol], self.rsi_period)
+                    # RSI over closed 5m bars plus the live price as the forming bar.
+                    closes = self.bars.closes(symbol, "5m", self.rsi_period + 1)
+                    if len(closes) > self.rsi_period:
+                        rsi = relative_strength_index(list(closes) + [price], self.rsi_period)
                         if rsi > 55:
                             await self.enter_trade(symbol, price, "buy")
                         elif rsi < 45:
                             await self.enter_trade(symbol, price, "sell")
                 except Exception as e:
                     logging.error(f"[MicroScalp] Error for {symbol}: {e}")
-            await asyncio.sleep(self.interval)
+
+    async def poll_price(self, symbol: str) -> float:
+        data = await self.api.fetch_market_price(symbol)
+        return float(data.get("price") or data.get("bid") or 0)
 
     async def enter_trade(self, symbol: str, price: float, side: str):
         if not await self.risk.check_daily_loss():
@@ -1,9 +1,7 @@
 # strategies/crypto/momentum.py
 
-import asyncio
 import logging
 from datetime import datetime
-import numpy as np
 
 from risk.risk import DynamicRisk
 from utils.helpers import parse_price
@@ -16,21 +14,17 @@ class MomentumStrategy(BaseStrategy):
         self.sentiment_source = sentiment_source
         self.ai_symbols = set(ai_symbols or [])
         self.interval = 10  # seconds
+        # Wake at most once per interval: each decision is an AI call.
+        self.throttle = float(config.get("min_decision_interval", self.interval))
         self.dynamic_risk = DynamicRisk(risk,
                                        config.get("atr_period", 14),
                                        config.get("volatility_multiplier", 3))
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_market_price(symbol)
-                    price = parse_price(data)
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > 100:
-                        self.price_history[symbol] = self.price_history[symbol][-100:]
-
                     sentiment = await self.get_sentiment(symbol)
                     context = self._build_context(symbol, price, sentiment)
                     decision = await get_ai_trade_decision(context)
@@ -52,8 +46,6 @@ class MomentumStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[Momentum] Error on {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
-
     async def get_sentiment(self, symbol: str) -> float:
         if not self.sentiment_source:
             return 0.0
@@ -68,17 +60,13 @@ class MomentumStrategy(BaseStrategy):
         return (reddit_avg + news) / 2
 
     def _build_context(self, symbol: str, price: float, sentiment: float) -> dict:
-        prices = self.price_history[symbol]
-        vol = float(np.std(np.diff(prices[-10:]))) if len(prices) > 2 else 0.0
+        vol = self.sampled_feature(symbol, "volatility", 10)
+        slope = self.sampled_feature(symbol, "slope", 5)
         trend = "sideways"
-        if len(prices) >= 5:
-            x = np.arange(5)
-            y = np.array(prices[-5:])
-            slope = np.polyfit(x, y, 1)[0]
-            if slope > 0:
-                trend = "uptrend"
-            elif slope < 0:
-                trend = "downtrend"
+        if slope > 0:
+            trend = "uptrend"
+        elif slope < 0:
+            trend = "downtrend"
         pos_qty = 0.0
         if getattr(self.api, "portfolio", None):
             pos_qty = self.api.portfolio.open_positions.get(symbol, 0.0)
@@ -87,8 +75,8 @@ class MomentumStrategy(BaseStrategy):
             status = "long"
         elif pos_qty < 0:
             status = "short"
-        support = min(prices[-20:]) if len(prices) >= 1 else price
-        resistance = max(prices[-20:]) if len(prices) >= 1 else price
+        support = self.sampled_feature(symbol, "support", 20) or price
+        resistance = self.sampled_feature(symbol, "resistance", 20) or price
         return {
             "symbol": symbol,
             "price": price,
@@ -109,7 +97,7 @@ class MomentumStrategy(BaseStrategy):
         if not await self.risk.check_daily_loss():
             logging.warning("Daily loss limit reached. Trade blocked.")
             return
-        qty = self.dynamic_risk.position_size(price, confidence, self.price_history[symbol])
+        qty = self.dynamic_risk.position_size(price, confidence, self.sampled(symbol, 100))
         if symbol in self.ai_symbols:
             qty *= 0.5
             reason = f"AI_DISCOVERED | {reason}"
@@ -117,7 +105,7 @@ class MomentumStrategy(BaseStrategy):
             logging.warning("Momentum: invalid position size.")
             return
 
-        stops = self.dynamic_risk.stop_levels(price, action, self.price_history[symbol])
+        stops = self.dynamic_risk.stop_levels(price, action, self.sampled(symbol, 100))
         if stops.rr < 1.0:
             logging.info(f"Trade skipped on {symbol} due to RR {stops.rr:.2f}")
             return
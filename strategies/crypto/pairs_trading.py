@@ -1,6 +1,5 @@
 # strategies/crypto/pairs_trading.py
 
-import asyncio
 import logging
 from indicators.technical_indicators import moving_average
 from strategies.base_strategy import BaseStrategy
@@ -13,21 +12,21 @@ class PairsTradingStrategy(BaseStrategy):
 
     async def run(self):
         while True:
+            prices = await self.next_prices()
             try:
-                price_1 = await self.get_price(self.pair[0])
-                price_2 = await self.get_price(self.pair[1])
-
-                self.price_history[self.pair[0]].append(price_1)
-                self.price_history[self.pair[1]].append(price_2)
-
-                for sym in self.pair:
-                    if len(self.price_history[sym]) > 100:
-                        self.price_history[sym] = self.price_history[sym][-100:]
+                # One leg may not have ticked; pair it with its latest price.
+                price_1 = self.ticks.ring(self.pair[0]).latest
+                price_2 = self.ticks.ring(self.pair[1]).latest
+                if not prices or price_1 is None or price_2 is None:
+                    continue
 
                 spread = price_1 - price_2
-                spread_hist = [
-                    p1 - p2 for p1, p2 in zip(self.price_history[self.pair[0]], self.price_history[self.pair[1]])
-                ]
+                # Sample both legs on one time grid so each spread point
+                # pairs prices from the same moment.
+                now = self.clock()
+                leg_1, leg_2 = (self.sampled(sym, 100, end_ns=now) for sym in self.pair)
+                n = min(len(leg_1), len(leg_2))
+                spread_hist = leg_1[len(leg_1) - n:] - leg_2[len(leg_2) - n:]
 
                 spread_ma = moving_average(spread_hist, 20)
 
@@ -39,12 +38,6 @@ class PairsTradingStrategy(BaseStrategy):
             except Exception as e:
                 logging.error(f"[PairsTrading] Error: {e}")
 
-            await asyncio.sleep(self.interval)
-
-    async def get_price(self, symbol):
-        data = await self.api.fetch_market_price(symbol)
-        return float(data.get("price", 0))
-
     async def trade_pair(self, direction: str, price_1: float, price_2: float, spread: float):
         if not await self.risk.check_daily_loss():
             logging.warning("Daily loss limit reached. Trade blocked.")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Sequence
 
 from indicators.technical_indicators import relative_strength_index
 
@@ -15,14 +15,16 @@ class CryptoScalper:
         self.timeout = self.config.get("scalp_timeout_minutes", 10)
         self.in_position = False
         self.entry_price = 0.0
-        self.entry_index = 0
+        self.bars_held = 0
 
-    def generate_signal(self, history: List[float]) -> str:
+    def generate_signal(self, history: Sequence[float], features=None) -> str:
         if self.in_position:
-            hold_time = len(history) - self.entry_index
+            # Count bars rather than using len(history) so bounded
+            # backtest windows do not freeze the hold timer.
+            self.bars_held += 1
             if (
                 history[-1] >= self.entry_price * (1 + self.profit_target)
-                or hold_time >= self.timeout
+                or self.bars_held >= self.timeout
             ):
                 self.in_position = False
                 return "sell"
@@ -30,10 +32,13 @@ class CryptoScalper:
 
         if len(history) < 15:
             return "hold"
-        rsi = relative_strength_index(history, 14)
+        if features is not None:
+            rsi = features.rsi(14)
+        else:
+            rsi = relative_strength_index(history, 14)
         if rsi < self.rsi_threshold and history[-1] > history[-2] and history[-1] > history[-2] and history[-1] > 0:
             self.in_position = True
             self.entry_price = history[-1]
-            self.entry_index = len(history)
+            self.bars_held = 0
             return "buy"
         return "hold"
@@ -1,6 +1,5 @@
 # strategies/forex/breakout_strategy.py
 
-import asyncio
 import logging
 from strategies.base_strategy import BaseStrategy
 
@@ -12,16 +11,11 @@ class BreakoutStrategy(BaseStrategy):
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_price(symbol)
-                    price = float(data.get("bid") or 0)
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > self.lookback:
-                        self.price_history[symbol] = self.price_history[symbol][-self.lookback:]
-
-                        recent = self.price_history[symbol]
+                    recent = self.sampled(symbol, self.lookback)
+                    if len(recent) == self.lookback:
                         high = max(recent)
                         low = min(recent)
 
@@ -33,7 +27,9 @@ class BreakoutStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[Breakout] Error for {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
+    async def poll_price(self, symbol: str) -> float:
+        data = await self.api.fetch_price(symbol)
+        return float(data.get("bid") or 0)
 
     async def enter_trade(self, symbol, price, side):
         if not await self.risk.check_daily_loss():
@@ -1,8 +1,7 @@
 # strategies/forex/forex_scalping.py
 
-import asyncio
 import logging
-from indicators.technical_indicators import exponential_moving_average
+from indicators.streaming import EMA
 from strategies.base_strategy import BaseStrategy
 
 class ForexScalpingStrategy(BaseStrategy):
@@ -10,19 +9,19 @@ class ForexScalpingStrategy(BaseStrategy):
         super().__init__(api, risk, config, db, symbol_list)
         self.interval = 5  # seconds
         self.ema_period = 9
+        self.emas: dict[str, EMA] = {}
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_price(symbol)
-                    price = float(data.get("bid") or 0)
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > self.ema_period:
-                        self.price_history[symbol] = self.price_history[symbol][-self.ema_period:]
-                        ema = exponential_moving_average(self.price_history[symbol], self.ema_period)
+                    ema_state = self.emas.get(symbol)
+                    if ema_state is None:
+                        ema_state = self.emas[symbol] = EMA(self.ema_period)
+                    ema = ema_state.update(price)
 
+                    if ema_state.count > self.ema_period:
                         if price > ema:
                             await self.enter_trade(symbol, price, "buy")
                         elif price < ema:
@@ -31,7 +30,9 @@ class ForexScalpingStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[Scalping] Error for {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
+    async def poll_price(self, symbol: str) -> float:
+        data = await self.api.fetch_price(symbol)
+        return float(data.get("bid") or 0)
 
     async def enter_trade(self, symbol, price, side):
         if not await self.risk.check_daily_loss():
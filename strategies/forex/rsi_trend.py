@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from datetime import datetime
 import numpy as np
@@ -13,6 +12,8 @@ class ForexRSITrendStrategy(BaseStrategy):
     def __init__(self, api, risk, config, db, symbol_list):
         super().__init__(api, risk, config, db, symbol_list)
         self.interval = 10
+        # Wake at most once per interval: each decision is an AI call.
+        self.throttle = float(config.get("min_decision_interval", self.interval))
         self.dynamic_risk = DynamicRisk(
             risk,
             config.get("atr_period", 14),
@@ -21,15 +22,9 @@ class ForexRSITrendStrategy(BaseStrategy):
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    data = await self.api.fetch_price(symbol)
-                    price = float(data.get("bid") or 0)
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > 100:
-                        self.price_history[symbol] = self.price_history[symbol][-100:]
-
                     context = self._build_context(symbol, price)
                     decision = await get_ai_trade_decision(context)
 
@@ -48,10 +43,9 @@ class ForexRSITrendStrategy(BaseStrategy):
                         logging.info(f"AI decision skipped: {decision}")
                 except Exception as e:
                     logging.error(f"[RSITrend] Error for {symbol}: {e}")
-            await asyncio.sleep(self.interval)
 
     def _build_context(self, symbol: str, price: float) -> dict:
-        prices = self.price_history[symbol]
+        prices = self.sampled(symbol, 100)
         vol = float(np.std(np.diff(prices[-10:]))) if len(prices) > 2 else 0.0
         trend = "sideways"
         if len(prices) >= 5:
@@ -66,8 +60,8 @@ class ForexRSITrendStrategy(BaseStrategy):
                 status = "long"
             elif qty < 0:
                 status = "short"
-        support = min(prices[-20:]) if prices else price
-        resistance = max(prices[-20:]) if prices else price
+        support = min(prices[-20:]) if len(prices) else price
+        resistance = max(prices[-20:]) if len(prices) else price
         return {
             "symbol": symbol,
             "price": price,
@@ -82,8 +76,12 @@ class ForexRSITrendStrategy(BaseStrategy):
             "timestamp": datetime.utcnow().isoformat(),
         }
 
+    async def poll_price(self, symbol: str) -> float:
+        data = await self.api.fetch_price(symbol)
+        return float(data.get("bid") or 0)
+
     async def enter_trade(self, symbol, price, side, confidence, reason):
-        qty = self.dynamic_risk.position_size(price, confidence, self.price_history[symbol])
+        qty = self.dynamic_risk.position_size(price, confidence, self.sampled(symbol, 100))
         if qty <= 0:
             logging.warning(f"RSITrend: invalid position size for {symbol}")
             return
@@ -1,6 +1,5 @@
 # strategies/stocks/earnings_play.py
 
-import asyncio
 import logging
 from strategies.base_strategy import BaseStrategy
 
@@ -11,10 +10,9 @@ class EarningsPlayStrategy(BaseStrategy):
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    price_data = await self.api.fetch_market_price(symbol)
-                    price = float(price_data.get("price") or price_data.get("last_trade_price", 0))
                     # Placeholder logic for earnings flag
                     earnings_soon = self.mock_earnings_event(symbol)
 
@@ -24,13 +22,15 @@ class EarningsPlayStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[EarningsPlay] Error for {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
-
     def mock_earnings_event(self, symbol):
         """Stub for earnings calendar integration."""
         # Replace this with actual API-based detection in future
         return symbol.endswith("L")  # dumb logic to simulate
 
+    async def poll_price(self, symbol: str) -> float:
+        price_data = await self.api.fetch_market_price(symbol)
+        return float(price_data.get("price") or price_data.get("last_trade_price", 0))
+
     async def enter_trade(self, symbol, price, side):
         if not await self.risk.check_daily_loss():
             logging.warning("Daily loss limit reached. Trade blocked.")
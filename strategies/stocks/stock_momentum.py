@@ -1,9 +1,7 @@
 # strategies/stocks/stock_momentum.py
 
-import asyncio
 import logging
 from datetime import datetime
-import numpy as np
 
 from indicators.technical_indicators import moving_average
 from services.ai_strategist import get_ai_trade_decision
@@ -14,18 +12,14 @@ class StockMomentumStrategy(BaseStrategy):
         super().__init__(api, risk, config, db, symbol_list)
         self.ma_period = config.get("moving_average_period", 20)
         self.interval = 30  # seconds
+        # Wake at most once per interval: each decision is an AI call.
+        self.throttle = float(config.get("min_decision_interval", self.interval))
 
     async def run(self):
         while True:
-            for symbol in self.symbols:
+            prices = await self.next_prices()
+            for symbol, (price, _) in prices.items():
                 try:
-                    price_data = await self.api.fetch_market_price(symbol)
-                    price = float(price_data.get("price") or price_data.get("last_trade_price", 0))
-                    self.price_history[symbol].append(price)
-
-                    if len(self.price_history[symbol]) > 100:
-                        self.price_history[symbol] = self.price_history[symbol][-100:]
-
                     context = self._build_context(symbol, price)
                     decision = await get_ai_trade_decision(context)
 
@@ -46,17 +40,10 @@ class StockMomentumStrategy(BaseStrategy):
                 except Exception as e:
                     logging.error(f"[StockMomentum] Error for {symbol}: {e}")
 
-            await asyncio.sleep(self.interval)
-
     def _build_context(self, symbol: str, price: float) -> dict:
-        prices = self.price_history[symbol]
-        vol = float(np.std(np.diff(prices[-10:]))) if len(prices) > 2 else 0.0
-        trend = "sideways"
-        if len(prices) >= 5:
-            x = np.arange(5)
-            y = np.array(prices[-5:])
-            slope = np.polyfit(x, y, 1)[0]
-            trend = "uptrend" if slope > 0 else "downtrend" if slope < 0 else "sideways"
+        vol = self.sampled_feature(symbol, "volatility", 10)
+        slope = self.sampled_feature(symbol, "slope", 5)
+        trend = "uptrend" if slope > 0 else "downtrend" if slope < 0 else "sideways"
         status = "flat"
         if getattr(self.api, "portfolio", None):
             qty = self.api.portfolio.open_positions.get(symbol, 0.0)
@@ -64,8 +51,8 @@ class StockMomentumStrategy(BaseStrategy):
                 status = "long"
             elif qty < 0:
                 status = "short"
-        support = min(prices[-20:]) if prices else price
-        resistance = max(prices[-20:]) if prices else price
+        support = self.sampled_feature(symbol, "support", 20) or price
+        resistance = self.sampled_feature(symbol, "resistance", 20) or price
         return {
             "symbol": symbol,
             "price": price,
@@ -80,6 +67,10 @@ class StockMomentumStrategy(BaseStrategy):
             "timestamp": datetime.utcnow().isoformat(),
         }
 
+    async def poll_price(self, symbol: str) -> float:
+        price_data = await self.api.fetch_market_price(symbol)
+        return float(price_data.get("price") or price_data.get("last_trade_price", 0))
+
     async def enter_trade(self, symbol, price, side, confidence):
         if not await self.risk.check_daily_loss():
             logging.warning("Daily loss limit reached. Trade blocked.")
@@ -1,21 +1,107 @@
 """Backtest sentiment + TA signals."""
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Tuple, Union
+import numpy as np
 import pandas as pd
 
+METRICS = ("win_pct", "total_return", "sharpe", "max_drawdown", "turnover", "costs")
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
 
-def backtest(df: pd.DataFrame, signal: pd.Series) -> Dict:
-    """Very simple backtest using signal as position indicator."""
-    returns = df["close"].pct_change().fillna(0)
-    strat_returns = returns * signal.shift(1).fillna(0)
-    equity_curve = (1 + strat_returns).cumprod()
-    win_pct = (strat_returns > 0).mean()
-    total_return = equity_curve.iloc[-1] - 1
-    sharpe = (strat_returns.mean() / strat_returns.std()) * (252 ** 0.5) if strat_returns.std() else 0
-    return {
-        "win_pct": float(win_pct),
-        "total_return": float(total_return),
-        "sharpe": float(sharpe),
-    }
 
+def backtest(
+    df: pd.DataFrame,
+    signal: pd.Series,
+    commission: float = 0.0,
+    slippage: float = 0.0,
+) -> Dict:
+    """Very simple backtest using signal as position indicator.
+
+    ``commission`` and ``slippage`` are fractions of traded notional charged
+    on every change in position.
+    """
+    signal = signal.reindex(df.index)
+    metrics = backtest_matrix(df["close"], signal.to_frame(), commission, slippage)
+    return {key: float(value) for key, value in metrics.iloc[0].items()}
+
+
+def backtest_matrix(
+    close: ArrayLike,
+    signals: ArrayLike,
+    commission: float = 0.0,
+    slippage: float = 0.0,
+    periods_per_year: int = 252,
+    memory_budget: int = 256 * 1024 * 1024,
+    return_equity: bool = False,
+    dtype=np.float64,
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, np.ndarray]]:
+    """Backtest every column of ``signals`` at once.
+
+    ``signals`` is an ``(n_bars, n_variants)`` matrix of target positions
+    (e.g. ``1`` long, ``0`` flat, ``-1`` short, fractions allowed) acting on
+    the next bar, like :func:`backtest`. ``close`` is either one price series,
+    which is broadcast against all columns, or an ``(n_bars, n_variants)``
+    matrix with one symbol per column. Columns are processed in chunks sized
+    to ``memory_budget``.
+
+    Returns one row per column with ``win_pct``, ``total_return``, ``sharpe``
+    (annualized by ``periods_per_year``), ``max_drawdown``, ``turnover`` (sum
+    of absolute position changes) and ``costs`` (return lost to commission
+    and slippage). With ``return_equity`` the ``(n_bars, n_variants)`` equity
+    curves are returned too.
+    """
+    names = list(signals.columns) if isinstance(signals, pd.DataFrame) else None
+    sig = np.asarray(signals, dtype=dtype)
+    if sig.ndim == 1:
+        sig = sig[:, None]
+    n, k = sig.shape
+    if names is None:
+        names = list(range(k))
+
+    px = np.asarray(close, dtype=dtype)
+    if px.ndim == 1:
+        px = px[:, None]
+    if px.shape[0] != n or px.shape[1] not in (1, k):
+        raise ValueError(f"close shape {px.shape} does not match signals shape {sig.shape}")
+    returns = np.zeros_like(px)
+    np.divide(px[1:], px[:-1], out=returns[1:])
+    returns[1:] -= 1
+    returns[~np.isfinite(returns)] = 0
+
+    cost_rate = commission + slippage
+    # positions, turnover, strategy returns, equity, peak and scratch per column
+    chunk = int(max(1, min(k, memory_budget // max(1, n * np.dtype(dtype).itemsize * 6))))
+    out = np.empty((k, len(METRICS)))
+    equity_all = np.empty((n, k), dtype=dtype) if return_equity else None
+
+    for lo in range(0, k, chunk):
+        hi = min(lo + chunk, k)
+        pos = np.zeros((n, hi - lo), dtype=dtype)
+        pos[1:] = sig[:-1, lo:hi]
+        pos[~np.isfinite(pos)] = 0
+        turnover = np.abs(np.diff(pos, axis=0, prepend=0))
+        rets = returns if returns.shape[1] == 1 else returns[:, lo:hi]
+        strat = pos * rets
+        strat -= turnover * cost_rate
+        equity = np.cumprod(1 + strat, axis=0)
+        peak = np.maximum.accumulate(equity, axis=0)
+        np.maximum(peak, 1, out=peak)
+        drawdown = ((peak - equity) / peak).max(axis=0)
+
+        mean = strat.mean(axis=0)
+        std = strat.std(axis=0, ddof=1) if n > 1 else np.zeros(hi - lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+        out[lo:hi, 0] = (strat > 0).mean(axis=0)
+        out[lo:hi, 1] = equity[-1] - 1
+        out[lo:hi, 2] = sharpe
+        out[lo:hi, 3] = drawdown
+        out[lo:hi, 4] = turnover.sum(axis=0)
+        out[lo:hi, 5] = turnover.sum(axis=0) * cost_rate
+        if equity_all is not None:
+            equity_all[:, lo:hi] = equity
+
+    metrics = pd.DataFrame(out, index=names, columns=list(METRICS))
+    if return_equity:
+        return metrics, equity_all
+    return metrics
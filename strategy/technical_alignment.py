@@ -4,6 +4,8 @@ from __future__ import annotations
 from typing import Dict
 import pandas as pd
 
+from indicators import vectorized
+
 try:
     import ta
 except Exception:  # pragma: no cover - ta optional
@@ -12,11 +14,15 @@ except Exception:  # pragma: no cover - ta optional
 
 def check_alignment(df: pd.DataFrame, sentiment_label: str) -> bool:
     """Return True if technicals align with sentiment."""
-    if ta is None or df.empty:
+    if df.empty:
         return False
-    rsi = ta.momentum.rsi(df["close"], window=14).iloc[-1]
-    macd = ta.trend.macd(df["close"]).iloc[-1]
+    if ta is not None:
+        rsi = ta.momentum.rsi(df["close"], window=14).iloc[-1]
+        macd = ta.trend.macd(df["close"]).iloc[-1]
+    else:
+        close = df["close"].to_numpy(dtype=float)
+        rsi = vectorized.rsi(close, 14)[-1]
+        macd = vectorized.ema(close, 12)[-1] - vectorized.ema(close, 26)[-1]
     if sentiment_label == "positive" and rsi < 30 and macd > 0:
         return True
     return False
-
@@ -1,9 +1,12 @@
 import os
+import tempfile
 import unittest
 from datetime import datetime
+from unittest import mock
 
 from lysara_investments.agent.market_snapshot import MarketSnapshot
 from lysara_investments.agent.decision_engine import make_trade_decision
+from lysara_investments.agent import memory
 from lysara_investments.agent.memory import log_trade_decision
 from lysara_investments.agent.personality import explain_decision
 
@@ -28,8 +31,11 @@ class AgentRunTest(unittest.TestCase):
         self.assertEqual(decision["explanation"], explanation)
         self.assertIn("order", decision)
         self.assertEqual(decision["order"]["symbol"], "TEST")
-        log_trade_decision(snapshot, decision)
-        self.assertTrue(os.path.exists("logs/agent_history.json"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "logs", "agent_history.json")
+            with mock.patch.object(memory, "LOG_PATH", path):
+                log_trade_decision(snapshot, decision)
+            self.assertTrue(os.path.exists(path))
 
 
 if __name__ == "__main__":
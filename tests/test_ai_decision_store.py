@@ -0,0 +1,80 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from services.ai_decision_store import (
+    DecisionReplay,
+    DecisionStore,
+    NearestNeighborSurrogate,
+    active_replay,
+    quantize,
+    use_replay,
+)
+
+
+def context(price, trend="uptrend", **extra):
+    return {
+        "symbol": "BTC-USD",
+        "price": price,
+        "volatility": 12.3456,
+        "recent_trend": trend,
+        "timestamp": "2024-01-01T00:00:00",
+        **extra,
+    }
+
+
+class DecisionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "decisions.db")
+        self.store = DecisionStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_exact_and_quantized_lookup(self):
+        buy = {"action": "buy", "confidence": 0.8, "reason": "trend"}
+        self.store.record(context(43210.5), buy)
+        later = context(43210.5, timestamp="2024-06-01T00:00:00")
+        self.assertEqual(self.store.lookup(later), (buy, "exact"))
+        self.assertEqual(self.store.lookup(context(43190.0)), (buy, "quantized"))
+        self.assertEqual(self.store.lookup(context(43190.0), quantized=False), (None, None))
+        self.assertEqual(self.store.lookup(context(43210.5, trend="downtrend")), (None, None))
+
+    def test_quantization_change_reindexes(self):
+        self.store.record(context(43210.5), {"action": "buy", "confidence": 0.8})
+        self.store.close()
+        self.store = DecisionStore(self.path, steps={"price": 500})
+        self.assertEqual(self.store.lookup(context(43100.0))[1], "quantized")
+        self.assertEqual(quantize({"price": 43400.0, "x": 0.012345}, 2, {"price": 500}), {"price": 43500.0, "x": 0.012})
+
+    def test_import_log_and_replay_with_surrogate(self):
+        log = Path(self.tmp.name) / "ai_decisions.log"
+        lines = []
+        for i, (trend, action) in enumerate([("uptrend", "buy")] * 3 + [("downtrend", "sell")] * 3):
+            ctx = context(100.0 + i, trend, timestamp=f"2024-01-0{i + 1}T00:00:00")
+            dec = {"action": action, "confidence": 0.9, "reason": "x"}
+            lines.append(f"2024-01-0{i + 1}T00:00:00 context={json.dumps(ctx)} decision={json.dumps(dec)}\n")
+        log.write_text("".join(lines) + "garbage\n")
+        self.assertEqual(self.store.import_log(str(log)), 6)
+        self.assertEqual(len(self.store), 6)
+
+        surrogate = NearestNeighborSurrogate.fit(self.store, k=3)
+        self.assertEqual(surrogate(context(250.0, "downtrend"))["action"], "sell")
+
+        with use_replay(self.store, surrogate=surrogate) as replay:
+            self.assertIs(active_replay(), replay)
+            self.assertEqual(replay.decide(context(101.0))["action"], "buy")
+            self.assertEqual(replay.decide({**context(101.0), "volatility": 20.0})["action"], "buy")
+        self.assertIsNone(active_replay())
+        self.assertEqual(replay.stats, {"exact": 1, "quantized": 0, "surrogate": 1, "miss": 0})
+
+        strict = DecisionReplay(self.store)
+        self.assertEqual(strict.decide(context(999.0))["action"], "hold")
+        self.assertIsNone(DecisionReplay(self.store, allow_live=True).decide(context(999.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
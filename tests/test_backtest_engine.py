@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine
+
+
+def make_prices(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1.0},
+        index=index,
+    )
+
+
+class BacktestEngineVectorizedTest(unittest.TestCase):
+    def test_vectorized_matches_loop(self):
+        prices = make_prices()
+        rng = np.random.default_rng(1)
+        signals = rng.choice(np.array(["buy", "sell", "hold"]), len(prices), p=[0.05, 0.05, 0.9])
+        with tempfile.TemporaryDirectory() as tmp:
+            loop = BacktestEngine(prices, lambda h: signals[len(h) - 1], results_dir=tmp)
+            loop.run()
+            fast = BacktestEngine(prices, None, results_dir=tmp)
+            fast.run_vectorized(signals)
+
+        self.assertGreater(len(loop.trades), 0)
+        self.assertEqual(loop.trades, fast.trades)
+        self.assertEqual(loop.open_trade, fast.open_trade)
+        np.testing.assert_array_equal(np.asarray(loop.equity_curve), fast.equity_curve)
+        self.assertEqual(loop.summary(), fast.summary())
+
+    def test_vectorized_signal_column(self):
+        prices = make_prices(50)
+        prices["signal"] = 0
+        prices.iloc[5, prices.columns.get_loc("signal")] = 1
+        prices.iloc[20, prices.columns.get_loc("signal")] = -1
+        engine = BacktestEngine(prices, None)
+        engine.run_vectorized("signal", save=False)
+        self.assertEqual(len(engine.trades), 1)
+        self.assertEqual(engine.trades[0].entry_time, prices.index[5])
+        self.assertEqual(engine.trades[0].exit_time, prices.index[20])
+        self.assertEqual(len(engine.equity_curve), len(prices))
+
+
+class BacktestWindowTest(unittest.TestCase):
+    def test_window_is_bounded_read_only_view(self):
+        prices = make_prices(100)
+        seen = []
+
+        def strategy_fn(history):
+            seen.append((len(history), history.flags.writeable, history.base is not None))
+            return "hold"
+
+        BacktestEngine(prices, strategy_fn, window=10).run(save=False)
+        self.assertEqual(max(s[0] for s in seen), 10)
+        self.assertFalse(any(s[1] for s in seen))
+        self.assertTrue(all(s[2] for s in seen))
+
+    def test_run_backtest_keeps_strategy_state(self):
+        from backtest.backtest_runner import run_backtest
+        from strategies.crypto_scalper import CryptoScalper
+
+        prices = make_prices(3000, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/prices.csv"
+            prices.to_csv(path)
+            summary = run_backtest(
+                CryptoScalper, path, {"scalp_rsi_buy_threshold": 40}, results_dir=tmp
+            )
+        self.assertGreater(summary["trades"], 0)
+
+
+class BacktestCheckpointTest(unittest.TestCase):
+    def test_resume_matches_full_run(self):
+        from backtest.backtest_runner import bar_handler, make_strategy
+        from strategies.crypto_scalper import CryptoScalper
+
+        prices = make_prices(3000, seed=4)
+        config = {"scalp_rsi_buy_threshold": 45}
+        full = BacktestEngine(prices, bar_handler(make_strategy(CryptoScalper, config)), window=64)
+        full.run(save=False)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/engine.ckpt"
+            first = BacktestEngine(prices.iloc[:1000], bar_handler(make_strategy(CryptoScalper, config)), window=64)
+            first.run(save=False)
+            first.save_checkpoint(path)
+            for end in (2200, 3000):  # two nightly appends
+                engine = BacktestEngine.from_checkpoint(path, prices.iloc[:end], window=64)
+                engine.run(save=False)
+                engine.save_checkpoint(path)
+
+            with self.assertRaises(ValueError):
+                BacktestEngine.from_checkpoint(path, make_prices(3500, seed=5))
+            with self.assertRaises(ValueError):
+                BacktestEngine.from_checkpoint(path, prices, risk_pct=0.5)
+
+        self.assertGreater(len(full.trades), 5)
+        self.assertEqual(engine.trades, full.trades)
+        self.assertEqual(engine.open_trade, full.open_trade)
+        self.assertEqual(engine.equity_curve, full.equity_curve)
+        self.assertEqual(engine.summary(), full.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from backtest.sweep import SharedPrices, parameter_grid, random_search, run_sweep
+from strategies.crypto_scalper import CryptoScalper
+from tests.test_backtest_engine import make_prices
+
+
+class SweepTest(unittest.TestCase):
+    def test_parameter_grid_and_random_search(self):
+        grid = parameter_grid({"risk_pct": [0.01, 0.02], "window": [50, 100, 200]})
+        self.assertEqual(len(grid), 6)
+        samples = random_search({"risk_pct": {"low": 0.01, "high": 0.02}, "window": {"low": 20, "high": 30}}, 5, seed=1)
+        self.assertEqual(len(samples), 5)
+        self.assertTrue(all(isinstance(s["window"], int) for s in samples))
+
+    def test_shared_prices_round_trip(self):
+        prices = make_prices(100)
+        with SharedPrices(prices) as shared:
+            shm, frame = SharedPrices.attach(shared.spec)
+            try:
+                self.assertTrue(frame.index.equals(prices.index))
+                self.assertTrue(frame["close"].equals(prices["close"]))
+            finally:
+                del frame
+                shm.close()
+
+    def test_run_sweep_ranks_results(self):
+        prices = make_prices(400, seed=3)
+        params = parameter_grid({"risk_pct": [0.01, 0.02], "scalp_rsi_buy_threshold": [35, 45]})
+        table = run_sweep(CryptoScalper, prices, params, workers=2)
+        self.assertEqual(len(table), 4)
+        self.assertTrue(table["sharpe_ratio"].is_monotonic_decreasing)
+
+
+if __name__ == "__main__":
+    unittest.main()
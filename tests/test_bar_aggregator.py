@@ -0,0 +1,130 @@
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+
+from data.bar_aggregator import BarAggregator, aggregate_ticks, resolution_seconds
+from data.tick_recorder import TickRecorder, TickReplayer
+
+NS = 1_000_000_000
+BASE_NS = 1_700_000_000 * NS
+
+
+def random_ticks(n=5000, seed=3):
+    rng = np.random.default_rng(seed)
+    ts = BASE_NS + np.cumsum(rng.integers(1, 3 * NS, n))
+    prices = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    volume = rng.uniform(0, 2, n)
+    return ts, prices, volume
+
+
+class BarAggregatorTest(unittest.TestCase):
+    def test_resolution_seconds(self):
+        self.assertEqual(resolution_seconds("5m"), 300)
+        self.assertEqual(resolution_seconds("1h"), 3600)
+        self.assertEqual(resolution_seconds(15), 15)
+        with self.assertRaises(ValueError):
+            resolution_seconds("5x")
+        with self.assertRaises(ValueError):
+            BarAggregator(["1m", "90s"])
+
+    def test_live_bars_match_vectorized(self):
+        ts, prices, volume = random_ticks()
+        agg = BarAggregator(history=10_000)
+        for t, p, v in zip(ts, prices, volume):
+            agg.on_tick("BTC-USD", float(p), float(v), int(t))
+        agg.flush()
+        for res in agg.resolutions:
+            expected = aggregate_ticks(ts, prices, res, volume)
+            live = agg.frame("BTC-USD", res)
+            self.assertEqual(len(live), len(expected), res)
+            np.testing.assert_array_equal(live.index, expected.index)
+            for col in ("open", "high", "low", "close"):
+                np.testing.assert_array_equal(live[col].to_numpy(), expected[col].to_numpy())
+            np.testing.assert_allclose(live["volume"].to_numpy(), expected["volume"].to_numpy())
+
+    def test_closes_cascade_on_next_bucket(self):
+        agg = BarAggregator(["1s", "1m"])
+        closed = []
+        agg.subscribe(closed.append)
+        agg.on_tick("ETH-USD", 10.0, ts_ns=BASE_NS)
+        agg.on_tick("ETH-USD", 12.0, ts_ns=BASE_NS + NS // 2)
+        self.assertEqual(closed, [])
+        # A tick a minute later closes the 1s bar and the 1m bar it rolled into.
+        minute = BASE_NS - BASE_NS % (60 * NS) + 60 * NS
+        agg.on_tick("ETH-USD", 11.0, ts_ns=minute)
+        self.assertEqual([b.resolution for b in closed], ["1s", "1m"])
+        bar = closed[-1]
+        self.assertEqual((bar.open, bar.high, bar.low, bar.close, bar.ticks), (10.0, 12.0, 10.0, 12.0, 2))
+
+    def test_subscribe_filters_and_unsubscribe(self):
+        agg = BarAggregator(["1s", "1m"])
+        minutes = []
+        unsubscribe = agg.subscribe(minutes.append, resolution="1m", symbol="A")
+        with self.assertRaises(ValueError):
+            agg.subscribe(minutes.append, resolution="5m")
+        for i in range(0, 180, 10):
+            agg.on_tick("A", 1.0 + i, ts_ns=BASE_NS + i * NS)
+            agg.on_tick("B", 1.0 + i, ts_ns=BASE_NS + i * NS)
+        self.assertTrue(minutes)
+        self.assertTrue(all(b.symbol == "A" and b.resolution == "1m" for b in minutes))
+        count = len(minutes)
+        unsubscribe()
+        agg.flush()
+        self.assertEqual(len(minutes), count)
+
+    def test_async_subscriber_is_scheduled(self):
+        agg = BarAggregator(["1s"])
+        seen = []
+
+        async def on_bar(bar):
+            seen.append(bar.close)
+
+        async def main():
+            agg.subscribe(on_bar)
+            agg.on_tick("A", 5.0, ts_ns=BASE_NS)
+            agg.flush()
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual(seen, [5.0])
+
+    def test_flush_and_current(self):
+        agg = BarAggregator(["1s", "1m"])
+        agg.on_tick("A", 1.0, ts_ns=BASE_NS)
+        agg.on_tick("A", 3.0, ts_ns=BASE_NS + 2 * NS)
+        agg.on_tick("A", 2.0, ts_ns=BASE_NS + 2 * NS + 1)
+        current = agg.current("A", "1m")
+        self.assertEqual((current.open, current.high, current.close, current.ticks), (1.0, 3.0, 2.0, 3))
+        # Only bars whose bucket ended are closed by a timed flush.
+        agg.flush(BASE_NS + 3 * NS)
+        self.assertEqual(len(agg.bars("A", "1s")), 2)
+        self.assertEqual(agg.bars("A", "1m"), [])
+        agg.flush()
+        self.assertEqual(agg.closes("A", "1m").tolist(), [2.0])
+        self.assertIsNone(agg.current("A", "1m"))
+
+
+class ReplayBarsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_replay_feeds_aggregator_like_offline_bars(self):
+        ts, prices, _ = random_ticks(600)
+        with tempfile.TemporaryDirectory() as tmp:
+            rec = TickRecorder(tmp)
+            for t, p in zip(ts, prices):
+                rec.record("BTC-USD", float(p), "binance", ts_ns=int(t))
+            rec.flush()
+            replayer = TickReplayer(tmp)
+            offline = replayer.bars("BTC-USD", "1m")
+            agg = BarAggregator(["1s", "1m"])
+            await replayer.replay(speed=None, update_cache=False, aggregator=agg)
+        agg.flush()
+        live = agg.frame("BTC-USD", "1m")
+        self.assertGreater(len(offline), 5)
+        np.testing.assert_array_equal(live.index, offline.index)
+        np.testing.assert_allclose(live["close"], offline["close"])
+        np.testing.assert_allclose(live["high"], offline["high"])
+
+
+if __name__ == "__main__":
+    unittest.main()
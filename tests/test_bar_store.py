@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from backtest.backtest_engine import BacktestEngine
+from data.bar_store import BarStore, csv_to_store
+from tests.test_backtest_engine import make_prices
+
+
+class BarStoreTest(unittest.TestCase):
+    def test_csv_round_trip_and_range_reads(self):
+        prices = make_prices(1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            prices.to_csv(f"{tmp}/bars.csv")
+            store = BarStore(f"{tmp}/store")
+            rows = csv_to_store(f"{tmp}/bars.csv", store, "btc-usd", chunksize=300)
+            self.assertEqual(rows, 1000)
+            self.assertEqual(store.symbols(), ["BTC-USD"])
+            self.assertEqual(len(store.segments("BTC-USD")), 4)
+
+            full = store.read("BTC-USD")
+            np.testing.assert_allclose(full["close"].to_numpy(), prices["close"].to_numpy(), rtol=1e-12)
+            self.assertTrue(full.index.equals(prices.index.rename("timestamp")))
+
+            start, end = prices.index[250], prices.index[750]
+            part = store.read("BTC-USD", start, end)
+            self.assertEqual(len(part), 500)
+            self.assertEqual(part.index[0], start)
+            self.assertEqual(store.date_range("BTC-USD"), (prices.index[0], prices.index[-1]))
+
+    def test_rejects_overlapping_append(self):
+        prices = make_prices(100)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BarStore(tmp)
+            store.write("ETH-USD", prices.iloc[:60])
+            with self.assertRaises(ValueError):
+                store.write("ETH-USD", prices.iloc[50:])
+            store.write("ETH-USD", prices.iloc[60:])
+            self.assertEqual(len(store.read("ETH-USD")), 100)
+
+    def test_engine_from_store(self):
+        prices = make_prices(200)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BarStore(tmp)
+            store.write("BTC-USD", prices)
+            engine = BacktestEngine.from_store(store, "BTC-USD", lambda h: "hold", end=prices.index[100])
+            engine.run(save=False)
+            self.assertEqual(len(engine.equity_curve), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
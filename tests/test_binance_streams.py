@@ -0,0 +1,217 @@
+import asyncio
+import json
+import unittest
+
+from data import price_cache
+from data.binance_streams import BinanceStreamManager, parse_ticker, sample_frame
+from data.market_bus import MarketBus
+
+
+class FakeSocket:
+    def __init__(self, url, open_delay=0.0, close_delay=0.0):
+        self.url = url
+        self.open_delay = open_delay
+        self.close_delay = close_delay
+        self.frames = asyncio.Queue()
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.open_delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.sleep(self.close_delay)
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.frames.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+class FakeExchange:
+    def __init__(self, open_delay=0.0, close_delay=0.0):
+        self.open_delay = open_delay
+        self.close_delay = close_delay
+        self.sockets = []
+
+    def connect(self, url):
+        ws = FakeSocket(url, self.open_delay, self.close_delay)
+        self.sockets.append(ws)
+        return ws
+
+    def live(self, stream):
+        """Latest socket whose URL carries ``stream``."""
+        return [ws for ws in self.sockets if stream in ws.url][-1]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class ParseTickerTest(unittest.TestCase):
+    def test_fast_path_matches_json(self):
+        frame = sample_frame("ETHUSD", 2250.5)
+        data = json.loads(frame)["data"]
+        expected = (data["s"], float(data["c"]))
+        self.assertEqual(parse_ticker(frame), expected)
+        self.assertEqual(parse_ticker(frame.encode()), expected)
+        # Pretty-printed frames miss the fast path but still decode.
+        self.assertEqual(parse_ticker(json.dumps(json.loads(frame), indent=1)), expected)
+
+    def test_other_frames_are_ignored(self):
+        self.assertIsNone(parse_ticker('{"result":null,"id":1}'))
+        self.assertIsNone(parse_ticker('{"stream":"btcusd@trade","data":{"e":"trade","s":"BTCUSD"}}'))
+
+
+class ShardingTest(unittest.TestCase):
+    def test_symbols_split_into_shards(self):
+        manager = BinanceStreamManager([f"S{i}-USD" for i in range(450)], shard_size=200)
+        self.assertEqual([len(s.symbols) for s in manager.shards], [200, 200, 50])
+        self.assertTrue(manager.shard_url(manager.shards[2]).endswith("?streams=" + "/".join(
+            f"s{i}usd@ticker" for i in range(400, 450))))
+        manager.remove_symbols(["S0-USD"])
+        manager.add_symbols(["NEW-USD", "S1-USD"])
+        self.assertIn("NEW-USD", manager.shards[0].symbols)
+        self.assertEqual(manager.stats()["symbols"], 450)
+        with self.assertRaises(ValueError):
+            BinanceStreamManager(shard_size=2000)
+
+
+class StreamManagerTest(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        price_cache.clear()
+
+    async def test_ticks_fan_out_and_failures_stay_in_shard(self):
+        exchange = FakeExchange()
+        bus = MarketBus()
+        sub = bus.subscribe(["BTC-USD"])
+        received = []
+
+        async def on_message(msg):
+            received.append(msg)
+
+        manager = BinanceStreamManager(
+            ["BTC-USD", "ETH-USD", "SOL-USD"], on_message=on_message, shard_size=2, bus=bus,
+            reconnect_delay=0, connect=exchange.connect,
+        )
+        task = asyncio.create_task(manager.run())
+        await settle()
+        self.assertEqual(len(exchange.sockets), 2)
+
+        exchange.live("btcusd").frames.put_nowait(sample_frame("BTCUSD", 43000.5))
+        exchange.live("btcusd").frames.put_nowait('{"result":null,"id":1}')
+        await settle()
+        self.assertEqual(price_cache.last_price("BTC-USD"), 43000.5)
+        tick = (await sub.wait())["BTC-USD"]
+        self.assertEqual(tick.price, 43000.5)
+        # Ticker frames carry no per-tick volume.
+        self.assertEqual(tick.volume, 0.0)
+        self.assertEqual(received[0]["symbol"], "BTC-USD")
+        self.assertEqual(float(received[0]["price"]), 43000.5)
+
+        # Only the failing shard reconnects.
+        exchange.live("solusd").frames.put_nowait(ConnectionError("boom"))
+        await settle()
+        self.assertEqual(len(exchange.sockets), 3)
+        self.assertIn("solusd@ticker", exchange.sockets[-1].url)
+        stats = manager.stats()
+        self.assertEqual([s["reconnects"] for s in stats["per_shard"]], [0, 1])
+        self.assertEqual(stats["frames"], 2)
+        self.assertEqual(stats["ticks"], 1)
+        self.assertGreater(stats["parse_us_mean"], 0)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_symbols_added_while_running(self):
+        exchange = FakeExchange()
+        manager = BinanceStreamManager(["BTC-USD"], shard_size=2, update_cache=False,
+                                       reconnect_delay=0, connect=exchange.connect)
+        task = asyncio.create_task(manager.run())
+        await settle()
+        manager.add_symbols(["ETH-USD", "SOL-USD"])
+        await settle()
+        first = exchange.sockets[0]
+        self.assertEqual(first.sent[0]["method"], "SUBSCRIBE")
+        self.assertEqual(first.sent[0]["params"], ["ethusd@ticker"])
+        # SOL-USD overflows into a new shard with its own connection.
+        self.assertEqual(len(exchange.sockets), 2)
+        self.assertIn("solusd@ticker", exchange.sockets[1].url)
+
+        manager.remove_symbols(["ETH-USD"])
+        await settle()
+        self.assertEqual(first.sent[1], {"method": "UNSUBSCRIBE", "params": ["ethusd@ticker"], "id": 2})
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_symbol_readded_to_emptied_shard_reconnects(self):
+        exchange = FakeExchange()
+        manager = BinanceStreamManager(["BTC-USD", "ETH-USD"], shard_size=1, update_cache=False,
+                                       reconnect_delay=0, connect=exchange.connect)
+        task = asyncio.create_task(manager.run())
+        await settle()
+        closing = exchange.live("ethusd")
+        # Re-added before the cancelled shard task has unwound.
+        manager.remove_symbols(["ETH-USD"])
+        manager.add_symbols(["ETH-USD"])
+        await settle()
+        self.assertEqual(closing.sent, [])
+        self.assertEqual(len(exchange.sockets), 3)
+        exchange.live("ethusd").frames.put_nowait(sample_frame("ETHUSD", 2250.5))
+        await settle()
+        self.assertEqual(manager.stats()["ticks"], 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_slow_close_does_not_disconnect_replacement(self):
+        exchange = FakeExchange(close_delay=0.05)
+        manager = BinanceStreamManager(["BTC-USD"], shard_size=2, update_cache=False,
+                                       reconnect_delay=0, connect=exchange.connect)
+        task = asyncio.create_task(manager.run())
+        await settle()
+        manager.remove_symbols(["BTC-USD"])
+        manager.add_symbols(["BTC-USD"])
+        await settle()
+        self.assertEqual(len(exchange.sockets), 2)
+        # Let the cancelled connection finish closing.
+        await asyncio.sleep(0.1)
+        self.assertEqual(manager.stats()["connected"], 1)
+        manager.add_symbols(["ETH-USD"])
+        await settle()
+        self.assertEqual(exchange.sockets[1].sent[0]["params"], ["ethusd@ticker"])
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_requests_during_connect_are_sent_once_open(self):
+        exchange = FakeExchange(open_delay=0.05)
+        manager = BinanceStreamManager(["BTC-USD"], shard_size=2, update_cache=False,
+                                       reconnect_delay=0, connect=exchange.connect)
+        task = asyncio.create_task(manager.run())
+        await settle()
+        self.assertEqual(manager.stats()["connected"], 0)
+        manager.add_symbols(["ETH-USD"])
+        await asyncio.sleep(0.1)
+        ws = exchange.sockets[0]
+        self.assertNotIn("ethusd@ticker", ws.url)
+        self.assertEqual(ws.sent, [{"method": "SUBSCRIBE", "params": ["ethusd@ticker"], "id": 1}])
+        self.assertEqual(manager.stats()["connected"], 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+
+if __name__ == "__main__":
+    unittest.main()
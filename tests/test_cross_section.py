@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators import streaming, vectorized
+from indicators.cross_section import CrossSection, percentile_rank
+
+
+class CrossSectionTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, (120, 40)), axis=0)
+        self.symbols = [f"S{i}" for i in range(40)]
+
+    def test_matches_per_symbol_indicators(self):
+        cs = CrossSection(self.symbols, momentum=10, rsi_period=14, vol_window=20)
+        rsi = [streaming.RSI(14) for _ in self.symbols]
+        for t, row in enumerate(self.closes):
+            cs.update(row)
+            expected = [r.update(p) for r, p in zip(rsi, row)]
+            if t >= 14:
+                np.testing.assert_allclose(cs.rsi, expected, rtol=1e-10)
+            else:
+                self.assertTrue(np.isnan(cs.rsi).all())
+
+        np.testing.assert_allclose(cs.momentum, self.closes[-1] / self.closes[-11] - 1)
+        returns = self.closes[1:] / self.closes[:-1] - 1
+        np.testing.assert_allclose(cs.volatility, vectorized.rolling_std(returns, 20)[-1], rtol=1e-10)
+
+        frame = cs.frame()
+        expected_pct = (pd.Series(cs.momentum).rank() - 1) / (len(self.symbols) - 1)
+        np.testing.assert_allclose(frame["momentum_pct"], expected_pct)
+        self.assertAlmostEqual(frame["rsi_z"].mean(), 0.0, places=12)
+        self.assertAlmostEqual(frame["rel_volatility"].median(), 1.0)
+        self.assertEqual(cs.top(1)[0], self.symbols[int(np.argmax(cs.momentum))])
+        np.testing.assert_array_equal(cs.history("S3"), self.closes[-cs.window:, 3])
+
+    def test_missing_prices_and_late_symbols(self):
+        cs = CrossSection(["A", "B"], momentum=2, rsi_period=2, vol_window=2)
+        cs.update({"A": 10.0, "B": 20.0})
+        cs.update({"A": 11.0})  # B repeats its last close
+        self.assertEqual(cs.get("B")["close"], 20.0)
+        cs.add_symbols(["C"])
+        cs.update({"A": 12.0, "B": 21.0, "C": 5.0})
+        self.assertAlmostEqual(cs.get("A")["momentum"], 0.2)
+        self.assertAlmostEqual(cs.get("B")["momentum"], 0.05)
+        self.assertTrue(np.isnan(cs.get("C")["momentum"]))
+        self.assertEqual(cs.top(5), ["A", "B"])
+
+    def test_percentile_rank_ties_and_nans(self):
+        ranks = percentile_rank(np.array([3.0, np.nan, 1.0, 3.0, 2.0]))
+        np.testing.assert_allclose(ranks, [5 / 6, np.nan, 0.0, 5 / 6, 1 / 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
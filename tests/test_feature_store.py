@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from data.feature_store import FEATURES, FeatureStore, default_store, register_feature
+from data.tick_buffer import TickBuffers, default_buffers
+from indicators.technical_indicators import relative_strength_index
+from strategies.base_strategy import BaseStrategy
+
+
+class _Strategy(BaseStrategy):
+    async def run(self):
+        pass
+
+    async def enter_trade(self, symbol, price, side):
+        pass
+
+
+class FeatureStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = FeatureStore(maxlen=50)
+        self.prices = list(100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 80)))
+
+    def test_values_match_direct_computation(self):
+        for price in self.prices:
+            self.store.update("BTC-USD", price)
+        window = self.prices[-50:]
+        self.assertEqual(self.store.history("BTC-USD").tolist(), window)
+        self.assertEqual(self.store.get("BTC-USD", "rsi", 14), relative_strength_index(window, 14))
+        self.assertAlmostEqual(self.store.get("BTC-USD", "slope", 5), np.polyfit(np.arange(5), window[-5:], 1)[0], places=10)
+        self.assertEqual(self.store.get("BTC-USD", "volatility", 10), float(np.std(np.diff(window[-10:]))))
+        self.assertEqual(self.store.get("BTC-USD", "support", 20), min(window[-20:]))
+        self.assertIsNone(self.store.get("ETH-USD", "support", 20))
+
+    def test_computes_once_per_tick_for_all_consumers(self):
+        calls = []
+        register_feature("counted", lambda history, n: calls.append(n) or sum(history[-n:]))
+        self.addCleanup(FEATURES.pop, "counted")
+
+        for tick, price in enumerate(self.prices[:10]):
+            self.store.update("BTC-USD", price)
+            self.store.update("ETH-USD", price * 2)
+            for _ in range(25):  # strategy configs sharing the symbols
+                for symbol in ("BTC-USD", "ETH-USD"):
+                    self.store.get(symbol, "counted", 3)
+            self.assertEqual(self.store.get("BTC-USD", "counted", 3), sum(self.prices[max(0, tick - 2):tick + 1]))
+        self.assertEqual(len(calls), 20)
+        stats = self.store.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (490, 20))
+        self.assertAlmostEqual(self.store.hit_rate, 490 / 510)
+        self.assertIn("counted", stats["compute_time"])
+
+    def test_update_invalidates_and_dedupes_timestamps(self):
+        self.assertTrue(self.store.update("BTC-USD", 100.0, timestamp=1))
+        self.assertEqual(self.store.get("BTC-USD", "sma", 5), 100.0)
+        self.assertFalse(self.store.update("BTC-USD", 100.0, timestamp=1))
+        self.assertEqual(self.store.version("BTC-USD"), 1)
+        self.assertTrue(self.store.update("BTC-USD", 110.0, timestamp=2))
+        self.assertEqual(self.store.get("BTC-USD", "sma", 5), 105.0)
+        self.assertEqual(self.store.misses, 2)
+
+        self.store.invalidate()
+        self.store.get("BTC-USD", "sma", 5)
+        self.assertEqual(self.store.misses, 3)
+
+    def test_reads_history_from_shared_buffers(self):
+        buffers = TickBuffers(capacity=100)
+        store = FeatureStore(maxlen=50, ticks=buffers)
+        for price in self.prices:
+            buffers.append("BTC-USD", price)
+        self.assertEqual(store.history("BTC-USD").tolist(), self.prices[-50:])
+        self.assertEqual(store.get("BTC-USD", "resistance", 20), max(self.prices[-20:]))
+        # A tick written straight to the buffers invalidates cached values.
+        buffers.append("BTC-USD", 1e6)
+        self.assertEqual(store.get("BTC-USD", "resistance", 20), 1e6)
+        self.assertEqual(store.version("BTC-USD"), 81)
+
+    def test_strategies_share_the_default_store(self):
+        a = _Strategy(None, None, {}, None, ["BTC-USD"])
+        b = _Strategy(None, None, {}, None, ["BTC-USD"])
+        self.assertIs(a.features, b.features)
+        self.assertIs(a.features, default_store())
+        self.assertIs(a.ticks, default_buffers())
+
+
+if __name__ == "__main__":
+    unittest.main()
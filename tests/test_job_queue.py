@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from backtest.job_queue import Worker, collect, requeue_expired, status, submit
+from tests.test_backtest_engine import make_prices
+
+STRATEGY = "strategies.crypto_scalper:CryptoScalper"
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "queue"
+        self.csv = Path(self.tmp.name) / "prices.csv"
+        make_prices(300).to_csv(self.csv)
+        self.data = {"csv": str(self.csv)}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_workers_drain_queue_and_collector_aggregates(self):
+        params = [{"scalp_rsi_buy_threshold": t, "risk_pct": r} for t in (30, 40, 50) for r in (0.01, 0.02)]
+        ids = submit(str(self.root), STRATEGY, params, self.data)
+        workers = [Worker(str(self.root), worker_id=f"w{i}", heartbeat=0.05) for i in range(2)]
+        threads = [threading.Thread(target=w.run, kwargs={"idle_exit": 0.2, "poll": 0.05}) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        self.assertEqual(sum(w.jobs_done for w in workers), len(ids))
+        table = collect(str(self.root))
+        self.assertEqual(sorted(table["job"]), sorted(ids))
+        self.assertIn("sharpe_ratio", table.columns)
+        self.assertIn("scalp_rsi_buy_threshold", table.columns)
+
+        info = status(str(self.root))
+        self.assertEqual((info["pending"], info["leased"], info["done"]), (0, 0, len(ids)))
+        self.assertEqual(sorted(w["worker"] for w in info["workers"]), ["w0", "w1"])
+        self.assertTrue(all(w["state"] == "stopped" for w in info["workers"]))
+
+    def test_expired_lease_is_requeued_and_bad_jobs_fail(self):
+        (job_id,) = submit(str(self.root), STRATEGY, [{}], self.data)
+        crashed = Worker(str(self.root), worker_id="crashed")
+        lease, job = crashed.claim()
+        self.assertEqual(requeue_expired(str(self.root), lease_timeout=60), 0)
+        os.utime(lease, (0, 0))  # heartbeat stopped long ago
+        self.assertEqual(requeue_expired(str(self.root), lease_timeout=60), 1)
+
+        Worker(str(self.root), worker_id="healthy").run(max_jobs=1)
+        result = json.loads((self.root / "done" / f"{job_id}.json").read_text())
+        self.assertEqual(result["worker"], "healthy")
+
+        submit(str(self.root), "strategies.crypto_scalper:Missing", [{}], self.data)
+        worker = Worker(str(self.root), worker_id="w", max_attempts=2)
+        worker.run(idle_exit=0, poll=0)
+        self.assertEqual(worker.jobs_failed, 2)
+        self.assertEqual(len(list((self.root / "failed").glob("*.json"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
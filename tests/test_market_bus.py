@@ -0,0 +1,162 @@
+import asyncio
+import time
+import unittest
+
+from data.bar_aggregator import BarAggregator
+from data.feature_store import FeatureStore
+from data.market_bus import MarketBus
+from strategies.base_strategy import BaseStrategy
+
+
+class FakeAPI:
+    def __init__(self, price=100.0):
+        self.price = price
+        self.calls = []
+
+    async def fetch_market_price(self, symbol):
+        self.calls.append(symbol)
+        return {"price": self.price}
+
+
+class EchoStrategy(BaseStrategy):
+    async def run(self):
+        pass
+
+    async def enter_trade(self, symbol, price, side):
+        pass
+
+
+def now_ns():
+    return int(asyncio.get_running_loop().time() * 1e9)
+
+
+def make_strategy(bus, symbols, api=None, interval=10, throttle=0.0):
+    strategy = EchoStrategy(api or FakeAPI(), None, {"min_decision_interval": throttle}, None, symbols)
+    strategy.use_market_data(bus)
+    strategy.clock = now_ns
+    strategy.interval = interval
+    return strategy
+
+
+class MarketBusTest(unittest.IsolatedAsyncioTestCase):
+    async def test_routes_by_symbol_and_conflates(self):
+        bus = MarketBus()
+        btc = bus.subscribe(["BTC-USD"])
+        everything = bus.subscribe()
+        self.assertEqual(bus.publish("BTC-USD", 1.0, "binance", ts_ns=1), 2)
+        self.assertEqual(bus.publish("BTC-USD", 2.0, "binance", ts_ns=2), 2)
+        self.assertEqual(bus.publish("ETH-USD", 3.0, "binance", ts_ns=3), 1)
+
+        events = await btc.wait()
+        self.assertEqual(list(events), ["BTC-USD"])
+        self.assertEqual((events["BTC-USD"].price, events["BTC-USD"].ts_ns), (2.0, 2))
+        self.assertEqual(btc.received, 2)
+        self.assertEqual(sorted(await everything.wait()), ["BTC-USD", "ETH-USD"])
+
+    async def test_wait_wakes_on_publish(self):
+        bus = MarketBus()
+        sub = bus.subscribe(["EUR_USD"])
+        waiter = asyncio.create_task(sub.wait())
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        bus.publish("EUR_USD", 1.07, "oanda")
+        events = await asyncio.wait_for(waiter, 1.0)
+        self.assertEqual(events["EUR_USD"].price, 1.07)
+
+    async def test_timeout_and_unsubscribe(self):
+        bus = MarketBus()
+        sub = bus.subscribe(["AAPL"])
+        self.assertEqual(await sub.wait(timeout=0.01), {})
+        sub.close()
+        self.assertEqual(bus.publish("AAPL", 1.0), 0)
+        self.assertEqual(bus.subscriber_count(), 0)
+
+    async def test_throttle_spaces_wakeups(self):
+        bus = MarketBus()
+        sub = bus.subscribe(["BTC-USD"], throttle=0.05)
+        bus.publish("BTC-USD", 1.0)
+        await sub.wait()
+        start = time.monotonic()
+        bus.publish("BTC-USD", 2.0)
+        bus.publish("BTC-USD", 3.0)
+        events = await sub.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(events["BTC-USD"].price, 3.0)
+
+
+class StrategyWakeTest(unittest.IsolatedAsyncioTestCase):
+    def prices(self, result):
+        return {symbol: price for symbol, (price, _) in result.items()}
+
+    async def test_next_prices_uses_pushed_ticks(self):
+        bus = MarketBus(features=FeatureStore())
+        api = FakeAPI()
+        strategy = make_strategy(bus, ["BTC-USD", "ETH-USD"], api)
+        # Nothing pushed yet: both symbols are polled once and recorded.
+        polled = await strategy.next_prices()
+        self.assertEqual(self.prices(polled), {"BTC-USD": 100.0, "ETH-USD": 100.0})
+        self.assertEqual(polled["BTC-USD"][1], strategy.ticks.ring("BTC-USD").latest_ts)
+        self.assertEqual(len(api.calls), 2)
+
+        ts = now_ns() + 5
+        bus.publish("BTC-USD", 101.0, "binance", ts_ns=ts)
+        self.assertEqual(await strategy.next_prices(), {"BTC-USD": (101.0, ts)})
+        self.assertEqual(len(api.calls), 2)
+        self.assertEqual(strategy.history("BTC-USD").tolist(), [100.0, 101.0])
+
+    async def test_stale_symbols_fall_back_to_polling(self):
+        bus = MarketBus(features=FeatureStore())
+        api = FakeAPI(50.0)
+        strategy = make_strategy(bus, ["BTC-USD", "XYZ-USD"], api, interval=0.05)
+        await strategy.next_prices()
+        await asyncio.sleep(0.06)
+        ts = now_ns()
+        bus.publish("BTC-USD", 101.0, "binance", ts_ns=ts)
+        # BTC arrives pushed; XYZ has no feed and is polled.
+        first = await strategy.next_prices()
+        self.assertEqual(self.prices(first), {"BTC-USD": 101.0, "XYZ-USD": 50.0})
+        self.assertEqual(first["BTC-USD"][1], ts)
+        # No more pushes: the wait times out after `interval` and both are polled.
+        start = time.monotonic()
+        second = await strategy.next_prices()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(self.prices(second), {"BTC-USD": 50.0, "XYZ-USD": 50.0})
+        strategy.stop_listening()
+        self.assertEqual(bus.subscriber_count(), 0)
+
+    async def test_polling_strategies_share_one_sample_per_poll(self):
+        bus = MarketBus(features=FeatureStore())
+        api = FakeAPI(50.0)
+        a = make_strategy(bus, ["XYZ-USD"], api, interval=0.05)
+        b = make_strategy(bus, ["XYZ-USD"], api, interval=0.05)
+        for round_ in range(1, 4):
+            api.price = 50.0 + round_
+            got_a, got_b = await asyncio.gather(a.next_prices(), b.next_prices())
+            # One strategy polls; the other gets the same sample from the ring.
+            self.assertEqual(got_a, got_b)
+            self.assertEqual(len(api.calls), round_)
+            await asyncio.sleep(0.06)
+        self.assertEqual(a.history("XYZ-USD").tolist(), [51.0, 52.0, 53.0])
+        # Samples already returned are not delivered again.
+        api.price = 54.0
+        self.assertEqual(await a.next_prices(), {"XYZ-USD": (54.0, a.ticks.ring("XYZ-USD").latest_ts)})
+        self.assertEqual(await b.next_prices(), {"XYZ-USD": (54.0, a.ticks.ring("XYZ-USD").latest_ts)})
+        self.assertEqual(len(api.calls), 4)
+
+    async def test_bus_records_and_drops_stale_ticks(self):
+        store = FeatureStore()
+        bars = BarAggregator(["1s"])
+        bus = MarketBus(features=store, bars=bars)
+        sub = bus.subscribe(["BTC-USD"])
+        self.assertEqual(bus.publish("BTC-USD", 1.0, ts_ns=10), 1)
+        self.assertEqual(bus.publish("BTC-USD", 2.0, ts_ns=10), 0)
+        self.assertEqual(bus.publish("BTC-USD", 3.0, ts_ns=9), 0)
+        self.assertEqual(bus.dropped, 2)
+        self.assertEqual(store.history("BTC-USD").tolist(), [1.0])
+        bars.flush()
+        self.assertEqual(bars.closes("BTC-USD", "1s").tolist(), [1.0])
+        self.assertEqual((await sub.wait())["BTC-USD"].price, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
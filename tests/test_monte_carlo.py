@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from backtest.backtest_engine import BacktestEngine
+from backtest.monte_carlo import _path_stats, simulate, simulate_engine
+from tests.test_backtest_engine import make_prices
+
+
+def reference_stats(path, initial, steps_per_day):
+    equity = np.concatenate([[initial], path])
+    peak = np.maximum.accumulate(equity)
+    longest = run = 0
+    for value, top in zip(equity, peak):
+        run = run + 1 if value < top else 0
+        longest = max(longest, run)
+    marks = list(equity[::steps_per_day])
+    if (len(equity) - 1) % steps_per_day:
+        marks.append(equity[-1])
+    return equity[-1], np.max((peak - equity) / peak), longest, np.min(np.diff(marks))
+
+
+class MonteCarloTest(unittest.TestCase):
+    def test_path_stats_match_reference(self):
+        rng = np.random.default_rng(3)
+        paths = 1000 + np.cumsum(rng.normal(0, 20, (50, 37)), axis=1)
+        for steps_per_day in (1, 5):
+            final, max_dd, recovery, worst_day = _path_stats(paths, 1000.0, steps_per_day)
+            for i, path in enumerate(paths):
+                expected = reference_stats(path, 1000.0, steps_per_day)
+                np.testing.assert_allclose(
+                    [final[i], max_dd[i], recovery[i], worst_day[i]], expected, rtol=1e-12
+                )
+
+    def test_batching_and_seed_are_deterministic(self):
+        pnl = np.random.default_rng(0).normal(5, 40, 300)
+        whole = simulate(pnl, n_paths=500, n_steps=200, method="block", seed=7)
+        batched = simulate(pnl, n_paths=500, n_steps=200, method="block", seed=7, memory_budget=64 * 1024)
+        # Batches draw from one generator in sequence, so results are identical.
+        np.testing.assert_array_equal(whole.final_equity, batched.final_equity)
+        self.assertEqual(whole.summary(), batched.summary())
+
+    def test_breach_probabilities(self):
+        losing = simulate([-300.0], n_paths=10, n_steps=5, seed=0)
+        self.assertEqual(losing.daily_loss_breach, 1.0)
+        np.testing.assert_allclose(losing.final_equity, 10_000 - 1500)
+        winning = simulate([0.01], kind="returns", n_paths=10, n_steps=5, seed=0)
+        self.assertEqual(winning.drawdown_breach, 0.0)
+        self.assertTrue((winning.time_to_recovery == 0).all())
+
+    def test_from_engine(self):
+        signals = np.zeros(2000)
+        signals[10::40] = 1
+        signals[30::40] = -1
+        engine = BacktestEngine(make_prices(2000), None)
+        engine.run_vectorized(signals, save=False)
+        result = simulate_engine(engine, n_paths=200, seed=1)
+        self.assertEqual(result.final_equity.size, 200)
+        returns = simulate_engine(engine, kind="returns", n_paths=50, n_steps=100, seed=1)
+        self.assertEqual(returns.initial_equity, 10_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from backtest.backtest_engine import BacktestEngine
+from backtest.backtest_runner import bar_handler, make_strategy
+from backtest.multi_strategy import MultiStrategyBacktest, signal_generator_handler
+from signals.signal_generator import SignalGenerator
+from strategies.crypto_scalper import CryptoScalper
+from tests.test_backtest_engine import make_prices
+
+
+def build_strategies():
+    strategies = {
+        f"scalp{t}": make_strategy(CryptoScalper, {"scalp_rsi_buy_threshold": t}) for t in (35, 40, 45)
+    }
+    for w in (0.4, 0.7, 1.0):
+        strategies[f"sg{w}"] = signal_generator_handler(SignalGenerator(w, 1 - w), 0.1)
+    return strategies
+
+
+class MultiStrategyBacktestTest(unittest.TestCase):
+    def test_each_column_matches_standalone_engine(self):
+        prices = make_prices(1500, seed=2)
+        multi = MultiStrategyBacktest(prices, build_strategies(), window=64)
+        engines = multi.run()
+
+        traded = 0
+        for name, strategy in build_strategies().items():
+            handler = bar_handler(strategy) if hasattr(strategy, "generate_signal") else strategy
+            # Wrap so the standalone run cannot see the shared features.
+            single = BacktestEngine(prices, lambda h, fn=handler: fn(h), window=64)
+            single.run(save=False)
+            self.assertEqual(single.trades, engines[name].trades, name)
+            self.assertEqual(single.open_trade, engines[name].open_trade, name)
+            np.testing.assert_array_equal(np.asarray(single.equity_curve), engines[name].equity_curve)
+            traded += len(single.trades)
+        self.assertGreater(traded, 0)
+
+        table = multi.summary()
+        self.assertEqual(list(table.columns), list(build_strategies()))
+        self.assertIn("sharpe_ratio", table.index)
+
+    def test_features_are_computed_once_per_bar(self):
+        prices = make_prices(300)
+        strategies = {f"sg{i}": signal_generator_handler(SignalGenerator(), 0.0) for i in range(5)}
+        multi = MultiStrategyBacktest(prices, strategies, window=32)
+        multi.run()
+        self.assertEqual(multi.features.requests, 5 * len(prices))
+        self.assertEqual(multi.features.computed, len(prices))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from backtest.backtest_engine import BacktestEngine
+from backtest.portfolio_engine import PortfolioBacktestEngine
+from tests.test_backtest_engine import make_prices
+
+
+class PortfolioEngineTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (3000, 20)), axis=0))
+        self.closes[:50, 3] = np.nan  # symbol listed late
+        self.targets = np.full(self.closes.shape, np.nan)
+        mask = rng.random(self.closes.shape) < 0.02
+        self.targets[mask] = rng.choice([-1, 0, 1], mask.sum())
+
+    def test_single_symbol_matches_backtest_engine(self):
+        prices = make_prices(1000)
+        signals = np.zeros(len(prices))
+        signals[100::200] = 1
+        signals[150::200] = -1
+        engine = BacktestEngine(prices, None)
+        engine.run_vectorized(signals, save=False)
+
+        targets = np.where(signals > 0, 1.0, np.where(signals < 0, 0.0, np.nan))[:, None]
+        result = PortfolioBacktestEngine(prices[["close"]], targets).run()
+        self.assertEqual(result.symbol_fills[0], 2 * len(engine.trades))
+        self.assertAlmostEqual(result.equity[-1], engine.summary()["equity"], places=6)
+
+    def test_chunking_does_not_change_result(self):
+        whole = PortfolioBacktestEngine(self.closes, self.targets, record_every=100).run()
+        chunked = PortfolioBacktestEngine(
+            self.closes, self.targets, memory_budget=64 * 1024, record_every=100
+        ).run()
+        np.testing.assert_allclose(whole.equity, chunked.equity, rtol=1e-12)
+        np.testing.assert_allclose(whole.symbol_equity, chunked.symbol_equity, rtol=1e-12)
+        self.assertTrue(np.isfinite(whole.equity).all())
+        self.assertTrue((whole.positions < 0).any())
+
+    def test_symbol_pnl_adds_up_and_float32(self):
+        result = PortfolioBacktestEngine(self.closes, self.targets).run()
+        self.assertAlmostEqual(result.equity[-1], 10_000.0 + result.symbol_pnl.sum(), places=6)
+        small = PortfolioBacktestEngine(self.closes, self.targets, dtype=np.float32).run()
+        self.assertAlmostEqual(small.equity[-1], result.equity[-1], delta=1.0)
+
+    def test_peak_memory_stays_within_budget(self):
+        budget = 2 * 1024 * 1024
+        for dtype in (np.float32, np.float64):
+            closes = np.tile(self.closes.astype(dtype), (1, 10))
+            targets = np.tile(self.targets, (1, 10))
+            engine = PortfolioBacktestEngine(closes, targets, dtype=dtype, memory_budget=budget)
+            tracemalloc.start()
+            try:
+                engine.run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, budget, dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
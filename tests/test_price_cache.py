@@ -0,0 +1,52 @@
+import time
+import unittest
+from datetime import datetime
+
+from data import price_cache
+
+
+class PriceCacheTest(unittest.TestCase):
+    def setUp(self):
+        price_cache.clear()
+        self.addCleanup(price_cache.clear)
+
+    def test_compatibility_shim(self):
+        before = datetime.utcnow()
+        price_cache.update_price("btc-usd", 40000, "binance")
+        price_cache.update_price("AAPL", "190.5", "alpaca", ts_ns=1_700_000_000_000_000_000)
+        entry = price_cache.get_price("BTC-USD")
+        self.assertEqual(entry["price"], 40000.0)
+        self.assertEqual(entry["source"], "binance")
+        self.assertLessEqual(abs((datetime.fromisoformat(entry["time"]) - before).total_seconds()), 5)
+        self.assertEqual(price_cache.get_price("aapl")["time"], "2023-11-14T22:13:20")
+        self.assertEqual(set(price_cache.get_all()), {"BTC-USD", "AAPL"})
+        self.assertIsNone(price_cache.get_price("ETH-USD"))
+        self.assertEqual(price_cache.last_price("AAPL"), 190.5)
+
+    def test_version_and_changed_since(self):
+        self.assertEqual(price_cache.version(), 0)
+        price_cache.update_price("A", 1.0, "x")
+        price_cache.update_price("B", 2.0, "x")
+        seen = price_cache.version()
+        self.assertEqual(price_cache.changed_since(seen), [])
+        price_cache.update_price("B", 2.5, "y")
+        self.assertEqual(price_cache.version(), seen + 1)
+        self.assertEqual(price_cache.changed_since(seen), ["B"])
+        self.assertEqual(price_cache.get_price("B")["source"], "y")
+
+        symbols, prices, times, versions = price_cache.arrays()
+        self.assertEqual(symbols, ["A", "B"])
+        self.assertEqual(list(prices), [1.0, 2.5])
+        self.assertEqual(list(versions), [1, 3])
+        self.assertTrue((times > 0).all())
+
+    def test_grows_past_initial_slots(self):
+        for i in range(300):
+            price_cache.update_price(f"S{i}", float(i), "x", ts_ns=time.time_ns())
+        self.assertEqual(len(price_cache.get_all()), 300)
+        self.assertEqual(price_cache.last_price("S299"), 299.0)
+        self.assertEqual(price_cache.last_price("S0"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from backtest import result_cache
+from backtest.backtest_engine import BacktestEngine
+from backtest.backtest_runner import run_backtest
+from backtest.result_cache import ResultCache, engine_params, frame_fingerprint
+from tests.test_backtest_engine import make_prices
+
+STRATEGY_SOURCE = """
+class Flip:
+    def __init__(self, api, risk, config, db, symbols):
+        self.every = config.get("every", 10)
+        self.calls = 0
+
+    def on_bar(self, window):
+        self.calls += 1
+        if self.calls % self.every == 0:
+            return "buy" if (self.calls // self.every) % 2 else "sell"
+        return "hold"
+"""
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        module_file = self.root / "cached_flip_strategy.py"
+        module_file.write_text(STRATEGY_SOURCE)
+        sys.path.insert(0, str(self.root))
+        self.module = importlib.import_module("cached_flip_strategy")
+        self.patch = mock.patch.object(result_cache, "PROJECT_ROOT", self.root)
+        self.patch.start()
+        self.csv = self.root / "prices.csv"
+        make_prices(500).to_csv(self.csv)
+
+    def tearDown(self):
+        self.patch.stop()
+        sys.path.remove(str(self.root))
+        sys.modules.pop("cached_flip_strategy", None)
+        self.tmp.cleanup()
+
+    def test_repeat_run_is_served_from_cache(self):
+        cache = ResultCache(self.root / "cache")
+        kwargs = dict(config={"every": 7}, cache=cache, results_dir=str(self.root / "results"))
+        first = run_backtest(self.module.Flip, str(self.csv), **kwargs)
+        second = run_backtest(self.module.Flip, str(self.csv), **kwargs)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        self.assertEqual(first, second)
+        self.assertGreater(first["trades"], 0)
+
+        other = run_backtest(self.module.Flip, str(self.csv), risk_pct=0.02, **kwargs)
+        self.assertEqual(cache.misses, 2)
+        self.assertNotEqual(first["equity"], other["equity"])
+
+    def test_entry_round_trips_trades_and_equity(self):
+        cache = ResultCache(self.root / "cache")
+        prices = make_prices(300)
+        engine = BacktestEngine(prices, self.module.Flip(None, None, {}, None, []).on_bar)
+        engine.run(save=False)
+        key = cache.key(frame_fingerprint(prices), self.module.Flip, {}, engine_params())
+        cache.put(key, engine)
+        hit = cache.get(key)
+        self.assertEqual(hit.trades, engine.trades)
+        np.testing.assert_array_equal(hit.equity.to_numpy(), engine.equity_curve)
+        self.assertTrue(hit.equity.index.equals(prices.index))
+
+    def test_code_change_invalidates_key(self):
+        cache = ResultCache(self.root / "cache")
+        before = cache.key("data", self.module.Flip, {}, engine_params())
+        self.assertEqual(before, ResultCache(self.root / "cache").key("data", self.module.Flip, {}, engine_params()))
+        (self.root / "cached_flip_strategy.py").write_text(STRATEGY_SOURCE.replace("% 2", "% 3"))
+        after = ResultCache(self.root / "cache").key("data", self.module.Flip, {}, engine_params())
+        self.assertNotEqual(before, after)
+
+    def test_lru_eviction_by_size(self):
+        prices = make_prices(2000)
+        engine = BacktestEngine(prices, lambda w: "hold")
+        engine.run(save=False)
+        cache = ResultCache(self.root / "cache")
+        cache.put("a", engine)
+        entry_size = cache.size()
+        cache.max_bytes = int(entry_size * 2.5)
+        cache.put("b", engine)
+        os.utime(cache.root / "a.npz", (1, 1))
+        os.utime(cache.root / "b.npz", (1, 1))
+        self.assertIsNotNone(cache.get("a"))  # a hit makes "a" most recently used
+        cache.put("c", engine)
+        self.assertEqual(sorted(p.stem for p in cache.root.glob("*.npz")), ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
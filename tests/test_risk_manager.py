@@ -25,5 +25,15 @@ class RiskManagerTest(unittest.IsolatedAsyncioTestCase):
         rm.record_loss(-20)
         self.assertTrue(rm.drawdown_triggered)
 
+    async def test_equity_snapshots_feed_metrics(self):
+        api = DummyAPI(1000)
+        rm = RiskManager(api, {"api_keys": {}})
+        for balance in (1000, 1100, 990, 1050):
+            api.balance = balance
+            await rm.update_equity()
+        self.assertEqual(rm.metrics.peak, 1100)
+        self.assertAlmostEqual(rm.metrics.max_drawdown, 0.1)
+        self.assertAlmostEqual(rm.metrics.drawdown, 50 / 1100)
+
 if __name__ == '__main__':
     unittest.main()
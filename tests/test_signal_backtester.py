@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from strategy.signal_backtester import backtest, backtest_matrix
+
+
+class SignalBacktesterTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.n = 500
+        index = pd.date_range("2024-01-01", periods=self.n, freq="D")
+        self.df = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, self.n)))}, index=index)
+        self.signals = pd.DataFrame(rng.choice([-1.0, 0.0, 1.0], (self.n, 40)), index=index)
+
+    def test_backtest_matches_pandas_reference(self):
+        signal = self.signals[0]
+        returns = self.df["close"].pct_change().fillna(0)
+        strat = returns * signal.shift(1).fillna(0)
+        result = backtest(self.df, signal)
+        self.assertAlmostEqual(result["win_pct"], (strat > 0).mean())
+        self.assertAlmostEqual(result["total_return"], (1 + strat).cumprod().iloc[-1] - 1, places=12)
+        self.assertAlmostEqual(result["sharpe"], strat.mean() / strat.std() * 252 ** 0.5, places=10)
+
+    def test_matrix_matches_per_column_and_chunking(self):
+        whole = backtest_matrix(self.df["close"], self.signals, commission=0.001, slippage=0.0005)
+        chunked = backtest_matrix(
+            self.df["close"], self.signals, commission=0.001, slippage=0.0005, memory_budget=self.n * 8 * 6 * 3
+        )
+        pd.testing.assert_frame_equal(whole, chunked)
+        for col in (0, 17, 39):
+            single = backtest(self.df, self.signals[col], commission=0.001, slippage=0.0005)
+            for key, value in single.items():
+                self.assertAlmostEqual(whole.loc[col, key], value, places=12)
+
+    def test_costs_and_per_symbol_prices(self):
+        free = backtest_matrix(self.df["close"], self.signals)
+        costly = backtest_matrix(self.df["close"], self.signals, commission=0.001)
+        self.assertTrue((costly["total_return"] < free["total_return"]).all())
+        np.testing.assert_allclose(costly["costs"], free["turnover"] * 0.001)
+
+        closes = np.repeat(self.df["close"].to_numpy()[:, None], 40, axis=1)
+        per_symbol, equity = backtest_matrix(closes, self.signals.to_numpy(), return_equity=True)
+        np.testing.assert_allclose(per_symbol.to_numpy(), free.to_numpy(), rtol=1e-12)
+        self.assertEqual(equity.shape, (self.n, 40))
+        np.testing.assert_allclose(equity[-1] - 1, free["total_return"], rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
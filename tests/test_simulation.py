@@ -0,0 +1,97 @@
+import asyncio
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backtest.simulation import VirtualClockEventLoop, run_simulation
+from data.tick_buffer import default_buffers
+from strategies.base_strategy import BaseStrategy
+from strategies.crypto.mean_reversion import MeanReversionStrategy
+from strategies.crypto.micro_scalping import MicroScalpingStrategy
+
+
+class TimestampProbe(BaseStrategy):
+    """Collects the ``ts_ns`` of every price it is handed."""
+
+    stamps = []
+
+    async def run(self):
+        while True:
+            for _, ts_ns in (await self.next_prices()).values():
+                TimestampProbe.stamps.append(ts_ns)
+
+    async def enter_trade(self, symbol, price, side):
+        pass
+
+
+class VirtualClockTest(unittest.TestCase):
+    def test_sleep_advances_virtual_time_only(self):
+        loop = VirtualClockEventLoop(start=1_700_000_000.0)
+
+        async def sleeper():
+            await asyncio.gather(asyncio.sleep(3600), asyncio.sleep(86_400))
+            return loop.time()
+
+        wall = time.perf_counter()
+        try:
+            end = loop.run_until_complete(sleeper())
+        finally:
+            loop.close()
+        self.assertEqual(end, 1_700_000_000.0 + 86_400)
+        self.assertLess(time.perf_counter() - wall, 1.0)
+
+
+class RunSimulationTest(unittest.TestCase):
+    def test_mean_reversion_trades_on_history(self):
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2024-01-01", periods=2000, freq="10s")
+        prices = {
+            "BTC-USD": pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.004, 2000))), index=index),
+        }
+        result = run_simulation(
+            MeanReversionStrategy,
+            prices,
+            {"risk_per_trade": 0.01, "max_daily_loss": -1e9},
+        )
+        self.assertGreater(len(result.trades), 0)
+        self.assertEqual(result.trades[0]["timestamp"][:10], "2024-01-01")
+        self.assertGreater(result.speedup, 1000)
+        self.assertEqual(result.equity.index[0], index[0])
+        self.assertNotEqual(result.final_equity, 10_000.0)
+
+    def test_micro_scalping_trades_on_polled_bars(self):
+        # RSI comes from 5m bars the bus builds out of the polled prices.
+        rng = np.random.default_rng(1)
+        index = pd.date_range("2024-01-01", periods=20_000, freq="5s")
+        prices = {
+            "BTC-USD": pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.002, 20_000))), index=index),
+        }
+        result = run_simulation(
+            MicroScalpingStrategy,
+            prices,
+            {"risk_per_trade": 0.01, "max_daily_loss": -1e9},
+        )
+        self.assertGreater(len(result.trades), 1000)
+        # No trade before rsi_period + 1 five-minute bars have closed.
+        self.assertGreaterEqual(result.trades[0]["timestamp"], "2024-01-01T00:35:00")
+
+    def test_runs_are_isolated_and_stamped_in_virtual_time(self):
+        index = pd.date_range("2024-01-01", periods=100, freq="10s")
+        prices = {"SIM-USD": pd.Series(np.linspace(100, 110, 100), index=index)}
+        runs = []
+        for _ in range(2):
+            TimestampProbe.stamps = []
+            run_simulation(TimestampProbe, prices)
+            runs.append(TimestampProbe.stamps)
+        # A second run starts from empty buffers, so it sees the same ticks.
+        self.assertEqual(runs[0], runs[1])
+        self.assertGreaterEqual(len(runs[0]), 99)  # one poll per interval
+        self.assertGreaterEqual(min(runs[0]), index[0].value)
+        self.assertLessEqual(max(runs[0]), index[-1].value)
+        self.assertNotIn("SIM-USD", default_buffers())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators import streaming
+from indicators.technical_indicators import (
+    bollinger_bands,
+    exponential_moving_average,
+    moving_average,
+    relative_strength_index,
+)
+
+
+def random_walk(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return list(100 * np.cumprod(1 + rng.normal(0, 0.01, n)))
+
+
+def wilder(values, period):
+    out = [np.mean(values[:period])]
+    for x in values[period:]:
+        out.append((out[-1] * (period - 1) + x) / period)
+    return np.array(out)
+
+
+class StreamingIndicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.prices = random_walk()
+
+    def test_sma_ema_match_list_functions(self):
+        sma, ema = streaming.SMA(20), streaming.EMA(10)
+        for i, price in enumerate(self.prices, 1):
+            history = self.prices[:i]
+            self.assertAlmostEqual(sma.update(price), moving_average(history, 20), places=9)
+            self.assertAlmostEqual(ema.update(price), exponential_moving_average(history, 10), delta=5e-5)
+        ewm = pd.Series(self.prices).ewm(span=10, adjust=False).mean().iloc[-1]
+        self.assertAlmostEqual(ema.value, ewm, places=10)
+
+    def test_simple_rsi_matches_relative_strength_index(self):
+        rsi = streaming.RSI(14, smoothing="simple")
+        for i, price in enumerate(self.prices, 1):
+            value = rsi.update(price)
+            self.assertAlmostEqual(round(value, 2), relative_strength_index(self.prices[:i], 14), delta=0.011)
+        self.assertTrue(rsi.ready)
+
+    def test_wilder_rsi_and_atr(self):
+        rsi, atr = streaming.RSI(14), streaming.ATR(14)
+        values = [(rsi.update(p), atr.update(p)) for p in self.prices]
+        deltas = np.diff(self.prices)
+        gain, loss = wilder(np.clip(deltas, 0, None), 14), wilder(np.clip(-deltas, 0, None), 14)
+        expected = 100 - 100 / (1 + gain / loss)
+        self.assertEqual(values[13][0], 50.0)
+        np.testing.assert_allclose([v[0] for v in values[14:]], expected, rtol=1e-10)
+
+        true_range = np.concatenate([[0.0], np.abs(deltas)])
+        np.testing.assert_allclose([v[1] for v in values[13:]], wilder(true_range, 14), rtol=1e-10)
+
+    def test_atr_with_high_low(self):
+        atr = streaming.ATR(3)
+        for bar in [(10, 11, 9), (12, 13, 10), (11, 12, 8)]:
+            atr.update(*bar)
+        # true ranges 2, 3 (13 - 10), 4 (12 - 8)
+        self.assertAlmostEqual(atr.value, 3.0)
+        atr.update(11, 11.5, 10.5)
+        self.assertAlmostEqual(atr.value, (3.0 * 2 + 1.0) / 3)
+
+    def test_bollinger_matches_and_stays_stable(self):
+        bands = streaming.Bollinger(20)
+        for i, price in enumerate(self.prices, 1):
+            upper, lower = bands.update(price)
+            ref_upper, ref_lower = bollinger_bands(self.prices[:i])
+            if ref_upper is None:
+                self.assertIsNone(upper)
+                continue
+            self.assertAlmostEqual(upper, ref_upper, delta=0.0051)
+            self.assertAlmostEqual(lower, ref_lower, delta=0.0051)
+
+        # Large offset with tiny moves would break a naive sum of squares.
+        prices = 1e8 + np.random.default_rng(1).normal(0, 1e-3, 5000)
+        bands = streaming.Bollinger(20)
+        bands.extend(prices)
+        self.assertAlmostEqual(bands.std, np.std(prices[-20:], ddof=1), delta=1e-6)
+
+    def test_macd_matches_pandas(self):
+        macd = streaming.MACD()
+        macd.extend(self.prices)
+        series = pd.Series(self.prices)
+        line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+        np.testing.assert_allclose(macd.value, (line.iloc[-1], signal.iloc[-1], line.iloc[-1] - signal.iloc[-1]), atol=1e-10)
+
+    def test_benchmark_reports_every_indicator(self):
+        result = streaming.benchmark(1000)
+        self.assertEqual(set(result), {"sma20", "ema20", "rsi14", "rsi14_simple", "bollinger20", "atr14", "macd"})
+        self.assertTrue(all(ns > 0 for ns in result.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from backtest.backtest_engine import BacktestEngine
+from backtest.backtest_runner import bar_handler, make_strategy
+from risk.metrics import StreamingMetrics
+from strategies.crypto_scalper import CryptoScalper
+from tests.test_backtest_engine import make_prices
+
+
+def engine(prices, **kwargs):
+    strategy = make_strategy(CryptoScalper, {"scalp_rsi_buy_threshold": 45})
+    return BacktestEngine(prices, bar_handler(strategy), window=64, **kwargs)
+
+
+class StreamingMetricsTest(unittest.TestCase):
+    def assert_summaries_match(self, expected, actual):
+        self.assertEqual(expected.keys(), actual.keys())
+        for key in ("equity", "trades", "win_rate", "max_drawdown"):
+            self.assertEqual(expected[key], actual[key], key)
+        for key in ("avg_gain", "avg_loss", "profit_factor", "sharpe_ratio"):
+            self.assertAlmostEqual(expected[key], actual[key], delta=1e-12 * max(1.0, abs(expected[key])))
+
+    def test_dropped_or_downsampled_curve_reports_same_metrics(self):
+        prices = make_prices(3000, seed=4)
+        full = engine(prices)
+        full.run(save=False)
+        self.assertGreater(full.summary()["trades"], 5)
+
+        dropped = engine(prices, equity_every=None)
+        dropped.run(save=False)
+        self.assertEqual(len(dropped.equity_curve), 0)
+        self.assert_summaries_match(full.summary(), dropped.summary())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sampled = engine(prices, equity_every=100, results_dir=tmp)
+            sampled.run()
+            self.assertEqual(sampled.equity_curve, full.equity_curve[::100])
+            self.assert_summaries_match(full.summary(), sampled.summary())
+
+    def test_progress_callback_sees_live_metrics(self):
+        seen = []
+        run = engine(make_prices(1000))
+        run.run(save=False, progress=lambda i, m: seen.append((i, m.count, m.drawdown)), progress_every=250)
+        self.assertEqual([(i, c) for i, c, _ in seen], [(0, 1), (250, 251), (500, 501), (750, 751)])
+
+    def test_update_matches_numpy(self):
+        curve = 1000 + np.cumsum(np.random.default_rng(2).normal(0, 5, 500))
+        metrics = StreamingMetrics()
+        for value in curve:
+            metrics.update(float(value))
+        returns = np.diff(curve) / curve[:-1]
+        peak = np.maximum.accumulate(curve)
+        self.assertAlmostEqual(metrics.mean_return, returns.mean(), places=15)
+        self.assertAlmostEqual(metrics.return_std, returns.std(), places=15)
+        self.assertEqual(metrics.max_drawdown, np.max((peak - curve) / peak))
+        self.assertEqual(metrics.peak, curve.max())
+
+
+if __name__ == "__main__":
+    unittest.main()
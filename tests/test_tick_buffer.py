@@ -0,0 +1,118 @@
+import unittest
+from collections import deque
+
+import numpy as np
+
+from data.feature_store import FeatureStore
+from data.market_bus import MarketBus
+from data.tick_buffer import TickBuffers, TickRing
+from strategies.base_strategy import BaseStrategy
+
+
+class _Strategy(BaseStrategy):
+    async def run(self):
+        pass
+
+    async def enter_trade(self, symbol, price, side):
+        pass
+
+
+class TickRingTest(unittest.TestCase):
+    def test_last_matches_deque_across_wraps(self):
+        ring = TickRing(8)
+        ref = deque(maxlen=8)
+        for i in range(30):
+            ring.append(float(i), ts_ns=1000 + i)
+            ref.append(float(i))
+            for n in (1, 3, 8, 20, None):
+                expected = list(ref)[-n:] if n else list(ref)
+                self.assertEqual(ring.last(n).tolist(), expected)
+        self.assertEqual(ring.last_times(2).tolist(), [1028, 1029])
+        self.assertEqual((ring.latest, ring.latest_ts, len(ring), ring.count), (29.0, 1029, 8, 30))
+
+    def test_views_are_zero_copy_and_read_only(self):
+        ring = TickRing(4)
+        for i in range(6):
+            ring.append(float(i))
+        view = ring.last(3)
+        self.assertTrue(np.shares_memory(view, ring._prices))
+        with self.assertRaises(ValueError):
+            view[0] = 1.0
+        ring.append(6.0)  # capacity - n ticks later the view is still intact
+        self.assertEqual(view.tolist(), [3.0, 4.0, 5.0])
+
+    def test_buffers_dedupe_repeated_timestamps(self):
+        buffers = TickBuffers(capacity=16)
+        self.assertTrue(buffers.append("BTC-USD", 1.0, ts_ns=5))
+        self.assertFalse(buffers.append("BTC-USD", 1.0, ts_ns=5))
+        self.assertFalse(buffers.append("BTC-USD", 0.5, ts_ns=4))
+        self.assertTrue(buffers.append("BTC-USD", 1.5))
+        self.assertEqual(buffers.last("BTC-USD").tolist(), [1.0, 1.5])
+        self.assertEqual(buffers.last("ETH-USD").size, 0)
+
+
+class StrategyHistoryTest(unittest.TestCase):
+    def test_strategies_share_one_buffer(self):
+        a = _Strategy(None, None, {}, None, ["BTC-USD"])
+        b = _Strategy(None, None, {}, None, ["BTC-USD"])
+        bus = MarketBus(features=FeatureStore(ticks=TickBuffers(capacity=100)))
+        for s in (a, b):
+            s.use_market_data(bus)
+
+        for i in range(150):
+            a.record_price("BTC-USD", 100.0 + i, ts_ns=i)
+            b.record_price("BTC-USD", 100.0 + i, ts_ns=i)  # same tick seen by both
+        self.assertEqual(b.history("BTC-USD", 3).tolist(), [247.0, 248.0, 249.0])
+        self.assertEqual(len(a.price_history["BTC-USD"]), 100)
+        self.assertEqual(a.features.version("BTC-USD"), 150)
+
+    def test_sampled_spans_interval_lookback(self):
+        s = _Strategy(None, None, {}, None, ["BTC-USD", "ETH-USD"])
+        s.use_market_data(MarketBus(features=FeatureStore(ticks=TickBuffers(capacity=1000))))
+        s.interval = 10
+        sec = 1_000_000_000
+        for i in range(300):  # BTC ticks every second, ETH every 7 seconds
+            s.bus.publish("BTC-USD", float(i), ts_ns=i * sec)
+            if i % 7 == 0:
+                s.bus.publish("ETH-USD", float(i), ts_ns=i * sec)
+        # Twenty samples cover 200s of one-second ticks, not the last 20 ticks.
+        self.assertEqual(s.sampled("BTC-USD", 20).tolist(), [float(t) for t in range(109, 300, 10)])
+        self.assertEqual(s.sampled("BTC-USD", 3, every=1).tolist(), [297.0, 298.0, 299.0])
+        # Both legs sampled on one grid pair prices from the same moment.
+        end = 299 * sec
+        btc = s.sampled("BTC-USD", 5, end_ns=end)
+        eth = s.sampled("ETH-USD", 5, end_ns=end)
+        self.assertEqual(btc.tolist(), [259.0, 269.0, 279.0, 289.0, 299.0])
+        self.assertEqual(eth.tolist(), [259.0, 266.0, 273.0, 287.0, 294.0])
+        # Grid times before the first tick are dropped.
+        self.assertEqual(s.sampled("BTC-USD", 50).size, 30)
+        self.assertEqual(s.sampled("XRP-USD", 5).size, 0)
+
+    def test_throttle_only_when_configured(self):
+        s = _Strategy(None, None, {}, None, ["BTC-USD"])
+        s.interval = 15
+        self.assertEqual(s.throttle, 0.0)
+        self.assertEqual(_Strategy(None, None, {"min_decision_interval": 5}, None, []).throttle, 5.0)
+
+    def test_sampled_features_ignore_sub_interval_ticks(self):
+        s = _Strategy(None, None, {}, None, ["BTC-USD"])
+        s.use_market_data(MarketBus(features=FeatureStore(ticks=TickBuffers())))
+        sec = 1_000_000_000
+        # One tick per 10 s interval rising by 1, with a burst of
+        # sub-interval ticks oscillating around the last price.
+        for i in range(30):
+            s.record_price("BTC-USD", 100.0 + i, i * 10 * sec)
+        for j in range(1, 40):
+            s.record_price("BTC-USD", 129.0 + (5.0 if j % 2 else -5.0), 290 * sec + j * 100_000_000)
+        s.record_price("BTC-USD", 130.0, 300 * sec)
+        self.assertAlmostEqual(s.sampled_feature("BTC-USD", "slope", 5), 1.0)
+        self.assertAlmostEqual(s.sampled_feature("BTC-USD", "volatility", 10), 0.0)
+        self.assertEqual(s.sampled_feature("BTC-USD", "support", 20), 111.0)
+        self.assertEqual(s.sampled_feature("BTC-USD", "resistance", 20), 130.0)
+        # The same lookbacks over raw ticks only see the burst.
+        self.assertGreater(s.features.get("BTC-USD", "volatility", 10), 5.0)
+        self.assertEqual(s.features.get("BTC-USD", "support", 20), 124.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
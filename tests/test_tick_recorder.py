@@ -0,0 +1,50 @@
+import asyncio
+import tempfile
+import unittest
+
+from data import price_cache
+from data.tick_recorder import TickRecorder, TickReplayer
+
+HOUR_NS = 3_600_000_000_000
+BASE_NS = 1_700_000_000 * 1_000_000_000
+
+
+class TickRecordReplayTest(unittest.IsolatedAsyncioTestCase):
+    async def test_round_trip_across_hours_and_feeds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rec = TickRecorder(tmp, block_size=3)
+            for i in range(10):
+                ts = BASE_NS + i * HOUR_NS // 4
+                rec.record("btc-usd", 40000.0 + i * 0.01, "binance", ts_ns=ts)
+                rec.record("EUR_USD", None, "oanda", ts_ns=ts + 1, bid=1.0712 + i * 1e-5, ask=1.0714)
+            rec.flush()
+            self.assertEqual(rec.recorded, 20)
+
+            crypto, forex = [], []
+
+            async def on_message(msg):
+                crypto.append(msg)
+
+            async def on_price(msg):
+                forex.append(msg)
+
+            stats = await TickReplayer(tmp).replay(speed=None, on_message=on_message, on_price=on_price)
+            self.assertEqual(stats["ticks"], 20)
+            self.assertEqual([float(m["price"]) for m in crypto], [40000.0 + i * 0.01 for i in range(10)])
+            self.assertEqual(forex[0]["instrument"], "EUR_USD")
+            self.assertAlmostEqual(float(forex[3]["bid"]), 1.0712 + 3e-5)
+            self.assertEqual(float(forex[3]["ask"]), 1.0714)
+            self.assertEqual(price_cache.get_price("BTC-USD")["price"], 40000.09)
+
+    async def test_replay_paced_by_speed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rec = TickRecorder(tmp)
+            rec.record("ETH-USD", 2000.0, "binance", ts_ns=BASE_NS)
+            rec.record("ETH-USD", 2001.0, "binance", ts_ns=BASE_NS + 200_000_000)
+            rec.flush()
+            stats = await TickReplayer(tmp).replay(speed=2.0, update_cache=False)
+            self.assertGreaterEqual(stats["seconds"], 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_engine import BacktestEngine
+from indicators import streaming, vectorized
+from indicators.technical_indicators import moving_average
+from strategy.signal_backtester import backtest_matrix
+from tests.test_backtest_engine import make_prices
+
+
+def walks(n=600, k=3, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0, 0.01, (n, k)), axis=0)
+
+
+def streamed(indicator, prices):
+    return np.array([indicator.update(p) for p in prices], dtype=float)
+
+
+class VectorizedIndicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.prices = walks()
+        self.frame = pd.DataFrame(self.prices)
+
+    def test_rolling_statistics_match_pandas(self):
+        rolling = self.frame.rolling(20)
+        np.testing.assert_allclose(vectorized.sma(self.prices, 20), rolling.mean(), rtol=1e-12)
+        np.testing.assert_allclose(vectorized.rolling_std(self.prices, 20), rolling.std(), rtol=1e-9)
+        upper, lower = vectorized.bollinger(self.prices, 20)
+        np.testing.assert_allclose(upper, rolling.mean() + 2 * rolling.std(), rtol=1e-12)
+        np.testing.assert_allclose(lower, rolling.mean() - 2 * rolling.std(), rtol=1e-12)
+
+        partial = vectorized.sma(self.prices[:, 0], 20, min_periods=1)
+        self.assertAlmostEqual(partial[4], moving_average(list(self.prices[:5, 0]), 20), places=12)
+
+    def test_ema_matches_pandas_across_filter_blocks(self):
+        long = walks(20_000, 2, seed=3)
+        for period in (3, 12, 200):
+            expected = pd.DataFrame(long).ewm(span=period, adjust=False).mean()
+            np.testing.assert_allclose(vectorized.ema(long, period), expected, rtol=1e-10)
+
+    def test_wilder_indicators_match_streaming(self):
+        column = self.prices[:, 1]
+        rsi = vectorized.rsi(self.prices, 14)
+        self.assertTrue(np.isnan(rsi[13]).all())
+        np.testing.assert_allclose(rsi[14:, 1], streamed(streaming.RSI(14), column)[14:], rtol=1e-10)
+
+        atr = vectorized.atr(column, 14)
+        np.testing.assert_allclose(atr[13:], streamed(streaming.ATR(14), column)[13:], rtol=1e-10)
+        high, low = column * 1.01, column * 0.99
+        atr_hl = vectorized.atr(column, 5, high=high, low=low)
+        ref = streaming.ATR(5)
+        expected = [ref.update(c, h, l) for c, h, l in zip(column, high, low)]
+        np.testing.assert_allclose(atr_hl[4:], expected[4:], rtol=1e-10)
+
+    def test_linreg_slope(self):
+        slope = vectorized.linreg_slope(self.prices, 10)
+        t = np.arange(10)
+        for i in (9, 100, 599):
+            for j in range(3):
+                self.assertAlmostEqual(slope[i, j], np.polyfit(t, self.prices[i - 9:i + 1, j], 1)[0], places=9)
+        np.testing.assert_allclose(vectorized.linreg_slope(np.arange(50.0) * 3, 7)[6:], 3.0)
+
+    def test_feeds_backtesters_directly(self):
+        prices = make_prices(2000, seed=5)
+        close = prices["close"].to_numpy()
+
+        rsi = vectorized.rsi(close, 14)
+        signals = np.where(rsi < 35, 1, np.where(rsi > 65, -1, 0))
+        fast = BacktestEngine(prices, lambda c: signals)
+        fast.run_vectorized(save=False)
+
+        state = streaming.RSI(14)
+
+        def on_bar(history):
+            value = state.update(history[-1])
+            return "buy" if state.ready and value < 35 else "sell" if state.ready and value > 65 else "hold"
+
+        slow = BacktestEngine(prices, on_bar, window=1)
+        slow.run(save=False)
+        self.assertGreater(len(fast.trades), 0)
+        self.assertEqual(fast.trades, slow.trades)
+
+        fast_ema, slow_ema = vectorized.ema(self.prices, 10), vectorized.ema(self.prices, 40)
+        table = backtest_matrix(self.prices, (fast_ema > slow_ema).astype(float))
+        self.assertEqual(len(table), self.prices.shape[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
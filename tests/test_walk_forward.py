@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backtest.sweep import parameter_grid
+from backtest import walk_forward as wf
+from backtest.walk_forward import walk_forward, walk_forward_windows
+from tests.test_backtest_engine import make_prices
+
+
+def sma_cross(close, fast, slow):
+    series = pd.Series(close)
+    diff = series.rolling(fast).mean() - series.rolling(slow).mean()
+    return np.sign(diff.fillna(0).to_numpy())
+
+
+class WalkForwardTest(unittest.TestCase):
+    def test_windows_tile_out_of_sample(self):
+        windows = walk_forward_windows(100, train=40, test=20)
+        self.assertEqual(windows, [(0, 40, 60), (20, 60, 80), (40, 80, 100)])
+        with self.assertRaises(ValueError):
+            walk_forward_windows(100, train=40, test=20, step=10)
+
+    def test_stitched_equity_and_choices(self):
+        prices = make_prices(3000)
+        grid = parameter_grid({"fast": [5, 10], "slow": [30, 60]})
+        result = walk_forward(sma_cross, prices, grid, train=1000, test=500, workers=1)
+        self.assertEqual(len(result.windows), 4)
+        self.assertEqual(len(result.equity), 2000)
+        self.assertTrue(result.equity.index.equals(prices.index[1000:]))
+        self.assertTrue(set(result.windows["fast"]).issubset({5, 10}))
+        self.assertAlmostEqual(result.equity.iloc[0], 10_000.0)
+
+    def test_process_pool_matches_serial(self):
+        prices = make_prices(3000)
+        grid = parameter_grid({"fast": [5, 10], "slow": [30, 60]})
+        serial = walk_forward(sma_cross, prices, grid, train=1000, test=500, workers=1)
+        pooled = walk_forward(sma_cross, prices, grid, train=1000, test=500, workers=2)
+        pd.testing.assert_series_equal(pooled.equity, serial.equity)
+        pd.testing.assert_frame_equal(pooled.windows, serial.windows)
+
+    def test_signal_cache_is_bounded_int8(self):
+        close = make_prices(500)["close"].to_numpy()
+        wf._SIGNAL_CACHE.clear()
+        try:
+            for fast in range(wf.SIGNAL_CACHE_SIZE + 5):
+                signals = wf._cached_signals(sma_cross, close, {"fast": fast + 1, "slow": 60})
+            self.assertEqual(signals.dtype, np.int8)
+            self.assertEqual(len(wf._SIGNAL_CACHE), wf.SIGNAL_CACHE_SIZE)
+            # Oldest parameter sets are evicted first.
+            keys = [dict(k[2])["fast"] for k in wf._SIGNAL_CACHE]
+            self.assertEqual(keys[0], 6)
+        finally:
+            wf._SIGNAL_CACHE.clear()
+
+    def test_grid_larger_than_default_cache_computes_each_set_once(self):
+        prices = make_prices(1500)
+        calls = []
+
+        def counting_cross(close, fast, slow):
+            calls.append((fast, slow))
+            return sma_cross(close, fast, slow)
+
+        grid = parameter_grid({"fast": list(range(2, 12)), "slow": [30, 40, 50, 60, 70, 80, 90]})
+        self.assertGreater(len(grid), wf.SIGNAL_CACHE_SIZE)
+        result = walk_forward(counting_cross, prices, grid, train=500, test=100, workers=1)
+        self.assertEqual(len(result.windows), 10)
+        self.assertEqual(len(calls), len(grid))
+        self.assertEqual(wf._signal_cache_limit, wf.SIGNAL_CACHE_SIZE)
+
+    def test_signal_cache_limit_respects_memory_budget(self):
+        self.assertEqual(wf.signal_cache_limit(10, 1000), wf.SIGNAL_CACHE_SIZE)
+        self.assertEqual(wf.signal_cache_limit(500, 1000), 500)
+        self.assertEqual(wf.signal_cache_limit(500, wf.SIGNAL_CACHE_BYTES // 100), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()